@@ -15,11 +15,16 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import atexit
+import copy
+import os
 import socket
 import json
+import threading
 import time
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from ansible.module_utils.common import validation
 from ansible.module_utils.connection import Connection
 
@@ -444,7 +449,7 @@ def parse_response(response):
     return False, False
 
 
-def dcnm_get_url(module, fabric, path, items, module_name):
+def dcnm_get_url(module, fabric, path, items, module_name, fail=True):
     """
     Query DCNM/NDFC and return query values.
     Some queries like network/vrf queries send thier names
@@ -457,6 +462,7 @@ def dcnm_get_url(module, fabric, path, items, module_name):
         path: String representing the path to query
         items: String representing query items
         module_name: String representing the name of calling module
+        fail: Fail the module if a query fails. Otherwise None is returned
 
     Returns:
         dict: Response DATA from DCNM/NDFC
@@ -501,6 +507,9 @@ def dcnm_get_url(module, fabric, path, items, module_name):
         missing_fabric, not_ok = parse_response(att_objects)
 
         if missing_fabric or not_ok:
+            if not fail:
+                return None
+
             msg1 = "Fabric {0} not present on DCNM".format(fabric)
             msg2 = "Unable to find " "{0}: {1} under fabric: {2}".format(
                 module_name, items[:-1], fabric
@@ -517,3 +526,470 @@ def dcnm_get_url(module, fabric, path, items, module_name):
         iter += 1
 
     return attach_objects
+
+
+def dcnm_normalize_template_config(template_config, fields, version, use_defaults=True, **values):
+    """
+    Build a template config with the fields listed in 'fields', in that order.
+    Fields missing in 'template_config' are set to their default value.
+
+    Parameters:
+        template_config: Dict representing the template config to normalize
+        fields: List of (name, default, min_version) tuples. Fields with a
+                min_version above 'version' are left out
+        version: DCNM/NDFC version
+        use_defaults: Set missing fields to None instead of their default if False
+        values: Field values overriding the ones in 'template_config'
+
+    Returns:
+        dict: normalized template config
+    """
+
+    t_conf = {}
+    for name, default, min_version in fields:
+        if min_version > version:
+            continue
+        if name in values:
+            t_conf[name] = values[name]
+        else:
+            t_conf[name] = template_config.get(name, default if use_defaults else None)
+    return t_conf
+
+
+def dcnm_get_id_range(fabric_data, key, default):
+    """
+    Get the range of ids the fabric reserves for a resource, e.g. the L3 VNI range.
+
+    Parameters:
+        fabric_data: Fabric details as returned by get_fabric_details()
+        key: nvPairs key holding the range, in the form "<first>-<last>"
+        default: (first, last) to use when the fabric does not define the range
+
+    Returns:
+        tuple: first and last id of the range
+    """
+
+    value = str(fabric_data.get("nvPairs", {}).get(key) or "")
+    bounds = value.replace(" ", "").split("-")
+    try:
+        return int(bounds[0]), int(bounds[-1])
+    except ValueError:
+        return default
+
+
+def dcnm_get_allocated_ids(resp):
+    """
+    Get the ids allocated in a resource-manager pool.
+
+    Parameters:
+        resp: Response to the resource-manager pool request
+
+    Returns:
+        set: ids allocated in the pool
+    """
+
+    ids = set()
+    if not resp or resp.get("RETURN_CODE") != 200 or not isinstance(resp.get("DATA"), list):
+        return ids
+
+    for res in resp["DATA"]:
+        try:
+            ids.add(int(res.get("allocatedIp")))
+        except (TypeError, ValueError):
+            continue
+
+    return ids
+
+
+def dcnm_get_vlan_block(module, vlan_data, count, used_vlans, vlan_range=(1, 4094)):
+    """
+    Allocate 'count' vlan ids from a single resource-manager response.
+    The resource manager only hands out the next free vlan id, so the
+    remaining ids are derived from it within 'vlan_range', skipping the
+    ids in 'used_vlans'.
+
+    Parameters:
+        module: String representing the module
+        vlan_data: Response to the resource-manager vlan request
+        count: Number of vlan ids needed
+        used_vlans: Set of vlan ids which are already in use
+        vlan_range: (first, last) vlan ids the fabric allocates from
+
+    Returns:
+        list: vlan ids allocated
+    """
+
+    if vlan_data["RETURN_CODE"] != 200:
+        module.fail_json(
+            msg="Failure getting autogenerated vlan_id {0}".format(vlan_data)
+        )
+
+    used_vlans = set(int(vlan) for vlan in used_vlans)
+    first, last = vlan_range
+    vlan_id = max(int(vlan_data["DATA"]), first)
+    vlan_ids = []
+    while len(vlan_ids) < count:
+        if vlan_id > last:
+            module.fail_json(
+                msg="Unable to allocate {0} vlan ids starting at {1}, the range {2}-{3} "
+                "has only {4} free".format(count, vlan_data["DATA"], first, last, len(vlan_ids))
+            )
+        if vlan_id not in used_vlans:
+            vlan_ids.append(vlan_id)
+        vlan_id += 1
+
+    return vlan_ids
+
+
+def dcnm_run_concurrently(func, items, max_workers=1):
+    """
+    Call 'func' on every element of 'items' using at most 'max_workers' threads.
+
+    The requests of a module go through the persistent connection process of Ansible, which
+    serves one request at a time. The threads therefore do not get the DCNM server to process
+    requests in parallel. They only overlap the module side work of each element, such as
+    building payloads and parsing responses, with the requests of the other elements. The
+    callers default to a single worker, i.e. no threads.
+
+    Parameters:
+        func: Callable taking a single element of 'items'
+        items: List of elements to be processed
+        max_workers: Maximum number of elements processed at a time
+
+    Returns:
+        list: Return values of 'func', in the order of 'items'
+    """
+
+    if max_workers is None or max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def dcnm_split_attach_by_fabric(attach_list):
+    """
+    Split an attach or detach payload of a multisite fabric into one payload per member fabric.
+    The 'fabric' of every attachment must already be set to the member fabric of its switch.
+
+    Parameters:
+        attach_list: List of dicts with the 'lanAttachList' of a vrf or a network
+
+    Returns:
+        list: Payloads holding the attachments of a single member fabric each, ordered by fabric name
+    """
+
+    fabrics = {}
+    for elem in attach_list:
+        nodes = {}
+        for node in elem["lanAttachList"]:
+            nodes.setdefault(node["fabric"], []).append(node)
+        for fabric, fabric_nodes in nodes.items():
+            fabrics.setdefault(fabric, []).append(dict(elem, lanAttachList=fabric_nodes))
+
+    return [fabrics[fabric] for fabric in sorted(fabrics)]
+
+
+def dcnm_take_snapshot(have_create, have_attach, name_key):
+    """
+    Serialize the have state of every vrf or network: its payload and its attachments.
+
+    Parameters:
+        have_create: Payloads of the vrfs or networks present on DCNM
+        have_attach: Attachments of the vrfs or networks present on DCNM
+        name_key: 'vrfName' or 'networkName'
+
+    Returns:
+        dict: JSON encoded state, indexed by vrf or network name
+    """
+
+    attach = dict(
+        (have_a[name_key], have_a.get("lanAttachList") or []) for have_a in have_attach
+    )
+
+    return dict(
+        (
+            have_c[name_key],
+            json.dumps(
+                {"create": have_c, "attach": attach.get(have_c[name_key], [])},
+                separators=(",", ":"),
+            ),
+        )
+        for have_c in have_create
+    )
+
+
+def dcnm_start_changes(snapshot, names, created=()):
+    """
+    Start recording the changes made by a task. The changes are recorded with
+    dcnm_record_change() as the requests making them succeed, so that a rollback
+    only reverts what the task actually changed.
+
+    Parameters:
+        snapshot: State returned by dcnm_take_snapshot()
+        names: Names of the vrfs or networks the task is about to change
+        created: Names of the vrfs or networks already created by the task
+
+    Returns:
+        tuple: The snapshot reduced to the vrfs or networks in 'names', and the changes
+    """
+
+    changes = {
+        "created": list(created),
+        "updated": [],
+        "deleted": [],
+        "attached": {},
+        "detached": {},
+    }
+    snapshot = dict((name, snapshot[name]) for name in names if name in snapshot)
+
+    return snapshot, changes
+
+
+def dcnm_record_change(changes, kind, name_key, payload):
+    """
+    Record a change once the request making it has succeeded.
+
+    Parameters:
+        changes: Changes returned by dcnm_start_changes()
+        kind: 'created', 'updated', 'deleted', 'attached' or 'detached'
+        name_key: 'vrfName' or 'networkName'
+        payload: Payload of the request. A vrf or network payload or a list of them for
+                 'created' and 'updated', a list of names for 'deleted' and an attach
+                 payload for 'attached' and 'detached'
+    """
+
+    if isinstance(payload, dict):
+        payload = [payload]
+
+    for elem in payload:
+        if kind in ("attached", "detached"):
+            for attach in elem["lanAttachList"]:
+                changes[kind].setdefault(elem[name_key], {})[
+                    attach["serialNumber"]
+                ] = copy.deepcopy(attach)
+        elif isinstance(elem, dict):
+            changes[kind].append(elem[name_key])
+        else:
+            changes[kind].append(elem)
+
+
+def dcnm_get_attach_succeeded(payload, resp, name_key):
+    """
+    Get the attachments of an attach or detach payload which DCNM reports as done
+    in the response to a request that failed for some of the other attachments.
+
+    Parameters:
+        payload: Attach payload of the request
+        resp: Response to the request, reporting the result of every attachment as
+              '<vrf or network name>--<serial number>(<switch name>)': '<result>'
+        name_key: 'vrfName' or 'networkName'
+
+    Returns:
+        list: Attach payload holding the attachments done only
+    """
+
+    data = resp.get("DATA")
+    if not isinstance(data, dict):
+        return []
+
+    done = set(key.split("(")[0] for key, value in data.items() if value == "SUCCESS")
+
+    succeeded = []
+    for elem in payload:
+        attachs = [
+            attach
+            for attach in elem["lanAttachList"]
+            if "{0}--{1}".format(elem[name_key], attach["serialNumber"]) in done
+        ]
+        if attachs:
+            succeeded.append(dict(elem, lanAttachList=attachs))
+
+    return succeeded
+
+
+def dcnm_get_diff_rollback(snapshot, changes, name_key, drop_keys=()):
+    """
+    Compute the operations reverting the changes recorded by dcnm_record_change().
+    The vrfs or networks created are detached and deleted, the ones updated or deleted
+    are restored and the attachments changed are set back to their previous state.
+
+    Parameters:
+        snapshot: State returned by dcnm_start_changes()
+        changes: Changes recorded by dcnm_record_change()
+        name_key: 'vrfName' or 'networkName'
+        drop_keys: Keys of the attachments which are not part of the attach payload
+
+    Returns:
+        dict: 'create', 'create_update', 'delete', 'attach' and 'detach' diffs, and the
+              names of the vrfs or networks to be deployed and undeployed
+    """
+
+    snapshot = dict((name, json.loads(data)) for name, data in snapshot.items())
+
+    def rollback_attach(attach, deployment):
+        attach = dict(attach, deployment=deployment, is_deploy=deployment)
+        attach.pop("isAttached", None)
+        for key in drop_keys:
+            attach.pop(key, None)
+        return attach
+
+    diff_attach = []
+    diff_detach = []
+    attach_names = []
+    detach_names = []
+
+    names = set(changes["attached"]) | set(changes["detached"])
+    names.update(name for name in changes["deleted"] if name in snapshot)
+    for name in sorted(names):
+        have_a = dict(
+            (attach["serialNumber"], attach)
+            for attach in snapshot.get(name, {}).get("attach", [])
+        )
+        attached = changes["attached"].get(name, {})
+
+        sns = set(attached) | set(changes["detached"].get(name, {}))
+        if name in changes["deleted"]:
+            sns.update(have_a)
+
+        to_attach = []
+        to_detach = []
+        for sn in sorted(sns):
+            if have_a.get(sn, {}).get("isAttached"):
+                to_attach.append(rollback_attach(have_a[sn], True))
+            elif sn in attached:
+                to_detach.append(rollback_attach(have_a.get(sn, attached[sn]), False))
+
+        if to_attach:
+            diff_attach.append({name_key: name, "lanAttachList": to_attach})
+            attach_names.append(name)
+        if to_detach:
+            diff_detach.append({name_key: name, "lanAttachList": to_detach})
+            detach_names.append(name)
+
+    return {
+        "create": [
+            snapshot[name]["create"] for name in changes["deleted"] if name in snapshot
+        ],
+        "create_update": [
+            snapshot[name]["create"] for name in changes["updated"] if name in snapshot
+        ],
+        "delete": dict(
+            (name, "DEPLOYED") for name in changes["created"] if name not in snapshot
+        ),
+        "attach": diff_attach,
+        "detach": diff_detach,
+        "deploy_names": attach_names,
+        "undeploy_names": detach_names,
+    }
+
+
+class DcnmLogger:
+    """
+    Debug logger shared by the dcnm modules. Records are written as JSON lines, one object per record
+    with the time, level, logger name, message and any additional fields passed by the caller.
+
+    Logging is off unless the DCNM_LOG_FILE environment variable names the file to write to. The least
+    severe level written is taken from DCNM_LOG_LEVEL ('debug', 'info', 'warning' or 'error') and
+    defaults to 'debug'. Messages are formatted only if the record is written and the arguments or field
+    values which are callables are called only then, so that expensive dumps cost nothing when logging
+    is off. Records are buffered and written out when the buffer fills up and when the module exits.
+
+    Example:
+        self.logger = DcnmLogger("dcnm_intf")
+        self.logger.debug("GET %s", path, serial=sno)
+        self.logger.debug("HAVE ALL", have_all=lambda: self.have_all)
+    """
+
+    LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+    DISABLED = 100
+
+    # Enabled loggers, flushed by a single exit handler registered along with the first of them
+    loggers = []
+    loggers_lock = threading.Lock()
+
+    def __init__(self, name, path=None, level=None, buffer_size=100):
+
+        self.name = name
+        self.path = path or os.environ.get("DCNM_LOG_FILE")
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.lock = threading.Lock()
+
+        if self.path:
+            level = (level or os.environ.get("DCNM_LOG_LEVEL") or "debug").lower()
+            self.level = self.LEVELS.get(level, self.LEVELS["debug"])
+            with DcnmLogger.loggers_lock:
+                if not DcnmLogger.loggers:
+                    atexit.register(DcnmLogger.flush_all)
+                DcnmLogger.loggers.append(self)
+        else:
+            self.level = self.DISABLED
+
+    def enabled(self, level):
+
+        return self.LEVELS[level] >= self.level
+
+    def log(self, level, msg, *args, **fields):
+
+        if self.LEVELS[level] < self.level:
+            return
+
+        if args:
+            msg = msg % tuple(arg() if callable(arg) else arg for arg in args)
+        record = {
+            "time": time.time(),
+            "level": level,
+            "logger": self.name,
+            "msg": msg,
+        }
+        for key, value in fields.items():
+            record[key] = value() if callable(value) else value
+        line = json.dumps(record, default=str)
+
+        with self.lock:
+            self.buffer.append(line)
+            if len(self.buffer) >= self.buffer_size:
+                self._write()
+
+    def debug(self, msg, *args, **fields):
+
+        self.log("debug", msg, *args, **fields)
+
+    def info(self, msg, *args, **fields):
+
+        self.log("info", msg, *args, **fields)
+
+    def warning(self, msg, *args, **fields):
+
+        self.log("warning", msg, *args, **fields)
+
+    def error(self, msg, *args, **fields):
+
+        self.log("error", msg, *args, **fields)
+
+    def flush(self):
+
+        with self.lock:
+            self._write()
+
+    @classmethod
+    def flush_all(cls):
+
+        with cls.loggers_lock:
+            loggers = list(cls.loggers)
+        for logger in loggers:
+            logger.flush()
+
+    def _write(self):
+
+        if not self.buffer:
+            return
+        try:
+            with open(self.path, "a") as fd:
+                fd.write("\n".join(self.buffer))
+                fd.write("\n")
+        except (IOError, OSError):
+            # Debug logging must never fail the module
+            pass
+        self.buffer = []
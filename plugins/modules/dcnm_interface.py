@@ -36,6 +36,13 @@ options:
       operation. This flag if set indicates that the module should verify if the configured state is in
       sync with what is requested in playbook. If not set the module will return without verifying the
       state.
+    - The interfaces are polled together, once every 5 seconds. The check fails if an interface does
+      not reach 'In-Sync' state within 60 polls, or if the polling takes longer than 60 polling
+      intervals in total.
+    - Every interface still not 'In-Sync' after 10 and 20 of its own polls is deployed again.
+    - Irrespective of this flag, the compliance status of the deployed interfaces is fetched once per
+      switch right after the deploy, and only the interfaces that are neither 'In-Sync' nor 'Pending'
+      are deployed again. The number of interfaces deployed again is returned as 'redeployed'.
     type: bool
     required: false
     default: false
@@ -61,6 +68,68 @@ options:
        over this global flag.
     type: bool
     default: true
+  fetch_mode:
+    description:
+    - Specifies how the existing configuration of the interfaces included in the playbook is read
+      from the DCNM server.
+    - If set to 'interface', the configuration of every interface is read with a separate request.
+    - If set to 'switch', the configuration of all interfaces on a switch is read with a single request
+      and the interfaces are looked up from the result. This reduces the number of requests considerably
+      for playbooks including many interfaces per switch.
+    - In 'query' state with 'switch', the details and the policies of all interfaces on a switch are
+      each read at most once. Interfaces are reported in the same form as with 'interface', i.e. the
+      details for a query without a name and the policy for a named interface. An interface included
+      in more than one query, e.g. by name and by a query without a name on its switch, is reported
+      once.
+    type: str
+    choices: ['interface', 'switch']
+    default: interface
+  batch_size:
+    description:
+    - Maximum number of interfaces included in a single create or replace request.
+    - Interfaces to be created or replaced are grouped by policy and each group is sent in
+      chunks of at most 'batch_size' interfaces. If a chunk fails, the interfaces in the chunk
+      are sent one at a time so that the failing interface is reported. Interfaces which the
+      failed create request did create are not sent again. The response for the failed chunk is
+      included in the result and in the failure message.
+    - A value of 0 means no limit, i.e. a single request per policy. Negative values are rejected.
+    type: int
+    default: 0
+  max_workers:
+    description:
+    - Maximum number of requests in progress at a time. Must be at least 1.
+    - This has no effect on the DCNM server side. The requests are still served one at a time by
+      the persistent connection to the DCNM server, so the server never processes them in parallel.
+      More workers only overlap the processing of payloads and responses in the module with the
+      requests.
+    - With a single worker, interfaces are deleted one type at a time, port-channels first. With more
+      workers, types which do not depend on each other are deleted together. vPCs and sub-interfaces
+      are then deleted before port-channels, port-channels before ethernet interfaces, and ethernet
+      interfaces before FEXs.
+    type: int
+    default: 1
+  switch_batch_size:
+    description:
+    - Number of switches processed at a time in 'overridden' and 'deleted' states when no 'config'
+      is included.
+    - The existing interfaces of a batch of switches are read and the resulting deletes and defaults
+      are pushed to the DCNM server before the next batch is read. This bounds the memory used and
+      starts pushing changes early on large fabrics.
+    - The interface details and diffs of a batch are dropped once it is pushed. So the 'diff' in the
+      result lists only the name and serial number of every changed interface, and the 'response'
+      only the return code and message of every request.
+    - A value of 0 means all the switches in the fabric are processed together. Negative values are
+      rejected.
+    type: int
+    default: 0
+  query_fields:
+    description:
+    - List of attributes to be included for every interface returned in 'query' state.
+    - Only the top level attributes of the returned interface information can be selected.
+      All attributes are returned if no attributes are given.
+    type: list
+    elements: str
+    default: []
   config:
     description:
     - A dictionary of interface operations
@@ -1608,7 +1677,25 @@ from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm impor
     validate_list_of_dicts,
     get_ip_sn_dict,
     dcnm_version_supported,
+    dcnm_run_concurrently,
+    DcnmLogger,
+)
+
+# Keys which hold a list of values concatenated into a string. The values of these keys are split up and
+# compared irrespective of their order. CONF, PEER1_PO_CONF and PEER2_PO_CONF have '\n' joining the
+# commands. MEMBER_INTERFACES, PEER1_MEMBER_INTERFACES, and PEER2_MEMBER_INTERFACES have ',' joining
+# different elements
+AGGREGATE_KEYS = frozenset(
+    [
+        "MEMBER_INTERFACES",
+        "CONF",
+        "PEER1_MEMBER_INTERFACES",
+        "PEER2_MEMBER_INTERFACES",
+        "PEER1_PO_CONF",
+        "PEER2_PO_CONF",
+    ]
 )
+AGGREGATE_SPLIT = re.compile(r"[\n,]")
 
 
 class DcnmIntf:
@@ -1617,6 +1704,7 @@ class DcnmIntf:
         11: {
             "VPC_SNO": "/rest/interface/vpcpair_serial_number?serial_number={}",
             "IF_WITH_SNO_IFNAME": "/rest/interface?serialNumber={}&ifName={}",
+            "IF_WITH_SNO": "/rest/interface?serialNumber={}",
             "IF_DETAIL_WITH_SNO": "/rest/interface/detail?serialNumber={}",
             "GLOBAL_IF": "/rest/globalInterface",
             "GLOBAL_IF_DEPLOY": "/rest/globalInterface/deploy",
@@ -1627,6 +1715,7 @@ class DcnmIntf:
         12: {
             "VPC_SNO": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/interface/vpcpair_serial_number?serial_number={}",
             "IF_WITH_SNO_IFNAME": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/interface?serialNumber={}&ifName={}",
+            "IF_WITH_SNO": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/interface?serialNumber={}",
             "IF_DETAIL_WITH_SNO": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/interface/detail?serialNumber={}",
             "GLOBAL_IF": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/globalInterface",
             "GLOBAL_IF_DEPLOY": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/globalInterface/deploy",
@@ -1642,12 +1731,22 @@ class DcnmIntf:
         self.fabric = module.params["fabric"]
         self.config = copy.deepcopy(module.params.get("config"))
         self.pb_input = []
+        # Playbook input indexed by (lower case interface name, serial number, fabric name)
+        self.pb_input_index = {}
         self.check_mode = False
         self.intf_info = []
         self.want = []
         self.have = []
         self.have_all = []
         self.have_all_list = []
+        # Indices on 'have_all'. 'have_all_index' is keyed by (lower case interface name, serial number,
+        # fabric name) and 'have_all_sno' holds the 'have_all' entries of every serial number
+        self.have_all_index = {}
+        self.have_all_sno = {}
+        # Interface policies fetched per switch when 'fetch_mode' is 'switch'. Indexed by
+        # (serial number, lower case interface name)
+        self.have_intf = {}
+        self.have_intf_sno = {}
         self.diff_create = []
         self.diff_replace = []
         self.diff_delete = [[], [], [], [], [], [], [], []]
@@ -1655,8 +1754,10 @@ class DcnmIntf:
         self.diff_deploy = []
         self.diff_query = []
         self.log_verbosity = 0
-        self.fd = None
+        self.logger = DcnmLogger("dcnm_intf")
         self.vpc_ip_sn = {}
+        # Switches for which the vPC pair information is already resolved
+        self.vpc_resolved = set()
         self.ip_sn = {}
         self.hn_sn = {}
         self.monitoring = []
@@ -1821,17 +1922,52 @@ class DcnmIntf:
             "AA_FEX": 7,
         }
 
-    def log_msg(self, msg):
-
-        if self.fd is None:
-            self.fd = open("dcnm_intf.log", "a+")
-        if self.fd is not None:
-            self.fd.write(msg)
-            self.fd.write("\n")
-            self.fd.flush()
+        # nvPairs built per (interface type, profile) by dcnm_get_intf_payload. Interfaces sharing a profile
+        # differ only in the nvPairs derived from the interface name, which are listed below per interface
+        # type along with the part of the name they hold. PCIDs of vPCs are derived from the name only if
+        # they are not included in the profile.
+        self.intf_payload_cache = {}
+        self.intf_name_nvpairs = {
+            "pc": {"PO_ID": "ifname", "INTF_NAME": "ifname"},
+            "vpc": {
+                "PEER1_PCID": "port_id",
+                "PEER2_PCID": "port_id",
+                "INTF_NAME": "ifname",
+            },
+            "sub_int": {"INTF_NAME": "ifname"},
+            "lo": {"INTF_NAME": "ifname"},
+            "eth": {"INTF_NAME": "ifname"},
+            "svi": {"INTF_NAME": "ifname"},
+            "st_fex": {"PO_ID": "ifname", "FEX_ID": "port_id"},
+            "aa_fex": {
+                "FEX_ID": "port_id",
+                "PEER1_PCID": "port_id",
+                "PEER2_PCID": "port_id",
+                "INTF_NAME": "ifname",
+            },
+        }
+        self.intf_pcid_keys = {
+            "vpc": {"PEER1_PCID": "peer1_pcid", "PEER2_PCID": "peer2_pcid"}
+        }
+        self.intf_profile_ignore_keys = ["ifname", "sno", "fabric"]
+
+        # Interface types that must be deleted before the given type when deletions are sent concurrently.
+        # Port-channels are deleted after the vPCs built on them and the sub-interfaces configured on them.
+        # Ethernet interfaces other than sub-interfaces, e.g. FEX host ports, are deleted after the
+        # port-channels they are members of, and FEXs after their host ports. Types which do not depend
+        # on each other are deleted concurrently.
+        self.int_delete_deps = {
+            "INTERFACE_PORT_CHANNEL": ["INTERFACE_VPC", "SUBINTERFACE"],
+            "INTERFACE_ETHERNET": ["INTERFACE_PORT_CHANNEL"],
+            "STRAIGHT_TROUGH_FEX": ["INTERFACE_ETHERNET"],
+            "AA_FEX": ["INTERFACE_ETHERNET"],
+        }
 
     def dcnm_intf_dump_have_all(self):
 
+        if not self.logger.enabled("debug"):
+            return
+
         lhave_all = []
         for have in self.have_all:
             lhave_all.append(
@@ -1850,7 +1986,7 @@ class DcnmIntf:
                     "UNDERLAY POLICIES": have["underlayPolicies"],
                 }
             )
-        self.log_msg(f"HAVE ALL = {lhave_all}")
+        self.logger.debug("HAVE ALL", have_all=lhave_all)
 
     # New Interfaces
     def dcnm_intf_get_if_name(self, name, if_type):
@@ -1890,6 +2026,43 @@ class DcnmIntf:
         else:
             return ""
 
+    def dcnm_intf_resolve_vpc_pair(self, sw, sn_ip):
+
+        """
+        Routine to populate the vPC serial number DB for the given switch. The response names both
+        the peers of the vPC pair, so the DB is populated for both the peers with a single request.
+        Switches which are not part of a vPC pair as per the inventory are not queried.
+
+        Parameters:
+            sw (str): IP address of the switch
+            sn_ip (dict): serial number to IP address map of the switches in the fabric
+
+        Returns:
+            None
+        """
+
+        if sw in self.vpc_resolved:
+            return
+        self.vpc_resolved.add(sw)
+
+        if (
+            str(self.inventory_data.get(sw, {}).get("isVpcConfigured")).lower()
+            == "false"
+        ):
+            return
+
+        sno = self.dcnm_intf_get_vpc_serial_number(sw)
+        if "~" not in sno:
+            return
+
+        # This switch is part of VPC pair. Populate the VPC serial number DB
+        self.vpc_ip_sn[sw] = sno
+        for peer_sno in sno.split("~"):
+            peer = sn_ip.get(peer_sno)
+            if peer is not None:
+                self.vpc_ip_sn[peer] = sno
+                self.vpc_resolved.add(peer)
+
     # Flatten the incoming config database and have the required fileds updated.
     # This modified config DB will be used while creating payloads. To avoid
     # messing up the incoming config make a copy of it.
@@ -1901,8 +2074,6 @@ class DcnmIntf:
                 continue
             for sw in cfg["switch"]:
 
-                c = copy.deepcopy(cfg)
-
                 # Add type of interface
                 ckeys = list(cfg.keys())
                 for ck in ckeys:
@@ -1913,21 +2084,24 @@ class DcnmIntf:
                                 msg="<type> element, which is mandatory is missing in config"
                             )
 
-                        c[ck]["fabric"] = self.dcnm_intf_facts["fabric"]
+                        # Only the top level of the profile is updated per switch. So a shallow copy is enough
+                        # and the rest of the profile data is shared by all the switches
+                        prof = dict(cfg[ck])
+                        prof["fabric"] = self.dcnm_intf_facts["fabric"]
                         if cfg["type"] == "vpc" or cfg["type"] == "aa_fex":
                             if self.vpc_ip_sn.get(sw, None) is None:
                                 self.module.fail_json(
                                     msg="Switch '{0}' is not part of VPC pair, but given I/F '{1}' is of type VPC".format(
-                                        sw, c["name"]
+                                        sw, cfg["name"]
                                     )
                                 )
                             else:
-                                c[ck]["sno"] = self.vpc_ip_sn[sw]
+                                prof["sno"] = self.vpc_ip_sn[sw]
                         else:
-                            c[ck]["sno"] = self.ip_sn[sw]
+                            prof["sno"] = self.ip_sn[sw]
 
                         ifname, port_id = self.dcnm_intf_get_if_name(
-                            c["name"], c["type"]
+                            cfg["name"], cfg["type"]
                         )
 
                         if "mode" not in cfg["profile"]:
@@ -1940,11 +2114,14 @@ class DcnmIntf:
                             cfg["type"] + "_" + cfg["profile"]["mode"]
                         )
 
-                        c[ck]["ifname"] = ifname
-                        c[ck]["policy"] = self.pol_types[self.dcnm_version][
+                        prof["ifname"] = ifname
+                        prof["policy"] = self.pol_types[self.dcnm_version][
                             pol_ind_str
                         ]
-                        self.pb_input.append(c[ck])
+                        self.pb_input.append(prof)
+                        self.pb_input_index.setdefault(
+                            (ifname.lower(), prof["sno"], prof["fabric"]), prof
+                        )
 
     def dcnm_intf_validate_interface_input(
         self, config, common_spec, prof_spec
@@ -3197,6 +3374,34 @@ class DcnmIntf:
         intf.update({"policy": self.pol_types[self.dcnm_version][pol_ind_str]})
         intf.update({"interfaceType": self.int_types[delem["type"]]})
 
+        if delem["type"] == "eth":
+            # Ethernet interface payload does not have interfaceType and skipResourceCheck flags. Pop
+            # them out
+            intf.pop("skipResourceCheck")
+
+        # Playbook input may carry the interface name and switch in the profile. These are not used to build
+        # nvPairs and are left out of the key so that such interfaces still share the cached nvPairs
+        key = (
+            delem["type"],
+            json.dumps(
+                dict(
+                    (k, v)
+                    for k, v in delem["profile"].items()
+                    if k not in self.intf_profile_ignore_keys
+                ),
+                sort_keys=True,
+            ),
+        )
+        if key in self.intf_payload_cache:
+            ifname, port_id = self.dcnm_intf_get_if_name(
+                delem["name"], delem["type"]
+            )
+            intf["interfaces"][0]["ifName"] = ifname
+            intf["interfaces"][0]["nvPairs"] = self.dcnm_intf_stamp_nvpairs(
+                delem, self.intf_payload_cache[key], ifname, port_id
+            )
+            return intf
+
         # Rest of the data in the dict depends on the interface type and the template
 
         if "pc" == delem["type"]:
@@ -3210,10 +3415,6 @@ class DcnmIntf:
         if "eth" == delem["type"]:
             self.dcnm_intf_get_eth_payload(delem, intf, "profile")
 
-            # Ethernet interface payload does not have interfaceType and skipResourceCheck flags. Pop
-            # them out
-            intf.pop("skipResourceCheck")
-
         if "svi" == delem["type"]:
             self.dcnm_intf_get_svi_payload(delem, intf, "profile")
 
@@ -3223,8 +3424,36 @@ class DcnmIntf:
         if "aa_fex" == delem["type"]:
             self.dcnm_intf_get_aa_fex_payload(delem, intf, "profile")
 
+        self.intf_payload_cache[key] = dict(intf["interfaces"][0]["nvPairs"])
         return intf
 
+    def dcnm_intf_stamp_nvpairs(self, delem, nvpairs, ifname, port_id):
+
+        """
+        Routine to build the nvPairs of an interface from the nvPairs built for another interface with the
+        same profile. The nvPairs derived from the interface name are set from the given name and the rest
+        are copied as they are.
+
+        Parameters:
+            delem (dict): interface information from the playbook
+            nvpairs (dict): nvPairs built for an interface with the same type and profile
+            ifname (str): name of the interface
+            port_id (str): port id extracted from the interface name
+
+        Returns:
+            dict: nvPairs for the interface
+        """
+
+        nvpairs = dict(nvpairs)
+        pcid_keys = self.intf_pcid_keys.get(delem["type"], {})
+        for key, field in self.intf_name_nvpairs[delem["type"]].items():
+            if key not in nvpairs:
+                continue
+            if key in pcid_keys and delem["profile"].get(pcid_keys[key]) != 0:
+                continue
+            nvpairs[key] = ifname if field == "ifname" else str(port_id)
+        return nvpairs
+
     def dcnm_intf_merge_intf_info(self, intf_info, if_head):
 
         if not if_head:
@@ -3246,14 +3475,68 @@ class DcnmIntf:
         if self.intf_info == []:
             return
 
+        # Payloads are deduped using a canonical form of the payload, which avoids comparing each
+        # payload with all the payloads already in self.want
+        want_keys = set()
+
         # self.intf_info is a list of directories each having config related to a particular interface
         for delem in self.intf_info:
             if any("profile" in key for key in delem):
                 for sw in delem["switch"]:
                     intf_payload = self.dcnm_get_intf_payload(delem, sw)
-                    if intf_payload not in self.want:
+                    key = json.dumps(intf_payload, sort_keys=True)
+                    if key not in want_keys:
+                        want_keys.add(key)
                         self.want.append(intf_payload)
 
+    def dcnm_intf_get_intf_info_with_sno(self, sno):
+
+        """
+        Routine to get the policies of all interfaces on the given switch in a single request and
+        index them by (serial number, interface name). The index is used to serve interface lookups
+        when 'fetch_mode' is 'switch'.
+
+        Parameters:
+            sno (str): serial number of the switch
+
+        Returns:
+            True - if the interface information for the switch is available in the index
+            False - otherwise
+        """
+
+        if sno in self.have_intf_sno:
+            return self.have_intf_sno[sno]
+
+        path = self.paths["IF_WITH_SNO"].format(sno)
+
+        retry_count = 0
+        while retry_count < 3:
+            retry_count += 1
+            resp = dcnm_send(self.module, "GET", path)
+
+            if resp == [] or resp["RETURN_CODE"] == 200:
+                break
+            time.sleep(1)
+
+        if not resp or resp["RETURN_CODE"] != 200:
+            # Let the caller fall back to per interface GETs for this switch
+            self.have_intf_sno[sno] = False
+            return False
+
+        for elem in resp.get("DATA") or []:
+            for intf in elem["interfaces"]:
+                # Each entry is stored in the same form as returned by a GET on a single interface
+                payload = dict(elem)
+                payload["interfaces"] = [intf]
+
+                # VPC and AA_FEX interfaces carry a combined serial number. Index them under both
+                # the serial numbers so that a lookup using either of them is served
+                for s in intf["serialNumber"].split("~"):
+                    self.have_intf[(s, intf["ifName"].lower())] = payload
+
+        self.have_intf_sno[sno] = True
+        return True
+
     def dcnm_intf_get_intf_info(self, ifName, serialNumber, ifType):
 
         # For VPC and AA_FEX interfaces the serialNumber will be a combined one. But GET on interface cannot
@@ -3264,6 +3547,11 @@ class DcnmIntf:
         else:
             sno = serialNumber
 
+        if self.module.params["fetch_mode"] == "switch":
+            if self.dcnm_intf_get_intf_info_with_sno(sno):
+                # Hand out a copy, just like a fresh GET would, so that callers can modify it
+                return copy.deepcopy(self.have_intf.get((sno, ifName.lower()), []))
+
         path = self.paths["IF_WITH_SNO_IFNAME"].format(sno, ifName)
 
         retry_count = 0
@@ -3291,6 +3579,39 @@ class DcnmIntf:
             intf["ifName"], intf["serialNumber"], intf["interfaceType"]
         )
 
+    def dcnm_intf_index_have_all(self, have_list):
+
+        for have in have_list:
+            self.have_all.append(have)
+            self.have_all_sno.setdefault(have["serialNo"], []).append(have)
+
+            # Retain the first match, which is what a linear search on 'have_all' would return
+            key = (have["ifName"].lower(), have["serialNo"], have["fabricName"])
+            self.have_all_index.setdefault(key, have)
+
+    def dcnm_intf_get_have_all_entry(self, name, sno, fabric=None):
+
+        """
+        Routine to look up an interface in 'have_all'.
+
+        Parameters:
+            name (str): interface name
+            sno (str): serial number of the switch
+            fabric (str): fabric name. If None, the fabric name is not matched
+
+        Returns:
+            Matching 'have_all' entry if found
+            None - otherwise
+        """
+
+        if fabric is not None:
+            return self.have_all_index.get((name.lower(), sno, fabric))
+
+        for have in self.have_all_sno.get(sno, []):
+            if name.lower() == have["ifName"].lower():
+                return have
+        return None
+
     def dcnm_intf_get_have_all_with_sno(self, sno):
 
         if "~" in sno:
@@ -3299,7 +3620,38 @@ class DcnmIntf:
         resp = dcnm_send(self.module, "GET", path)
 
         if resp and "DATA" in resp and resp["DATA"]:
-            self.have_all.extend(resp["DATA"])
+            self.dcnm_intf_index_have_all(resp["DATA"])
+
+    def dcnm_intf_refresh_have_all_with_sno(self, sno):
+
+        # Drop the entries of the given switch from 'have_all' and fetch them again. A GET on one of
+        # the switches in a VPC pair returns interfaces from both the switches. So the entries of
+        # all serial numbers present in the response are replaced.
+
+        if "~" in sno:
+            sno = sno.split("~")[0]
+        path = self.paths["IF_DETAIL_WITH_SNO"].format(sno)
+        resp = dcnm_send(self.module, "GET", path)
+
+        if resp and "DATA" in resp and resp["DATA"]:
+            data = resp["DATA"]
+        else:
+            data = []
+
+        stale = set([sno] + [have["serialNo"] for have in data])
+        if not any(s in self.have_all_sno for s in stale):
+            self.dcnm_intf_index_have_all(data)
+            return
+
+        self.have_all = [
+            have for have in self.have_all if have["serialNo"] not in stale
+        ]
+        for s in stale:
+            for have in self.have_all_sno.pop(s, []):
+                key = (have["ifName"].lower(), have["serialNo"], have["fabricName"])
+                if self.have_all_index.get(key) is have:
+                    del self.have_all_index[key]
+        self.dcnm_intf_index_have_all(data)
 
     def dcnm_intf_get_have_all(self, sw):
 
@@ -3381,53 +3733,36 @@ class DcnmIntf:
                 comb_key = e2 + "," + e1
         return comb_key
 
-    def dcnm_intf_compare_elements(
-        self, name, sno, fabric, ie1, ie2, k, state
-    ):
+    def dcnm_intf_normalize_aggregate(self, value):
+
+        return sorted(AGGREGATE_SPLIT.split(value.strip()))
+
+    def dcnm_intf_normalize_value(self, value):
+
+        if isinstance(value, str):
+            return value.lower()
+        return value
+
+    def dcnm_intf_compare_elements(self, name, sno, fabric, ie1, ie2, k, state):
 
         # unicode encoded strings must be decoded to get proper strings which is required
         # for comparison purposes
 
         e1, e2 = self.dcnm_intf_translate_elements(ie1, ie2)
 
-        # The keys in key_translate represent a concatenated string. We should split
-        # these strings and then compare the values
-        key_translate = [
-            "MEMBER_INTERFACES",
-            "CONF",
-            "PEER1_MEMBER_INTERFACES",
-            "PEER2_MEMBER_INTERFACES",
-            "PEER1_PO_CONF",
-            "PEER2_PO_CONF",
-        ]
-
-        merge = False
-
         # Some keys have values given as a list which is encoded into a
-        # string. So split that up into list and then use 'set' to process
+        # string. So split that up into list and then sort them to process
         # the same irrespective of the order of elements
-        if k in key_translate:
-            # CONF, PEER1_PO_CONF and PEER2_PO_CONF has '\n' joining the commands
-            # MEMBER_INTERFACES, PEER1_MEMBER_INTERFACES, and PEER2_MEMBER_INTERFACES
-            # have ',' joining differnet elements. So use a multi-delimiter split
-            # to split with any delim
-            t_e1 = sorted(re.split(r"[\n,]", e1.strip()))
-            t_e2 = sorted(re.split(r"[\n,]", e2.strip()))
-
-            # Merging of aggregate objects (refer objects in key_translate at the top) should happen only for "merged" state.
-            if state == "merged":
-                merge = True
+        aggregate = k in AGGREGATE_KEYS
+        if aggregate:
+            normalize = self.dcnm_intf_normalize_aggregate
         else:
-            if isinstance(e1, str):
-                t_e1 = e1.lower()
-            else:
-                t_e1 = e1
-            if isinstance(e2, str):
-                t_e2 = e2.lower()
-            else:
-                t_e2 = e2
+            normalize = self.dcnm_intf_normalize_value
+
+        # Merging of aggregate objects (refer AGGREGATE_KEYS) should happen only for "merged" state.
+        merge = aggregate and state == "merged"
 
-        if t_e1 != t_e2:
+        if normalize(e1) != normalize(e2):
 
             if (state == "replaced") or (state == "overridden"):
                 # Special handling is required for mode 'mpls' loopback interfaces.
@@ -3442,19 +3777,9 @@ class DcnmIntf:
                 # have.
 
                 # Match and find the corresponding PB input.
+                match_pb = self.pb_input_index[(name.lower(), sno, fabric)]
 
-                match_pb = [
-                    pb
-                    for pb in self.pb_input
-                    if (
-                        (name.lower() == pb["ifname"].lower())
-                        and (sno == pb["sno"])
-                        and (fabric == pb["fabric"])
-                    )
-                ]
-
-                pb_keys = list(match_pb[0].keys())
-                if self.keymap[k] not in pb_keys:
+                if self.keymap[k] not in match_pb:
                     # Copy the value from have, because for 'merged' state we
                     # should leave values that are not specified in config as is.
                     # We copy 'have' because, the validate input would have defaulted the
@@ -3472,22 +3797,14 @@ class DcnmIntf:
         sno = want["interfaces"][0]["serialNumber"]
         fabric = want["interfaces"][0]["fabricName"]
 
-        match_have = [
-            have
-            for have in self.have_all
-            if (
-                (name.lower() == have["ifName"].lower())
-                and (sno == have["serialNo"])
-                and (fabric == have["fabricName"])
-            )
-        ]
+        match_have = self.dcnm_intf_get_have_all_entry(name, sno, fabric)
         if match_have:
-            if (match_have[0]["complianceStatus"] != "In-Sync") and (
-                match_have[0]["complianceStatus"] != "Pending"
+            if (match_have["complianceStatus"] != "In-Sync") and (
+                match_have["complianceStatus"] != "Pending"
             ):
-                return match_have[0], True
+                return match_have, True
             else:
-                return match_have[0], False
+                return match_have, False
         return [], True
 
     def dcnm_intf_compare_want_and_have(self, state):
@@ -3838,10 +4155,7 @@ class DcnmIntf:
                 # If the switch is part of VPC pair, then a GET on any serial number will fetch details of
                 # both the switches. So check before adding to have_all
 
-                if not any(
-                    d.get("serialNo", None) == self.ip_sn[sw]
-                    for d in self.have_all
-                ):
+                if self.ip_sn[sw] not in self.have_all_sno:
                     self.dcnm_intf_get_have_all(sw)
 
     def dcnm_intf_get_diff_overridden(self, cfg):
@@ -3862,10 +4176,7 @@ class DcnmIntf:
                 # the given switch may be part of a VPC pair. In that case we
                 # need to get interface information using one switch which returns interfaces
                 # from both the switches
-                if not any(
-                    d.get("serialNo", None) == self.ip_sn[address]
-                    for d in self.have_all
-                ):
+                if self.ip_sn[address] not in self.have_all_sno:
                     self.dcnm_intf_get_have_all(address)
         else:
             # compute have_all for every switch included in 'cfg'.
@@ -3880,6 +4191,23 @@ class DcnmIntf:
             for config in cfg:
                 self.dcnm_intf_process_config(config)
 
+        self.dcnm_intf_get_diff_overridden_have(deploy)
+        self.dcnm_intf_compare_want_and_have("overridden")
+
+    def dcnm_intf_get_diff_overridden_have(self, deploy):
+
+        """
+        Routine to compute the interfaces from 'have_all' which are to be deleted or reset to default
+        in overridden state. Deleted interfaces are added to 'diff_delete' and 'diff_delete_deploy' and
+        the ethernet interfaces to be defaulted are added to 'diff_replace' and 'diff_deploy'.
+
+        Parameters:
+            deploy (bool): a flag indicating if the deleted interfaces are to be deployed
+
+        Returns:
+            None
+        """
+
         del_list = []
         defer_list = []
 
@@ -4100,7 +4428,144 @@ class DcnmIntf:
                 self.diff_deploy.append(delem)
                 self.changed_dict[0]["deploy"].append(copy.deepcopy(delem))
 
-        self.dcnm_intf_compare_want_and_have("overridden")
+    def dcnm_intf_get_diff_overridden_in_batches(self):
+
+        """
+        Generator to compute the overridden diffs for all the switches in the fabric when no 'config' is
+        included, 'switch_batch_size' switches at a time. The existing interfaces of every batch are read
+        into 'have_all' and the diffs for the batch are left in the diff_* lists before yielding. Once the
+        caller resumes, the interface information and diffs of the batch are dropped and its entries in
+        'changed_dict' and in the responses are reduced to summaries, so that the memory used does not
+        depend on the details of every interface in the fabric.
+
+        Parameters:
+            None
+
+        Yields:
+            None
+        """
+
+        size = self.module.params["switch_batch_size"]
+        deploy = self.module.params["deploy"]
+
+        # Serial numbers for which the interfaces have already been processed. A GET on one of the switches
+        # of a vPC pair returns the interfaces of both the switches, so the peer is skipped later.
+        processed = set()
+        switches = list(self.ip_sn.keys())
+
+        index = 0
+        while index < len(switches):
+            self.dcnm_intf_release_batch()
+
+            count = 0
+            while index < len(switches) and count < size:
+                address = switches[index]
+                index += 1
+                if self.ip_sn[address] in processed:
+                    continue
+                self.dcnm_intf_get_have_all(address)
+                count += 1
+
+            if not self.have_all_sno:
+                continue
+
+            processed.update(self.have_all_sno.keys())
+            self.dcnm_intf_get_diff_overridden_have(deploy)
+            yield
+
+        self.dcnm_intf_release_batch()
+
+    def dcnm_intf_release_batch(self):
+
+        """
+        Routine to drop the interface information and diffs of the batch of switches just processed.
+        The entries the batch added to 'changed_dict' are reduced to the names and serial numbers of the
+        interfaces, and the responses received for the batch to their return code and message.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        self.diff_create = []
+        self.diff_delete = [[], [], [], [], [], [], [], []]
+        self.diff_delete_deploy = [[], [], [], [], [], [], [], []]
+        self.diff_deploy = []
+        self.diff_replace = []
+        self.have_all = []
+        self.have_all_list = []
+        self.have_all_index = {}
+        self.have_all_sno = {}
+        self.have_intf = {}
+        self.have_intf_sno = {}
+
+        for state, items in self.changed_dict[0].items():
+            summary = []
+            for item in items:
+                if "interfaces" in item:
+                    summary.extend(
+                        {"ifName": intf["ifName"], "serialNumber": intf["serialNumber"]}
+                        for intf in item["interfaces"]
+                    )
+                elif "ifName" in item:
+                    summary.append(
+                        {"ifName": item["ifName"], "serialNumber": item["serialNumber"]}
+                    )
+                elif "Name" in item:
+                    summary.append({"Name": item["Name"]})
+                else:
+                    summary.append(item)
+            self.changed_dict[0][state] = summary
+
+        self.result["response"] = [
+            {
+                "RETURN_CODE": resp.get("RETURN_CODE"),
+                "MESSAGE": resp.get("MESSAGE"),
+            }
+            if isinstance(resp, dict)
+            else resp
+            for resp in self.result["response"]
+        ]
+
+    def dcnm_intf_send_overridden_in_batches(self):
+
+        """
+        Routine to compute and push the overridden diffs batch by batch when no 'config' is included in
+        overridden or deleted states. The changes for a batch of switches are pushed to the DCNM server
+        before the next batch is read. In check mode, the diffs are only computed.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        changed = False
+        redeployed = 0
+
+        for _ in self.dcnm_intf_get_diff_overridden_in_batches():
+            if not (
+                self.diff_create
+                or self.diff_replace
+                or self.diff_deploy
+                or any(self.diff_delete)
+                or any(self.diff_delete_deploy)
+            ):
+                continue
+
+            if self.module.check_mode:
+                continue
+
+            self.dcnm_intf_send_message_to_dcnm()
+            changed = changed or self.result["changed"]
+            redeployed += self.result.pop("redeployed", 0)
+
+        self.result["changed"] = changed
+        if redeployed:
+            self.result["redeployed"] = redeployed
 
     def dcnm_intf_get_diff_deleted(self):
 
@@ -4157,20 +4622,9 @@ class DcnmIntf:
                                 self.dcnm_intf_get_have_all(sw)
 
                             # Get the matching interface from have_all
-                            match_have = [
-                                have
-                                for have in self.have_all
-                                if (
-                                    (
-                                        intf["ifName"].lower()
-                                        == have["ifName"].lower()
-                                    )
-                                    and (
-                                        intf["serialNumber"]
-                                        == have["serialNo"]
-                                    )
-                                )
-                            ][0]
+                            match_have = self.dcnm_intf_get_have_all_entry(
+                                intf["ifName"], intf["serialNumber"]
+                            )
                             if (
                                 match_have
                                 and (
@@ -4264,28 +4718,17 @@ class DcnmIntf:
                                     self.dcnm_intf_get_have_all(sw)
 
                                 # Get the matching interface from have_all
-                                match_have = [
-                                    have
-                                    for have in self.have_all
-                                    if (
-                                        (
-                                            intf["ifName"].lower()
-                                            == have["ifName"].lower()
-                                        )
-                                        and (
-                                            intf["serialNumber"]
-                                            == have["serialNo"]
-                                        )
-                                    )
-                                ]
+                                match_have = self.dcnm_intf_get_have_all_entry(
+                                    intf["ifName"], intf["serialNumber"]
+                                )
 
                                 if match_have:
                                     # Matching interface found. Check 'complianceStatus' and deploy if necessary
                                     if (
-                                        match_have[0]["complianceStatus"]
+                                        match_have["complianceStatus"]
                                         == "In-Sync"
                                     ) or (
-                                        match_have[0]["complianceStatus"]
+                                        match_have["complianceStatus"]
                                         == "Pending"
                                     ):
                                         if (
@@ -4339,22 +4782,100 @@ class DcnmIntf:
 
     def dcnm_intf_get_diff_query(self):
 
+        if self.module.params["fetch_mode"] == "switch":
+            self.dcnm_intf_get_diff_query_with_sno()
+        else:
+            for info in self.intf_info:
+                sno = self.ip_sn[info["switch"][0]]
+                if info["name"] == "":
+                    # GET all interfaces
+                    path = self.paths["IF_DETAIL_WITH_SNO"].format(sno)
+                else:
+                    ifname, if_type = self.dcnm_extract_if_name(info)
+                    # GET a specific interface
+                    path = self.paths["IF_WITH_SNO_IFNAME"].format(sno, ifname)
+
+                resp = dcnm_send(self.module, "GET", path)
+
+                if "DATA" in resp and resp["DATA"]:
+                    self.diff_query.extend(resp["DATA"])
+
+        fields = self.module.params["query_fields"]
+        if fields:
+            self.diff_query = [
+                dict((k, elem[k]) for k in fields if k in elem)
+                for elem in self.diff_query
+            ]
+        self.changed_dict[0]["query"].extend(self.diff_query)
+        self.result["response"].extend(self.diff_query)
+
+    def dcnm_intf_get_diff_query_with_sno(self):
+
+        """
+        Routine to query interfaces when 'fetch_mode' is 'switch'. Targets without a name report the details
+        of all the interfaces of the switch, read once per switch, concurrently across switches as per
+        'max_workers'. Named targets are looked up from the policies of all the interfaces of their switch,
+        also read once per switch. Every target is reported in the same form as with 'fetch_mode' set to
+        'interface', and every interface is reported once, at its first target.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        # Query targets, in the order they are included in the playbook
+        targets = {}
+        detail_snos = {}
         for info in self.intf_info:
             sno = self.ip_sn[info["switch"][0]]
             if info["name"] == "":
-                # GET all interfaces
-                path = self.paths["IF_DETAIL_WITH_SNO"].format(sno)
+                ifname = ""
+                detail_snos.setdefault(sno, None)
             else:
-                ifname, if_type = self.dcnm_extract_if_name(info)
-                # GET a specific interface
-                path = self.paths["IF_WITH_SNO_IFNAME"].format(sno, ifname)
+                ifname = self.dcnm_extract_if_name(info)[0]
+            targets.setdefault((sno, ifname.lower()), ifname)
 
+        def get_detail(sno):
+            path = self.paths["IF_DETAIL_WITH_SNO"].format(sno)
             resp = dcnm_send(self.module, "GET", path)
+            return (resp.get("DATA") or []) if resp else []
+
+        details = dict(
+            zip(
+                detail_snos,
+                dcnm_run_concurrently(
+                    get_detail, list(detail_snos), self.module.params["max_workers"]
+                ),
+            )
+        )
 
-            if "DATA" in resp and resp["DATA"]:
-                self.diff_query.extend(resp["DATA"])
-        self.changed_dict[0]["query"].extend(self.diff_query)
-        self.result["response"].extend(self.diff_query)
+        seen = set()
+        for (sno, name), ifname in targets.items():
+            if ifname == "":
+                elems = details[sno]
+            elif self.dcnm_intf_get_intf_info_with_sno(sno):
+                elem = self.have_intf.get((sno, name))
+                elems = [elem] if elem else []
+            else:
+                path = self.paths["IF_WITH_SNO_IFNAME"].format(sno, ifname)
+                resp = dcnm_send(self.module, "GET", path)
+                elems = resp["DATA"] if resp and "DATA" in resp and resp["DATA"] else []
+
+            # Interface details carry the serial number as 'serialNo' while interface policies carry it
+            # under 'interfaces'. VPC interfaces carry the serial numbers of both the switches. An
+            # interface already reported for an earlier target is left out.
+            for elem in elems:
+                if "interfaces" in elem:
+                    intf = elem["interfaces"][0]
+                    key = (frozenset(intf["serialNumber"].split("~")), intf["ifName"].lower())
+                else:
+                    key = (frozenset(elem["serialNo"].split("~")), elem["ifName"].lower())
+                if key in seen:
+                    continue
+                seen.add(key)
+                self.diff_query.append(elem)
 
     def dcnm_parse_response(self, resp):
 
@@ -4415,12 +4936,52 @@ class DcnmIntf:
         else:
             return succ_resp, False
 
+    def dcnm_intf_get_failed_items(self, items, resp):
+
+        """
+        Routine to get the items from the given payload which belong to switches that reported a
+        failure in the given response.
+
+        Parameters:
+            items (list): payload that was sent
+            resp (dict): response received for the payload
+
+        Returns:
+            list: items that must be sent again. If the response does not identify the failed
+                  switches, all the items are returned.
+        """
+
+        if not isinstance(resp.get("DATA"), list):
+            return items
+
+        failed_sno = set()
+        for data in resp["DATA"]:
+            host = data.get("entity") if isinstance(data, dict) else None
+            if not host:
+                return items
+
+            message = str(data.get("message"))
+            if ("No Commands to execute" in message) or ("In-Sync" in message):
+                continue
+
+            sno = self.hn_sn.get(host.split(":")[0])
+            if sno is None:
+                return items
+            failed_sno.add(sno)
+
+        failed = [
+            item
+            for item in items
+            if failed_sno & set(item["serialNumber"].split("~"))
+        ]
+        return failed or items
+
     def dcnm_intf_send_message_handle_retry(self, action, path, payload, cmd):
 
         count = 1
         while count < 20:
 
-            resp = dcnm_send(self.module, action, path, payload)
+            resp = dcnm_send(self.module, action, path, json.dumps(payload))
 
             # No commands to execute is normal when you try to deploy/delete an
             # interface to switch and there is no change.
@@ -4432,6 +4993,9 @@ class DcnmIntf:
             ):
                 return resp, True
 
+            # Retry only the items which failed
+            payload = self.dcnm_intf_get_failed_items(payload, resp)
+
             presp, changed = self.dcnm_parse_response(resp)
             resp = presp
 
@@ -4470,116 +5034,493 @@ class DcnmIntf:
 
     def dcnm_intf_check_deployment_status(self, deploy_list):
 
+        """
+        Routine to poll the compliance status of the deployed interfaces until all of them are 'In-Sync'.
+        Every interface which is not 'In-Sync' after 10 and 20 of its own polls is deployed again.
+
+        Parameters:
+            deploy_list (list): interfaces that were deployed
+
+        Returns:
+            set: (ifName, serialNumber) of the interfaces deployed again
+        """
+
         # Check for deployment status of all the configured objects only if the check_deploy flag is set.
         if self.module.params["check_deploy"] is False:
-            return
+            return set()
 
         path = self.paths["GLOBAL_IF_DEPLOY"]
 
-        resp = {}
-
+        # Group the interfaces to be checked by switch. In every polling interval the interface details
+        # of each switch with pending interfaces are fetched once and the interfaces that reached
+        # 'In-Sync' state are dropped from the pending list.
+        pending = {}
         for item in deploy_list:
-            retries = 0
-            while retries < 60:
-                retries += 1
-                name = item["ifName"]
-                sno = item["serialNumber"]
-
-                match_have = [
-                    have
-                    for have in self.have_all
-                    if (
-                        (name.lower() == have["ifName"].lower())
-                        and (sno == have["serialNo"])
-                        and (self.fabric == have["fabricName"])
+            pending.setdefault(item["serialNumber"], []).append(item)
+
+        # Every interface still pending is charged a poll in each interval. The check fails once an
+        # interface is charged 60 polls, the limit an interface had when the interfaces were checked one
+        # at a time, or once the polling has taken as long as 60 intervals, whichever comes first. So
+        # the total time spent does not grow with the number of interfaces being checked.
+        polls = dict((id(item), 0) for item in deploy_list)
+        deadline = time.time() + 60 * 5
+        redeployed = set()
+        while True:
+
+            wait = False
+            for sno in list(pending.keys()):
+                stragglers = []
+                for item in pending[sno]:
+                    match_have = self.dcnm_intf_get_have_all_entry(
+                        item["ifName"], sno, self.fabric
                     )
-                ]
-                if match_have:
+                    if match_have:
+                        if match_have["complianceStatus"] == "In-Sync":
+                            continue
+                        wait = True
+                    stragglers.append(item)
 
-                    if match_have[0]["complianceStatus"] == "In-Sync":
-                        break
+                if stragglers:
+                    pending[sno] = stragglers
+                else:
+                    pending.pop(sno)
 
-                    if retries == 10 or retries == 20:
-                        json_payload = json.dumps(
-                            {
-                                "ifName": name,
-                                "serialNumber": sno,
-                                "fabricName": self.fabric,
-                            }
-                        )
-                        resp = dcnm_send(
-                            self.module, "POST", path, json_payload
-                        )
+            if not pending:
+                break
 
-                    time.sleep(5)
-                    self.have_all = []
-                    self.dcnm_intf_get_have_all_with_sno(sno)
-                else:
-                    # For merge state, the interfaces would have been created just now. Fetch them again before checking
-                    self.have_all = []
-                    self.dcnm_intf_get_have_all_with_sno(sno)
+            stragglers = [item for items in pending.values() for item in items]
+            for item in stragglers:
+                polls[id(item)] += 1
             if (
-                match_have == []
-                or match_have[0]["complianceStatus"] != "In-Sync"
+                max(polls[id(item)] for item in stragglers) >= 60
+                or time.time() >= deadline
             ):
-                self.module.fail_json(
-                    msg={
-                        "FAILURE REASON": "Interafce "
-                        + name
-                        + " did not reach 'In-Sync' State",
-                        "Compliance Status": match_have[0]["complianceStatus"],
-                        # "CHANGED": self.changed_dict,
-                        # "RESP": resp
-                        "RESULT": self.result,
-                    }
+                break
+
+            # Deploy the interfaces that are not yet 'In-Sync' after 10 or 20 of their own polls in one go
+            redeploy = [item for item in stragglers if polls[id(item)] in [10, 20]]
+            if redeploy:
+                redeployed.update(id(item) for item in redeploy)
+                json_payload = json.dumps(
+                    [
+                        {
+                            "ifName": item["ifName"],
+                            "serialNumber": item["serialNumber"],
+                            "fabricName": self.fabric,
+                        }
+                        for item in redeploy
+                    ]
                 )
+                dcnm_send(self.module, "POST", path, json_payload)
+
+            # Wait only if some of the pending interfaces are waiting to be 'In-Sync'. For merge state, the
+            # interfaces would have been created just now. Such interfaces are fetched again without waiting.
+            if wait:
+                time.sleep(5)
+
+            # A GET on one of the switches in a VPC pair returns interfaces from both the switches
+            refresh = []
+            for sno in pending.keys():
+                if sno.split("~")[0] not in refresh:
+                    refresh.append(sno.split("~")[0])
+            for sno in refresh:
+                self.dcnm_intf_refresh_have_all_with_sno(sno)
+
+        if pending:
+            item = max(stragglers, key=lambda item: polls[id(item)])
+            match_have = self.dcnm_intf_get_have_all_entry(
+                item["ifName"], item["serialNumber"], self.fabric
+            )
+            self.module.fail_json(
+                msg={
+                    "FAILURE REASON": "Interafce "
+                    + item["ifName"]
+                    + " did not reach 'In-Sync' State",
+                    "Compliance Status": match_have["complianceStatus"]
+                    if match_have
+                    else None,
+                    "PENDING": [
+                        {"ifName": item["ifName"], "serialNumber": item["serialNumber"]}
+                        for item in stragglers
+                    ],
+                    "RESULT": self.result,
+                }
+            )
 
-    def dcnm_intf_send_message_to_dcnm(self):
+        return set(
+            (item["ifName"], item["serialNumber"])
+            for item in deploy_list
+            if id(item) in redeployed
+        )
 
-        resp = None
-        changed = False
+    def dcnm_intf_redeploy(self, deploy_list):
 
-        delete = False
-        delete_deploy = False
-        create = False
-        deploy = False
-        replace = False
+        """
+        Routine to deploy again the interfaces which are neither 'In-Sync' nor 'Pending' after the
+        initial deploy. The compliance status of the interfaces is fetched once per switch.
 
-        path = self.paths["IF_MARK_DELETE"]
+        Parameters:
+            deploy_list (list): interfaces that were deployed
 
-        # First send deletes and then try create and update. This is because during override, the overriding
-        # config may conflict with existing configuration.
+        Returns:
+            set: (ifName, serialNumber) of the interfaces deployed again
+        """
 
-        for delem in self.diff_delete:
+        # A GET on one of the switches in a VPC pair returns interfaces from both the switches
+        refresh = []
+        for item in deploy_list:
+            sno = item["serialNumber"].split("~")[0]
+            if sno not in refresh:
+                refresh.append(sno)
+        for sno in refresh:
+            self.dcnm_intf_refresh_have_all_with_sno(sno)
 
-            if delem == []:
+        redeploy = []
+        for item in deploy_list:
+            match_have = self.dcnm_intf_get_have_all_entry(
+                item["ifName"], item["serialNumber"], self.fabric
+            )
+            if match_have and match_have["complianceStatus"] in [
+                "In-Sync",
+                "Pending",
+            ]:
                 continue
+            redeploy.append(item)
 
-            json_payload = json.dumps(delem)
+        if redeploy:
+            path = self.paths["GLOBAL_IF_DEPLOY"]
+            dcnm_send(self.module, "POST", path, json.dumps(redeploy))
 
-            resp = dcnm_send(self.module, "DELETE", path, json_payload)
+        return set((item["ifName"], item["serialNumber"]) for item in redeploy)
 
-            if resp.get("RETURN_CODE") != 200:
-                if resp["DATA"]:
-                    delete_failed = False
-                else:
-                    delete_failed = True
-                for item in resp["DATA"]:
-                    if "No Commands to execute" not in item["message"]:
-                        delete_failed = True
-                if delete_failed is False:
-                    resp["RETURN_CODE"] = 200
-                    resp["MESSAGE"] = "OK"
+    def dcnm_intf_get_payload_chunks(self, payloads):
+
+        """
+        Routine to split the given payloads, which are grouped by policy, into chunks including at most
+        'batch_size' interfaces each.
+
+        Parameters:
+            payloads (list): payloads to be split
+
+        Returns:
+            list: payload chunks
+        """
+
+        size = self.module.params["batch_size"]
+
+        chunks = []
+        for payload in payloads:
+            if not size or len(payload["interfaces"]) <= size:
+                chunks.append(payload)
+                continue
+            for start in range(0, len(payload["interfaces"]), size):
+                chunk = dict(payload)
+                chunk["interfaces"] = payload["interfaces"][start:start + size]
+                chunks.append(chunk)
+        return chunks
+
+    def dcnm_intf_get_created(self, payload):
+
+        """
+        Routine to find the interfaces of a payload chunk which are already present on DCNM.
+
+        Parameters:
+            payload (dict): payload chunk
+
+        Returns:
+            set: (ifName, serialNumber) of the interfaces present, with the name in lower case
+        """
+
+        # A GET on one of the switches in a VPC pair returns interfaces from both the switches
+        snos = []
+        for intf in payload["interfaces"]:
+            sno = intf["serialNumber"].split("~")[0]
+            if sno not in snos:
+                snos.append(sno)
+
+        created = set()
+        for sno in snos:
+            path = self.paths["IF_DETAIL_WITH_SNO"].format(sno)
+            resp = dcnm_send(self.module, "GET", path)
+            if resp and "DATA" in resp and resp["DATA"]:
+                for have in resp["DATA"]:
+                    created.add((have["ifName"].lower(), have["serialNo"]))
+        return created
+
+    def dcnm_intf_send_payload(self, action, path, payload):
+
+        """
+        Routine to send a payload chunk to DCNM. If the chunk includes more than one interface and
+        fails, the interfaces are sent one at a time, stopping at the first failure. A failed create
+        may have created some of the interfaces already, so such interfaces are not sent again.
+
+        Parameters:
+            action (str): HTTP method to be used
+            path (str): request path
+            payload (dict): payload to be sent
+
+        Returns:
+            list: responses received from DCNM, starting with the response for the chunk. The last
+                  response tells if the chunk was applied
+        """
+
+        resp = dcnm_send(self.module, action, path, json.dumps(payload))
+
+        if (resp.get("MESSAGE") == "OK") and (resp.get("RETURN_CODE") == 200):
+            return [resp]
+        if len(payload["interfaces"]) == 1:
+            return [resp]
+
+        created = set()
+        if action == "POST":
+            created = self.dcnm_intf_get_created(payload)
+
+        resps = [resp]
+        for intf in payload["interfaces"]:
+            if (intf["ifName"].lower(), intf["serialNumber"]) in created:
+                continue
+
+            ipayload = dict(payload)
+            ipayload["interfaces"] = [intf]
+            resp = dcnm_send(self.module, action, path, json.dumps(ipayload))
+            resps.append(resp)
 
             if (resp.get("MESSAGE") != "OK") or (
                 resp.get("RETURN_CODE") != 200
             ):
+                break
+        return resps
+
+    def dcnm_intf_send_payloads(self, action, path, payloads):
+
+        """
+        Routine to send create or replace payloads to DCNM. The payloads are split into chunks as per
+        'batch_size' and the chunks are sent concurrently as per 'max_workers'. The module fails on
+        the first failed response.
+
+        Parameters:
+            action (str): HTTP method to be used
+            path (str): request path
+            payloads (list): payloads to be sent
+
+        Returns:
+            True - if any of the payloads were sent successfully
+            False - otherwise
+        """
+
+        chunks = self.dcnm_intf_get_payload_chunks(payloads)
+
+        # Once a chunk fails, the chunks that are not yet sent are skipped since the module is going to fail anyway
+        failed = []
+
+        def send_chunk(chunk):
+            if failed:
+                return []
+            resps = self.dcnm_intf_send_payload(action, path, chunk)
+            if (resps[-1].get("MESSAGE") != "OK") or (
+                resps[-1].get("RETURN_CODE") != 200
+            ):
+                failed.append(chunk)
+            return resps
+
+        results = dcnm_run_concurrently(
+            send_chunk, chunks, self.module.params["max_workers"]
+        )
+
+        changed = False
+        for resps in results:
+            if not resps:
+                continue
+            self.result["response"].extend(resps)
+
+            # The response for the chunk is followed by the ones for its interfaces, if it failed and
+            # the interfaces were sent one at a time. The last response tells if the chunk was applied.
+            resp = resps[-1]
+            if (resp.get("MESSAGE") != "OK") or (
+                resp.get("RETURN_CODE") != 200
+            ):
+                if len(resps) > 1:
+                    resp["CHUNK_RESPONSE"] = resps[0]
+                resp["CHANGED"] = self.changed_dict
+                self.module.fail_json(msg=resp)
+            changed = True
+        return changed
+
+    def dcnm_intf_get_delete_schedule(self, buckets):
+
+        """
+        Routine to order the given per interface type buckets for deletion. With a single worker the
+        buckets are processed one at a time in the order of 'int_index'. Otherwise they are ordered
+        based on 'int_delete_deps'.
 
-                # there may be cases which are not actual failures. retry the
-                # action
-                resp, rc = self.dcnm_intf_send_message_handle_retry(
-                    "DELETE", path, json_payload, "DELETE"
+        Parameters:
+            buckets (list): per interface type buckets indexed as per 'int_index'
+
+        Returns:
+            list: lists of interface lists, each to be sent in a single request. The interface lists
+                  in a list do not depend on each other and every list must be processed only after
+                  the previous lists are done
+        """
+
+        types = dict((index, if_type) for if_type, index in self.int_index.items())
+
+        if self.module.params["max_workers"] <= 1:
+            return [[bucket] for bucket in buckets if bucket]
+
+        # Sub-interfaces are reported as ethernet interfaces too. Such interfaces are ordered along with
+        # the sub-interfaces, since they do not depend on any port-channel being deleted.
+        groups = []
+        for index, bucket in enumerate(buckets):
+            if types[index] == "INTERFACE_ETHERNET":
+                groups.append(
+                    ("SUBINTERFACE", [d for d in bucket if "." in d["ifName"]])
+                )
+                groups.append(
+                    (types[index], [d for d in bucket if "." not in d["ifName"]])
                 )
+            else:
+                groups.append((types[index], bucket))
+
+        remaining = [group for group in groups if group[1]]
+
+        schedule = []
+        while remaining:
+            pending = set(if_type for if_type, bucket in remaining)
+            ready = [
+                group
+                for group in remaining
+                if not any(
+                    dep in pending
+                    for dep in self.int_delete_deps.get(group[0], [])
+                )
+            ]
+            if not ready:
+                ready = remaining[:1]
+            schedule.append([bucket for if_type, bucket in ready])
+            remaining = [
+                group
+                for group in remaining
+                if not any(group is ready_group for ready_group in ready)
+            ]
+        return schedule
+
+    def dcnm_intf_send_delete(self, delem):
+
+        """
+        Routine to mark the interfaces in the given bucket for deletion.
+
+        Parameters:
+            delem (list): interfaces to be deleted
+
+        Returns:
+            resp (dict): response from DCNM
+            changed (bool): True if the interfaces were deleted, False otherwise
+        """
+
+        path = self.paths["IF_MARK_DELETE"]
+
+        json_payload = json.dumps(delem)
+
+        resp = dcnm_send(self.module, "DELETE", path, json_payload)
+
+        if resp.get("RETURN_CODE") != 200:
+            if resp["DATA"]:
+                delete_failed = False
+            else:
+                delete_failed = True
+            for item in resp["DATA"]:
+                if "No Commands to execute" not in item["message"]:
+                    delete_failed = True
+            if delete_failed is False:
+                resp["RETURN_CODE"] = 200
+                resp["MESSAGE"] = "OK"
+
+        if (resp.get("MESSAGE") != "OK") or (resp.get("RETURN_CODE") != 200):
+
+            # there may be cases which are not actual failures. retry the
+            # action for the interfaces which failed
+            return self.dcnm_intf_send_message_handle_retry(
+                "DELETE",
+                path,
+                self.dcnm_intf_get_failed_items(delem, resp),
+                "DELETE",
+            )
+        return resp, True
+
+    def dcnm_intf_send_delete_deploy(self, delem):
+
+        """
+        Routine to deploy the interfaces in the given bucket which are marked for deletion.
+
+        Parameters:
+            delem (list): interfaces to be deployed
+
+        Returns:
+            resp (dict): response from DCNM
+            changed (bool): True if the interfaces were deployed, False otherwise
+        """
+
+        path = self.paths["GLOBAL_IF_DEPLOY"]
+
+        json_payload = json.dumps(delem)
+
+        resp = dcnm_send(self.module, "POST", path, json_payload)
+
+        if resp.get("RETURN_CODE") != 200:
+            if resp["DATA"]:
+                deploy_failed = False
+            else:
+                deploy_failed = True
+            for item in resp["DATA"]:
+                if (
+                    "No Commands to execute" not in item["message"]
+                    and "In-Sync" not in item["message"]
+                ):
+                    deploy_failed = True
+            if deploy_failed is False:
+                resp["RETURN_CODE"] = 200
+                resp["MESSAGE"] = "OK"
+                return resp, True
+            return resp, False
+        return resp, True
+
+    def dcnm_intf_send_message_to_dcnm(self):
+
+        resp = None
+        changed = False
+
+        delete = False
+        delete_deploy = False
+        create = False
+        deploy = False
+        replace = False
+
+        # First send deletes and then try create and update. This is because during override, the overriding
+        # config may conflict with existing configuration.
+
+        # Buckets which do not depend on each other are sent concurrently. Once a bucket fails, the buckets
+        # that are not yet sent are skipped since the module is going to fail anyway
+        failed = []
+
+        def send_delete(delem):
+            if failed:
+                return None, False
+            resp, rc = self.dcnm_intf_send_delete(delem)
+            if (
+                (resp.get("MESSAGE") != "OK")
+                and ("No Commands to execute" not in resp.get("MESSAGE"))
+            ) or (resp.get("RETURN_CODE") != 200):
+                failed.append(delem)
+            return resp, rc
+
+        for delems in self.dcnm_intf_get_delete_schedule(self.diff_delete):
+            results = dcnm_run_concurrently(
+                send_delete, delems, self.module.params["max_workers"]
+            )
+
+            for resp, rc in results:
+                if resp is None:
+                    continue
 
                 # Even if one of the elements succeed, changed must be set to
                 # True. Once changed becomes True, then it remains True
@@ -4592,80 +5533,41 @@ class DcnmIntf:
                 ) or (resp.get("RETURN_CODE") != 200):
                     resp["CHANGED"] = self.changed_dict
                     self.module.fail_json(msg=resp)
-            else:
-                changed = True
 
-            delete = changed
-            self.result["response"].append(resp)
+                delete = changed
+                self.result["response"].append(resp)
 
         resp = None
 
-        path = self.paths["GLOBAL_IF_DEPLOY"]
-        index = -1
-        for delem in self.diff_delete_deploy:
-
-            # index = index + 1
-            if delem == []:
-                continue
-
-            json_payload = json.dumps(delem)
-
-            resp = dcnm_send(self.module, "POST", path, json_payload)
+        for delems in self.dcnm_intf_get_delete_schedule(
+            self.diff_delete_deploy
+        ):
+            results = dcnm_run_concurrently(
+                self.dcnm_intf_send_delete_deploy,
+                delems,
+                self.module.params["max_workers"],
+            )
 
-            if resp.get("RETURN_CODE") != 200:
-                if resp["DATA"]:
-                    deploy_failed = False
-                else:
-                    deploy_failed = True
-                for item in resp["DATA"]:
-                    if (
-                        "No Commands to execute" not in item["message"]
-                        and "In-Sync" not in item["message"]
-                    ):
-                        deploy_failed = True
-                if deploy_failed is False:
-                    resp["RETURN_CODE"] = 200
-                    resp["MESSAGE"] = "OK"
+            for resp, rc in results:
+                if rc:
                     delete_deploy = True
-            else:
-                delete_deploy = True
-            self.result["response"].append(resp)
+                self.result["response"].append(resp)
 
         resp = None
 
         path = self.paths["INTERFACE"]
-        for payload in self.diff_replace:
-
-            json_payload = json.dumps(payload)
-            resp = dcnm_send(self.module, "PUT", path, json_payload)
-
-            self.result["response"].append(resp)
-
-            if (resp.get("MESSAGE") != "OK") or (
-                resp.get("RETURN_CODE") != 200
-            ):
-                resp["CHANGED"] = self.changed_dict
-                self.module.fail_json(msg=resp)
-            else:
-                replace = True
+        if self.diff_replace:
+            replace = self.dcnm_intf_send_payloads(
+                "PUT", path, self.diff_replace
+            )
 
         resp = None
 
         path = self.paths["GLOBAL_IF"]
-        for payload in self.diff_create:
-
-            json_payload = json.dumps(payload)
-            resp = dcnm_send(self.module, "POST", path, json_payload)
-
-            self.result["response"].append(resp)
-
-            if (resp.get("MESSAGE") != "OK") or (
-                resp.get("RETURN_CODE") != 200
-            ):
-                resp["CHANGED"] = self.changed_dict
-                self.module.fail_json(msg=resp)
-            else:
-                create = True
+        if self.diff_create:
+            create = self.dcnm_intf_send_payloads(
+                "POST", path, self.diff_create
+            )
 
         resp = None
 
@@ -4698,16 +5600,11 @@ class DcnmIntf:
         resp = None
 
         if self.diff_deploy:
-            # Do a second deploy. Sometimes even if interfaces are created, they are
-            # not being deployed. A second deploy solves the same. Don't worry about
-            # the return values
-
-            resp = dcnm_send(self.module, "POST", path, json_payload)
-
-            resp = None
-
-        if self.diff_deploy:
-            self.dcnm_intf_check_deployment_status(self.diff_deploy)
+            # Sometimes even if interfaces are created, they are not being deployed. Deploy
+            # such interfaces again. Don't worry about the return values
+            redeployed = self.dcnm_intf_redeploy(self.diff_deploy)
+            redeployed |= self.dcnm_intf_check_deployment_status(self.diff_deploy)
+            self.result["redeployed"] = len(redeployed)
 
         # In overridden and deleted states, if no delete or create is happening and we have
         # only replace, then check the return message for deploy. If it says
@@ -4799,6 +5696,8 @@ class DcnmIntf:
 
     def dcnm_translate_playbook_info(self, config, ip_sn, hn_sn):
 
+        sn_ip = dict((sn, ip) for ip, sn in self.ip_sn.items())
+
         for cfg in config:
             index = 0
             if cfg.get("switch", None) is None:
@@ -4811,11 +5710,7 @@ class DcnmIntf:
                     cfg["switch"][index] = addr_info
 
                     # Check if the VPC serial number information is already present. If not fetch that
-                    if self.vpc_ip_sn.get(addr_info, None) is None:
-                        sno = self.dcnm_intf_get_vpc_serial_number(addr_info)
-                        if "~" in sno:
-                            # This switch is part of VPC pair. Populate the VPC serial number DB
-                            self.vpc_ip_sn[addr_info] = sno
+                    self.dcnm_intf_resolve_vpc_pair(addr_info, sn_ip)
                 else:
                     cfg["switch"].remove(sw_elem)
                 index = index + 1
@@ -4834,12 +5729,27 @@ def main():
             choices=["merged", "replaced", "overridden", "deleted", "query"],
         ),
         check_deploy=dict(type="bool", default=False),
+        fetch_mode=dict(
+            type="str", default="interface", choices=["interface", "switch"]
+        ),
+        batch_size=dict(type="int", default=0),
+        max_workers=dict(type="int", default=1),
+        switch_batch_size=dict(type="int", default=0),
+        query_fields=dict(type="list", elements="str", default=[]),
     )
 
     module = AnsibleModule(
         argument_spec=element_spec, supports_check_mode=True
     )
 
+    for param, minimum in [("batch_size", 0), ("switch_batch_size", 0), ("max_workers", 1)]:
+        if module.params[param] < minimum:
+            module.fail_json(
+                msg="'{0}' must be at least {1}, given = '{2}'".format(
+                    param, minimum, module.params[param]
+                )
+            )
+
     dcnm_intf = DcnmIntf(module)
 
     state = module.params["state"]
@@ -4873,6 +5783,17 @@ def main():
 
     dcnm_intf.dcnm_intf_validate_input()
 
+    # With no 'config', overridden and deleted states reset every interface in the fabric. Process
+    # and push the changes a batch of switches at a time if asked for.
+    if (
+        module.params["state"] in ["overridden", "deleted"]
+        and dcnm_intf.config == []
+        and module.params["switch_batch_size"] > 0
+    ):
+        dcnm_intf.dcnm_intf_send_overridden_in_batches()
+        dcnm_intf.result["diff"] = dcnm_intf.changed_dict
+        module.exit_json(**dcnm_intf.result)
+
     # state 'deleted' may not include all the information
     if (module.params["state"] != "query") and (
         module.params["state"] != "deleted"
@@ -858,6 +858,7 @@ from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm impor
     get_fabric_inventory_details,
     get_fabric_details,
     dcnm_get_ip_addr_info,
+    DcnmLogger,
 )
 
 
@@ -960,7 +961,7 @@ class DcnmLinks:
         self.diff_deploy = {}
         self.monitoring = []
         self.meta_switches = []
-        self.fd = None
+        self.logger = DcnmLogger("dcnm_links")
         self.changed_dict = [
             {
                 "merged": [],
@@ -987,17 +988,11 @@ class DcnmLinks:
 
         self.result = dict(changed=False, diff=[], response=[])
 
-    def log_msg(self, msg):
-
-        if self.fd is None:
-            self.fd = open("dcnm_links.log", "a+")
-        if self.fd is not None:
-            self.fd.write(msg)
-            self.fd.write("\n")
-            self.fd.flush()
-
     def dcnm_dump_have_db(self):
 
+        if not self.logger.enabled("debug"):
+            return
+
         lhave = []
 
         for have in self.have:
@@ -1014,10 +1009,13 @@ class DcnmLinks:
                     "DST SYS NAME": have["sw2-info"]["sw-sys-name"],
                 }
             )
-        self.log_msg(f"HAVE = {lhave}\n")
+        self.logger.debug("HAVE", have=lhave)
 
     def dcnm_print_have(self, have):
 
+        if not self.logger.enabled("debug"):
+            return
+
         lhave = []
 
         lhave.append(
@@ -1034,7 +1032,7 @@ class DcnmLinks:
             }
         )
 
-        self.log_msg(f"have = {lhave}\n")
+        self.logger.debug("have", have=lhave)
 
     def dcnm_links_compare_ip_addresses(self, addr1, addr2):
 
@@ -44,6 +44,40 @@ options:
       - deleted
       - query
     default: merged
+  vlan_block_allocation:
+    description:
+    - Allocate the vlan ids of all the new networks without a vlan_id in one go, before any of them is created
+    - The next available vlan id is fetched from DCNM once and the following ids are derived from it
+      within the network vlan range of the fabric, skipping the ids used by the networks and the attachments
+      already present on DCNM and the ones allocated on the switches the new networks are attached to
+    - The module fails if the range does not have enough free vlan ids for all the new networks
+    type: bool
+    default: false
+  snapshot_rollback:
+    description:
+    - Roll back a failed task from a snapshot of the networks it changes, taken before the changes are pushed
+    - Only the networks and the attachments changed by the task are reverted, without reading the fabric
+      state back from DCNM
+    - A change is recorded once the request making it succeeds, so a task failing part way only reverts
+      the changes made before the failure
+    - On NDFC, the networks to restore and the ones to delete are each sent with a single bulk request. The
+      networks updated are restored one at a time, as there is no bulk update API
+    - When false, the fabric state is read back from DCNM and the task is reverted as with state overridden
+    type: bool
+    default: false
+  max_workers:
+    description:
+    - Maximum number of per member fabric attach requests sent to the DCNM server at a time. Must be at least 1.
+    type: int
+    default: 1
+  split_by_member_fabric:
+    description:
+    - Split the attach and detach requests of a multisite fabric into one request per member fabric,
+      instead of a single request through the multisite fabric
+    - The requests are sent concurrently as per 'max_workers'
+    - The deploy requests name the networks only and are not split
+    type: bool
+    default: false
   config:
     description:
     - List of details of networks being managed. Not required for state deleted
@@ -479,12 +513,54 @@ from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm impor
     get_ip_sn_fabric_dict,
     dcnm_version_supported,
     dcnm_get_url,
+    dcnm_get_vlan_block,
+    dcnm_normalize_template_config,
+    dcnm_run_concurrently,
+    dcnm_split_attach_by_fabric,
+    dcnm_get_id_range,
+    dcnm_get_allocated_ids,
+    dcnm_take_snapshot,
+    dcnm_start_changes,
+    dcnm_record_change,
+    dcnm_get_attach_succeeded,
+    dcnm_get_diff_rollback,
 )
 from ansible.module_utils.basic import AnsibleModule
 
 
 class DcnmNetwork:
 
+    # Fields of the networkTemplateConfig as (name, default, minimum DCNM version)
+    network_template_fields = [
+        ("vlanId", "", 11),
+        ("gatewayIpAddress", "", 11),
+        ("isLayer2Only", False, 11),
+        ("tag", "", 11),
+        ("vlanName", "", 11),
+        ("intfDescription", "", 11),
+        ("mtu", "", 11),
+        ("suppressArp", False, 11),
+        ("dhcpServerAddr1", "", 11),
+        ("dhcpServerAddr2", "", 11),
+        ("dhcpServerAddr3", "", 11),
+        ("vrfDhcp", "", 11),
+        ("vrfDhcp2", "", 11),
+        ("vrfDhcp3", "", 11),
+        ("loopbackId", "", 11),
+        ("mcastGroup", "", 11),
+        ("gatewayIpV6Address", "", 11),
+        ("secondaryGW1", "", 11),
+        ("secondaryGW2", "", 11),
+        ("secondaryGW3", "", 11),
+        ("secondaryGW4", "", 11),
+        ("trmEnabled", False, 11),
+        ("rtBothAuto", False, 11),
+        ("enableL3OnBorder", False, 11),
+        ("ENABLE_NETFLOW", False, 12),
+        ("SVI_NETFLOW_MONITOR", "", 12),
+        ("VLAN_NETFLOW_MONITOR", "", 12),
+    ]
+
     dcnm_network_paths = {
         11: {
             "GET_VRF": "/rest/top-down/fabrics/{}/vrfs",
@@ -494,6 +570,7 @@ class DcnmNetwork:
             "GET_NET": "/rest/top-down/fabrics/{}/networks",
             "GET_NET_NAME": "/rest/top-down/fabrics/{}/networks/{}",
             "GET_VLAN": "/rest/resource-manager/vlan/{}?vlanUsageType=TOP_DOWN_NETWORK_VLAN",
+            "GET_SWITCH_VLAN_POOL": "/rest/resource-manager/switch/{}/pools/{}",
         },
         12: {
             "GET_VRF": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{}/vrfs",
@@ -503,6 +580,9 @@ class DcnmNetwork:
             "GET_NET": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{}/networks",
             "GET_NET_NAME": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{}/networks/{}",
             "GET_VLAN": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/resource-manager/vlan/{}?vlanUsageType=TOP_DOWN_NETWORK_VLAN",
+            "GET_SWITCH_VLAN_POOL": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/resource-manager/switch/{}/pools/{}",
+            "BULK_CREATE_NET": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/bulk-create/networks",
+            "BULK_DELETE_NET": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{}/bulk-delete/networks?network-names={}",
         },
     }
 
@@ -554,8 +634,48 @@ class DcnmNetwork:
         self.result = dict(changed=False, diff=[], response=[], warnings=[])
 
         self.failed_to_rollback = False
+        # Decoded template configs, indexed by their encoded string
+        self.template_configs = {}
+        # Serialized have state of each network and the changes pushed by the task, see take_snapshot()
+        self.snapshot = {}
+        self.changes = None
         self.WAIT_TIME_FOR_DELETE_LOOP = 5  # in seconds
 
+    def dump_template_config(self, template_config):
+
+        """
+        Routine to encode a networkTemplateConfig. The dict is kept along with the encoded string, so that
+        load_template_config() does not need to parse it again.
+
+        Parameters:
+            template_config (dict): template config
+
+        Returns:
+            str: encoded template config
+        """
+
+        config = json.dumps(template_config)
+        self.template_configs[config] = template_config
+        return config
+
+    def load_template_config(self, config):
+
+        """
+        Routine to decode a networkTemplateConfig. The template configs encoded by dump_template_config()
+        are not parsed again.
+
+        Parameters:
+            config (str): encoded template config
+
+        Returns:
+            dict: template config, a copy which the caller may modify
+        """
+
+        template_config = self.template_configs.get(config)
+        if template_config is None:
+            template_config = json.loads(config)
+        return dict(template_config)
+
     def diff_for_attach_deploy(self, want_a, have_a, replace=False):
 
         attach_list = []
@@ -925,8 +1045,8 @@ class DcnmNetwork:
                 )
             )
 
-        json_to_dict_want = json.loads(want["networkTemplateConfig"])
-        json_to_dict_have = json.loads(have["networkTemplateConfig"])
+        json_to_dict_want = self.load_template_config(want["networkTemplateConfig"])
+        json_to_dict_have = self.load_template_config(have["networkTemplateConfig"])
 
         gw_ip_want = json_to_dict_want.get("gatewayIpAddress", "")
         gw_ip_have = json_to_dict_have.get("gatewayIpAddress", "")
@@ -1312,7 +1432,7 @@ class DcnmNetwork:
             if template_conf["VLAN_NETFLOW_MONITOR"] is None:
                 template_conf["VLAN_NETFLOW_MONITOR"] = ""
 
-        net_upd.update({"networkTemplateConfig": json.dumps(template_conf)})
+        net_upd.update({"networkTemplateConfig": self.dump_template_config(template_conf)})
 
         return net_upd
 
@@ -1377,40 +1497,13 @@ class DcnmNetwork:
                 continue
 
             for net in networks_per_vrf["DATA"]:
-                json_to_dict = json.loads(net["networkTemplateConfig"])
-                t_conf = {
-                    "vlanId": json_to_dict.get("vlanId", ""),
-                    "gatewayIpAddress": json_to_dict.get("gatewayIpAddress", ""),
-                    "isLayer2Only": json_to_dict.get("isLayer2Only", False),
-                    "tag": json_to_dict.get("tag", ""),
-                    "vlanName": json_to_dict.get("vlanName", ""),
-                    "intfDescription": json_to_dict.get("intfDescription", ""),
-                    "mtu": json_to_dict.get("mtu", ""),
-                    "suppressArp": json_to_dict.get("suppressArp", False),
-                    "dhcpServerAddr1": json_to_dict.get("dhcpServerAddr1", ""),
-                    "dhcpServerAddr2": json_to_dict.get("dhcpServerAddr2", ""),
-                    "dhcpServerAddr3": json_to_dict.get("dhcpServerAddr3", ""),
-                    "vrfDhcp": json_to_dict.get("vrfDhcp", ""),
-                    "vrfDhcp2": json_to_dict.get("vrfDhcp2", ""),
-                    "vrfDhcp3": json_to_dict.get("vrfDhcp3", ""),
-                    "loopbackId": json_to_dict.get("loopbackId", ""),
-                    "mcastGroup": json_to_dict.get("mcastGroup", ""),
-                    "gatewayIpV6Address": json_to_dict.get("gatewayIpV6Address", ""),
-                    "secondaryGW1": json_to_dict.get("secondaryGW1", ""),
-                    "secondaryGW2": json_to_dict.get("secondaryGW2", ""),
-                    "secondaryGW3": json_to_dict.get("secondaryGW3", ""),
-                    "secondaryGW4": json_to_dict.get("secondaryGW4", ""),
-                    "trmEnabled": json_to_dict.get("trmEnabled", False),
-                    "rtBothAuto": json_to_dict.get("rtBothAuto", False),
-                    "enableL3OnBorder": json_to_dict.get("enableL3OnBorder", False),
-                }
-
-                if self.dcnm_version > 11:
-                    t_conf.update(ENABLE_NETFLOW=json_to_dict.get("ENABLE_NETFLOW", False))
-                    t_conf.update(SVI_NETFLOW_MONITOR=json_to_dict.get("SVI_NETFLOW_MONITOR", ""))
-                    t_conf.update(VLAN_NETFLOW_MONITOR=json_to_dict.get("VLAN_NETFLOW_MONITOR", ""))
+                t_conf = dcnm_normalize_template_config(
+                    self.load_template_config(net["networkTemplateConfig"]),
+                    self.network_template_fields,
+                    self.dcnm_version,
+                )
 
-                net.update({"networkTemplateConfig": json.dumps(t_conf)})
+                net.update({"networkTemplateConfig": self.dump_template_config(t_conf)})
                 del net["displayName"]
                 del net["serviceNetworkTemplate"]
                 del net["source"]
@@ -1425,41 +1518,13 @@ class DcnmNetwork:
 
             if networks_per_navrf.get("DATA"):
                 for l2net in networks_per_navrf["DATA"]:
-                    json_to_dict = json.loads(l2net["networkTemplateConfig"])
+                    json_to_dict = self.load_template_config(l2net["networkTemplateConfig"])
                     if (json_to_dict.get("vrfName", "")) == "NA":
-                        t_conf = {
-                            "vlanId": json_to_dict.get("vlanId", ""),
-                            "gatewayIpAddress": json_to_dict.get("gatewayIpAddress", ""),
-                            "isLayer2Only": json_to_dict.get("isLayer2Only", False),
-                            "tag": json_to_dict.get("tag", ""),
-                            "vlanName": json_to_dict.get("vlanName", ""),
-                            "intfDescription": json_to_dict.get("intfDescription", ""),
-                            "mtu": json_to_dict.get("mtu", ""),
-                            "suppressArp": json_to_dict.get("suppressArp", False),
-                            "dhcpServerAddr1": json_to_dict.get("dhcpServerAddr1", ""),
-                            "dhcpServerAddr2": json_to_dict.get("dhcpServerAddr2", ""),
-                            "dhcpServerAddr3": json_to_dict.get("dhcpServerAddr3", ""),
-                            "vrfDhcp": json_to_dict.get("vrfDhcp", ""),
-                            "vrfDhcp2": json_to_dict.get("vrfDhcp2", ""),
-                            "vrfDhcp3": json_to_dict.get("vrfDhcp3", ""),
-                            "loopbackId": json_to_dict.get("loopbackId", ""),
-                            "mcastGroup": json_to_dict.get("mcastGroup", ""),
-                            "gatewayIpV6Address": json_to_dict.get("gatewayIpV6Address", ""),
-                            "secondaryGW1": json_to_dict.get("secondaryGW1", ""),
-                            "secondaryGW2": json_to_dict.get("secondaryGW2", ""),
-                            "secondaryGW3": json_to_dict.get("secondaryGW3", ""),
-                            "secondaryGW4": json_to_dict.get("secondaryGW4", ""),
-                            "trmEnabled": json_to_dict.get("trmEnabled", False),
-                            "rtBothAuto": json_to_dict.get("rtBothAuto", False),
-                            "enableL3OnBorder": json_to_dict.get("enableL3OnBorder", False),
-                        }
-
-                        if self.dcnm_version > 11:
-                            t_conf.update(ENABLE_NETFLOW=json_to_dict.get("ENABLE_NETFLOW", False))
-                            t_conf.update(SVI_NETFLOW_MONITOR=json_to_dict.get("SVI_NETFLOW_MONITOR", ""))
-                            t_conf.update(VLAN_NETFLOW_MONITOR=json_to_dict.get("VLAN_NETFLOW_MONITOR", ""))
+                        t_conf = dcnm_normalize_template_config(
+                            json_to_dict, self.network_template_fields, self.dcnm_version
+                        )
 
-                        l2net.update({"networkTemplateConfig": json.dumps(t_conf)})
+                        l2net.update({"networkTemplateConfig": self.dump_template_config(t_conf)})
                         del l2net["displayName"]
                         del l2net["serviceNetworkTemplate"]
                         del l2net["source"]
@@ -1569,6 +1634,9 @@ class DcnmNetwork:
         self.have_attach = have_attach
         self.have_deploy = have_deploy
 
+        if self.params["snapshot_rollback"]:
+            self.take_snapshot()
+
     def get_want(self):
 
         want_create = []
@@ -2180,7 +2248,7 @@ class DcnmNetwork:
 
             found_c = want_d
 
-            json_to_dict = json.loads(found_c["networkTemplateConfig"])
+            json_to_dict = self.load_template_config(found_c["networkTemplateConfig"])
 
             found_c.update({"net_name": found_c["networkName"]})
             found_c.update({"vrf_name": found_c.get("vrf", "NA")})
@@ -2424,8 +2492,204 @@ class DcnmNetwork:
             for node in list_elem["lanAttachList"]:
                 node["fabric"] = self.sn_fab[node["serialNumber"]]
 
+    def send_attach_requests(self, attach_path, diff, is_rollback, retry=False, record=None):
+
+        """
+        Routine to send an attach or detach payload to DCNM. With 'split_by_member_fabric' set on a
+        multisite fabric, the payload is split by member fabric and the requests are sent concurrently
+        as per 'max_workers'. The responses are handled in the order of the member fabrics and once a
+        request fails, the requests not yet sent are skipped.
+
+        Parameters:
+            attach_path (str): Path of the attachments API
+            diff (list): diff_attach or diff_detach, with the fabric of the attachments already updated
+            is_rollback (bool): True if the requests are sent to rollback the changes made
+            retry (bool): Resend a request while DCNM reports that an update is still in progress
+            record (str): Kind of change recorded by record_change() for each request that succeeds
+
+        Returns:
+            bool: False if a request failed during rollback, True otherwise
+        """
+
+        if self.is_ms_fabric and self.params["split_by_member_fabric"]:
+            payloads = dcnm_split_attach_by_fabric(diff)
+        else:
+            payloads = [diff]
+
+        failed = []
+
+        def send_request(payload):
+            if failed:
+                return None
+            for attempt in range(0, 50):
+                resp = dcnm_send(self.module, "POST", attach_path, json.dumps(payload))
+                update_in_progress = False
+                if retry:
+                    for key in resp["DATA"].keys():
+                        if re.search(
+                            r"Failed.*Please try after some time", str(resp["DATA"][key])
+                        ):
+                            update_in_progress = True
+                if update_in_progress:
+                    time.sleep(1)
+                    continue
+
+                break
+            # If we get here and an update_in_progress is True then
+            # not all of the attachments were successful which represents a
+            # failure condition.
+            fail, changed = self.handle_response(resp, "attach")
+            fail = fail or update_in_progress
+            if fail:
+                failed.append(payload)
+            return resp, fail, changed
+
+        results = dcnm_run_concurrently(
+            send_request, payloads, self.params["max_workers"]
+        )
+
+        for payload, result in zip(payloads, results):
+            if result is None:
+                continue
+            resp, fail, self.result["changed"] = result
+            self.result["response"].append(resp)
+            if fail:
+                if is_rollback:
+                    self.failed_to_rollback = True
+                    return False
+                if record:
+                    succeeded = dcnm_get_attach_succeeded(payload, resp, "networkName")
+                    self.record_change(record, succeeded, is_rollback)
+                self.failure(resp)
+            if record:
+                self.record_change(record, payload, is_rollback)
+
+        return True
+
+    def assign_vlan_block(self):
+
+        """
+        Routine to allocate the vlan ids of all the networks being created without a vlan_id in one go,
+        before any of them is created. The vlan ids are taken from the network vlan range of the fabric,
+        skipping the ones used by the networks and the attachments present on DCNM, by the other networks
+        being created and the ones allocated on the switches the new networks are attached to.
+        """
+
+        nets = []
+        used_vlans = set()
+        for net in self.diff_create:
+            vlan_id = self.load_template_config(net["networkTemplateConfig"]).get("vlanId", "")
+            if not vlan_id:
+                nets.append(net)
+            elif str(vlan_id).isdigit():
+                used_vlans.add(int(vlan_id))
+
+        for net in self.have_create:
+            vlan_id = self.load_template_config(net["networkTemplateConfig"]).get("vlanId", "")
+            if str(vlan_id).isdigit():
+                used_vlans.add(int(vlan_id))
+
+        for net_attach in self.have_attach + self.want_attach:
+            for attach in net_attach.get("lanAttachList") or []:
+                vlan_id = attach.get("vlan", attach.get("vlanId"))
+                if str(vlan_id).isdigit():
+                    used_vlans.add(int(vlan_id))
+        used_vlans.discard(0)
+
+        if not nets:
+            return
+
+        vlan_path = self.paths["GET_VLAN"].format(self.fabric)
+        vlan_data = dcnm_send(self.module, "GET", vlan_path)
+
+        # The vrf and network vlans share the vlan space of a switch, including the ones reserved
+        # outside of this task, so the pools of every switch the new networks are attached to are checked
+        names = set(net["networkName"] for net in nets)
+        serials = sorted(set(
+            attach["serialNumber"]
+            for net_attach in self.want_attach
+            if net_attach["networkName"] in names
+            for attach in net_attach.get("lanAttachList") or []
+        ))
+        for serial in serials:
+            for pool in ("TOP_DOWN_VRF_VLAN", "TOP_DOWN_NETWORK_VLAN"):
+                path = self.paths["GET_SWITCH_VLAN_POOL"].format(serial, pool)
+                used_vlans.update(dcnm_get_allocated_ids(dcnm_send(self.module, "GET", path)))
+
+        vlan_range = dcnm_get_id_range(self.fabric_det, "NETWORK_VLAN_RANGE", (1, 4094))
+        vlan_ids = dcnm_get_vlan_block(self.module, vlan_data, len(nets), used_vlans, vlan_range)
+        for net, vlan_id in zip(nets, vlan_ids):
+            json_to_dict = self.load_template_config(net["networkTemplateConfig"])
+            json_to_dict.update({"vlanId": vlan_id})
+            net.update({"networkTemplateConfig": self.dump_template_config(json_to_dict)})
+
+    def take_snapshot(self):
+
+        """
+        Routine to serialize the have state of every network: its payload and its attachments. The snapshot
+        is taken before the diffs are computed, since computing them alters the have state, and lets
+        get_diff_rollback() revert a failed task without reading the state back from DCNM.
+        """
+
+        self.snapshot = dcnm_take_snapshot(self.have_create, self.have_attach, "networkName")
+
+    def record_changes(self):
+
+        """
+        Routine to start recording the changes made by push_to_remote(). Only the snapshots of the networks
+        about to be changed are kept. The networks created by get_diff_merge() are already recorded, the other
+        changes are recorded by record_change() as their requests succeed.
+        """
+
+        names = set(
+            net["networkName"]
+            for net in self.diff_create + self.diff_create_quick + self.diff_create_update
+        )
+        names.update(self.diff_delete)
+        names.update(diff_a["networkName"] for diff_a in self.diff_attach + self.diff_detach)
+        self.snapshot, self.changes = dcnm_start_changes(
+            self.snapshot,
+            names,
+            [net["networkName"] for net in self.diff_create_quick],
+        )
+
+    def record_change(self, kind, payload, is_rollback):
+
+        """
+        Routine to record a change made by push_to_remote() once its request has succeeded, see
+        dcnm_record_change(). Nothing is recorded while rolling back or without 'snapshot_rollback'.
+        """
+
+        if is_rollback or self.changes is None:
+            return
+        dcnm_record_change(self.changes, kind, "networkName", payload)
+
+    def get_diff_rollback(self):
+
+        """
+        Routine to compute the operations reverting the changes recorded by record_changes(). The detach,
+        attach and deploy operations are each sent as a single request by push_to_remote().
+        """
+
+        diff = dcnm_get_diff_rollback(self.snapshot, self.changes, "networkName")
+
+        self.diff_create = diff["create"]
+        self.diff_create_update = diff["create_update"]
+        self.diff_delete = diff["delete"]
+        self.diff_attach = diff["attach"]
+        self.diff_detach = diff["detach"]
+        self.diff_deploy = (
+            {"networkNames": ",".join(diff["deploy_names"])} if diff["deploy_names"] else {}
+        )
+        self.diff_undeploy = (
+            {"networkNames": ",".join(diff["undeploy_names"])} if diff["undeploy_names"] else {}
+        )
+
     def push_to_remote(self, is_rollback=False):
 
+        if self.params["snapshot_rollback"] and not is_rollback:
+            self.record_changes()
+
         path = self.paths["GET_NET"].format(self.fabric)
 
         method = "PUT"
@@ -2440,6 +2704,7 @@ class DcnmNetwork:
                         self.failed_to_rollback = True
                         return
                     self.failure(resp)
+                self.record_change("updated", net, is_rollback)
 
         #
         # The detach and un-deploy operations are executed before the create,attach and deploy to particularly
@@ -2458,16 +2723,10 @@ class DcnmNetwork:
                 for v_a in d_a["lanAttachList"]:
                     del v_a["is_deploy"]
 
-            resp = dcnm_send(
-                self.module, method, detach_path, json.dumps(self.diff_detach)
-            )
-            self.result["response"].append(resp)
-            fail, self.result["changed"] = self.handle_response(resp, "attach")
-            if fail:
-                if is_rollback:
-                    self.failed_to_rollback = True
-                    return
-                self.failure(resp)
+            if not self.send_attach_requests(
+                detach_path, self.diff_detach, is_rollback, record="detached"
+            ):
+                return
 
         method = "POST"
         if self.diff_undeploy:
@@ -2496,11 +2755,21 @@ class DcnmNetwork:
         method = "DELETE"
         del_failure = ""
         if self.diff_delete and self.wait_for_del_ready():
+            nets = []
             for net, state in self.diff_delete.items():
                 if state == "OUT-OF-SYNC":
                     del_failure += net + ","
                     continue
-                delete_path = path + "/" + net
+                nets.append(net)
+
+            # The networks created by the task are deleted with a single request when rolling back
+            if is_rollback and nets and "BULK_DELETE_NET" in self.paths:
+                delete_path = self.paths["BULK_DELETE_NET"].format(self.fabric, ",".join(nets))
+                requests = [(delete_path, nets)]
+            else:
+                requests = [(path + "/" + net, [net]) for net in nets]
+
+            for delete_path, names in requests:
                 resp = dcnm_send(self.module, method, delete_path)
                 self.result["response"].append(resp)
                 fail, self.result["changed"] = self.handle_response(resp, "delete")
@@ -2509,6 +2778,7 @@ class DcnmNetwork:
                         self.failed_to_rollback = True
                         return
                     self.failure(resp)
+                self.record_change("deleted", names, is_rollback)
 
         if del_failure:
             fail_msg = "Deletion of Networks {0} has failed: {1}".format(del_failure[:-1], resp)
@@ -2519,8 +2789,11 @@ class DcnmNetwork:
             self.failure(fail_msg)
 
         if self.diff_create:
+            if self.params["vlan_block_allocation"]:
+                self.assign_vlan_block()
+
             for net in self.diff_create:
-                json_to_dict = json.loads(net["networkTemplateConfig"])
+                json_to_dict = self.load_template_config(net["networkTemplateConfig"])
                 vlanId = json_to_dict.get("vlanId", "")
 
                 if not vlanId:
@@ -2535,39 +2808,18 @@ class DcnmNetwork:
                         )
                     vlanId = vlan_data["DATA"]
 
-                t_conf = {
-                    "vlanId": vlanId,
-                    "gatewayIpAddress": json_to_dict.get("gatewayIpAddress", ""),
-                    "isLayer2Only": json_to_dict.get("isLayer2Only", False),
-                    "tag": json_to_dict.get("tag", ""),
-                    "vlanName": json_to_dict.get("vlanName", ""),
-                    "intfDescription": json_to_dict.get("intfDescription", ""),
-                    "mtu": json_to_dict.get("mtu", ""),
-                    "suppressArp": json_to_dict.get("suppressArp", False),
-                    "dhcpServerAddr1": json_to_dict.get("dhcpServerAddr1", ""),
-                    "dhcpServerAddr2": json_to_dict.get("dhcpServerAddr2", ""),
-                    "dhcpServerAddr3": json_to_dict.get("dhcpServerAddr3", ""),
-                    "vrfDhcp": json_to_dict.get("vrfDhcp", ""),
-                    "vrfDhcp2": json_to_dict.get("vrfDhcp2", ""),
-                    "vrfDhcp3": json_to_dict.get("vrfDhcp3", ""),
-                    "loopbackId": json_to_dict.get("loopbackId", ""),
-                    "mcastGroup": json_to_dict.get("mcastGroup", ""),
-                    "gatewayIpV6Address": json_to_dict.get("gatewayIpV6Address", ""),
-                    "secondaryGW1": json_to_dict.get("secondaryGW1", ""),
-                    "secondaryGW2": json_to_dict.get("secondaryGW2", ""),
-                    "secondaryGW3": json_to_dict.get("secondaryGW3", ""),
-                    "secondaryGW4": json_to_dict.get("secondaryGW4", ""),
-                    "trmEnabled": json_to_dict.get("trmEnabled", False),
-                    "rtBothAuto": json_to_dict.get("rtBothAuto", False),
-                    "enableL3OnBorder": json_to_dict.get("enableL3OnBorder", False),
-                }
+                t_conf = dcnm_normalize_template_config(
+                    json_to_dict,
+                    self.network_template_fields,
+                    self.dcnm_version,
+                    vlanId=vlanId,
+                )
 
-                if self.dcnm_version > 11:
-                    t_conf.update(ENABLE_NETFLOW=json_to_dict.get("ENABLE_NETFLOW", False))
-                    t_conf.update(SVI_NETFLOW_MONITOR=json_to_dict.get("SVI_NETFLOW_MONITOR", ""))
-                    t_conf.update(VLAN_NETFLOW_MONITOR=json_to_dict.get("VLAN_NETFLOW_MONITOR", ""))
+                net.update({"networkTemplateConfig": self.dump_template_config(t_conf)})
 
-                net.update({"networkTemplateConfig": json.dumps(t_conf)})
+                # The networks deleted by the task are restored with a single request when rolling back
+                if is_rollback and "BULK_CREATE_NET" in self.paths:
+                    continue
 
                 method = "POST"
                 resp = dcnm_send(self.module, method, path, json.dumps(net))
@@ -2578,6 +2830,18 @@ class DcnmNetwork:
                         self.failed_to_rollback = True
                         return
                     self.failure(resp)
+                self.record_change("created", net, is_rollback)
+
+            if is_rollback and "BULK_CREATE_NET" in self.paths:
+                method = "POST"
+                resp = dcnm_send(
+                    self.module, method, self.paths["BULK_CREATE_NET"], json.dumps(self.diff_create)
+                )
+                self.result["response"].append(resp)
+                fail, self.result["changed"] = self.handle_response(resp, "create")
+                if fail:
+                    self.failed_to_rollback = True
+                    return
 
         method = "POST"
         if self.diff_attach:
@@ -2590,31 +2854,10 @@ class DcnmNetwork:
                 for v_a in d_a["lanAttachList"]:
                     del v_a["is_deploy"]
 
-            for attempt in range(0, 50):
-                resp = dcnm_send(
-                    self.module, method, attach_path, json.dumps(self.diff_attach)
-                )
-                update_in_progress = False
-                for key in resp["DATA"].keys():
-                    if re.search(
-                        r"Failed.*Please try after some time", str(resp["DATA"][key])
-                    ):
-                        update_in_progress = True
-                if update_in_progress:
-                    time.sleep(1)
-                    continue
-
-                break
-            self.result["response"].append(resp)
-            fail, self.result["changed"] = self.handle_response(resp, "attach")
-            # If we get here and an update_in_progress is True then
-            # not all of the attachments were successful which represents a
-            # failure condition.
-            if fail or update_in_progress:
-                if is_rollback:
-                    self.failed_to_rollback = True
-                    return
-                self.failure(resp)
+            if not self.send_attach_requests(
+                attach_path, self.diff_attach, is_rollback, retry=True, record="attached"
+            ):
+                return
 
         method = "POST"
         if self.diff_deploy:
@@ -2934,15 +3177,18 @@ class DcnmNetwork:
         # Implementing a per task rollback logic here so that we rollback DCNM to the have state
         # whenever there is a failure in any of the APIs.
         # The idea would be to run overridden state with want=have and have=dcnm_state
-        self.want_create = self.have_create
-        self.want_attach = self.have_attach
-        self.want_deploy = self.have_deploy
+        if self.changes is not None:
+            self.get_diff_rollback()
+        else:
+            self.want_create = self.have_create
+            self.want_attach = self.have_attach
+            self.want_deploy = self.have_deploy
 
-        self.have_create = []
-        self.have_attach = []
-        self.have_deploy = {}
-        self.get_have()
-        self.get_diff_override()
+            self.have_create = []
+            self.have_attach = []
+            self.have_deploy = {}
+            self.get_have()
+            self.get_diff_override()
 
         self.push_to_remote(True)
 
@@ -2984,8 +3230,8 @@ class DcnmNetwork:
         if cfg.get("net_extension_template", None) is None:
             want["networkExtensionTemplate"] = have["networkExtensionTemplate"]
 
-        json_to_dict_want = json.loads(want["networkTemplateConfig"])
-        json_to_dict_have = json.loads(have["networkTemplateConfig"])
+        json_to_dict_want = self.load_template_config(want["networkTemplateConfig"])
+        json_to_dict_have = self.load_template_config(have["networkTemplateConfig"])
 
         if cfg.get("vlan_id", None) is None:
             json_to_dict_want["vlanId"] = json_to_dict_have["vlanId"]
@@ -3101,7 +3347,7 @@ class DcnmNetwork:
             if cfg.get("vlan_nf_monitor", None) is None:
                 json_to_dict_want["VLAN_NETFLOW_MONITOR"] = json_to_dict_have["VLAN_NETFLOW_MONITOR"]
 
-        want.update({"networkTemplateConfig": json.dumps(json_to_dict_want)})
+        want.update({"networkTemplateConfig": self.dump_template_config(json_to_dict_want)})
 
     def update_want(self):
         """
@@ -3157,10 +3403,21 @@ def main():
             default="merged",
             choices=["merged", "replaced", "deleted", "overridden", "query"],
         ),
+        vlan_block_allocation=dict(required=False, type="bool", default=False),
+        snapshot_rollback=dict(required=False, type="bool", default=False),
+        max_workers=dict(required=False, type="int", default=1),
+        split_by_member_fabric=dict(required=False, type="bool", default=False),
     )
 
     module = AnsibleModule(argument_spec=element_spec, supports_check_mode=True)
 
+    if module.params["max_workers"] < 1:
+        module.fail_json(
+            msg="'max_workers' must be at least 1, given = '{0}'".format(
+                module.params["max_workers"]
+            )
+        )
+
     dcnm_net = DcnmNetwork(module)
 
     if not dcnm_net.ip_sn:
@@ -353,6 +353,7 @@ from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm impor
     validate_list_of_dicts,
     get_ip_sn_dict,
     dcnm_version_supported,
+    DcnmLogger,
 )
 
 
@@ -398,7 +399,7 @@ class DcnmPolicy:
         self.diff_delete = []
         self.diff_query = []
         self.deploy_payload = []
-        self.fd = None
+        self.logger = DcnmLogger("dcnm_policy")
         self.changed_dict = [
             {
                 "merged": [],
@@ -426,15 +427,6 @@ class DcnmPolicy:
         self.result = dict(changed=False, diff=[], response=[])
         self.paths = self.dcnm_policy_paths[self.dcnm_version]
 
-    def log_msg(self, msg):
-
-        if self.fd is None:
-            self.fd = open("policy.log", "w+")
-        if self.fd is not None:
-            self.fd.write(msg)
-            self.fd.write("\n")
-            self.fd.flush()
-
     # Flatten the incoming config database and have the required fileds updated.
     # This modified config DB will be used while creating payloads. To avoid
     # messing up the incoming config make a copy of it.
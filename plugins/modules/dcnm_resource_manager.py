@@ -290,6 +290,7 @@ from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm impor
     get_ip_sn_dict,
     get_fabric_inventory_details,
     dcnm_get_ip_addr_info,
+    DcnmLogger,
 )
 
 from datetime import datetime
@@ -324,7 +325,7 @@ class DcnmResManager:
         self.have = []
         self.diff_create = []
         self.diff_delete = []
-        self.fd = None
+        self.logger = DcnmLogger("dcnm_rm")
         self.res_pools = {}
         self.changed_dict = [
             {"merged": [], "deleted": [], "query": [], "debugs": []}
@@ -340,15 +341,6 @@ class DcnmResManager:
         self.paths = self.dcnm_rm_paths[self.dcnm_version]
         self.result = dict(changed=False, diff=[], response=[])
 
-    def log_msg(self, msg):
-
-        if self.fd is None:
-            self.fd = open("res_mgr.log", "w+")
-        if self.fd is not None:
-            self.fd.write(msg)
-            self.fd.write("\n")
-            self.fd.flush()
-
     def dcnm_rm_validate_and_build_rm_info(self, cfg, rm_spec):
 
         """
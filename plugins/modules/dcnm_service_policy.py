@@ -448,6 +448,7 @@ from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm impor
     validate_list_of_dicts,
     dcnm_reset_connection,
     dcnm_version_supported,
+    DcnmLogger,
 )
 
 from datetime import datetime
@@ -499,7 +500,7 @@ class DcnmServicePolicy:
         self.diff_modify = []
         self.diff_delete = []
         self.diff_deploy = []
-        self.fd = None
+        self.logger = DcnmLogger("dcnm_sp")
         self.changed_dict = [
             {
                 "merged": [],
@@ -515,15 +516,6 @@ class DcnmServicePolicy:
         self.paths = self.dcnm_sp_paths[self.dcnm_version]
         self.result = dict(changed=False, diff=[], response=[])
 
-    def log_msg(self, msg):
-
-        if self.fd is None:
-            self.fd = open("sp.log", "a+")
-        if self.fd is not None:
-            self.fd.write(msg)
-            self.fd.write("\n")
-            self.fd.flush()
-
     def dcnm_sp_validate_and_build_sp_info(self, cfg, sp_spec, sp_policy_spec):
 
         """
@@ -1169,6 +1169,7 @@ from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm impor
     validate_list_of_dicts,
     dcnm_reset_connection,
     dcnm_version_supported,
+    DcnmLogger,
 )
 
 from datetime import datetime
@@ -1224,7 +1225,7 @@ class DcnmServiceRoutePeering:
         self.diff_delete = []
         self.diff_deploy = []
         self.deployed_srps = []
-        self.fd = None
+        self.logger = DcnmLogger("dcnm_srp")
         self.changed_dict = [
             {
                 "merged": [],
@@ -1241,15 +1242,6 @@ class DcnmServiceRoutePeering:
         self.paths = self.dcnm_srp_paths[self.dcnm_version]
         self.result = dict(changed=False, diff=[], response=[])
 
-    def log_msg(self, msg):
-
-        if self.fd is None:
-            self.fd = open("srp.log", "a+")
-        if self.fd is not None:
-            self.fd.write(msg)
-            self.fd.write("\n")
-            self.fd.flush()
-
     def dcnm_srp_validate_and_build_srp_info(
         self,
         cfg,
@@ -181,6 +181,7 @@ from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm impor
     dcnm_send,
     validate_list_of_dicts,
     dcnm_version_supported,
+    DcnmLogger,
 )
 
 
@@ -217,7 +218,7 @@ class DcnmTemplate:
         self.diff_query = []
         self.valid_fail = []
         self.template_info = []
-        self.fd = None
+        self.logger = DcnmLogger("dcnm_template")
         self.changed_dict = [{"merged": [], "deleted": [], "query": [], "failed": []}]
 
         self.dcnm_version = dcnm_version_supported(self.module)
@@ -225,15 +226,6 @@ class DcnmTemplate:
         self.result = dict(changed=False, diff=[], response=[])
         self.paths = self.dcnm_template_paths[self.dcnm_version]
 
-    def log_msg(self, msg):
-
-        if self.fd is None:
-            self.fd = open("template.log", "w+")
-        if self.fd is not None:
-            self.fd.write(msg)
-            self.fd.write("\n")
-            self.fd.flush()
-
     def dcnm_template_validate_input(self):
 
         if self.config is None:
@@ -47,6 +47,80 @@ options:
       - deleted
       - query
     default: merged
+  delete_timeout:
+    description:
+    - Maximum time in seconds to wait for the vrfs being deleted to be detached from all the switches
+    - The module fails if some of the vrfs are still attached after this time. When the vrfs are being
+      deleted to roll back a failed task, the rollback is reported as failed instead
+    - A failed query of the attachments is retried until this time runs out
+    type: int
+    default: 600
+  vrf_id_block_allocation:
+    description:
+    - Allocate the vrfIds of all the new vrfs without a vrf_id in one go, instead of fetching and
+      creating them one vrf at a time
+    - The next available vrfId is fetched from DCNM once and the following ids are derived from it
+      within the L3 VNI range of the fabric, skipping the ids used by the vrfs already present on DCNM,
+      the ones given in the playbook and the ones allocated in the L3_VNI pool of the resource manager
+    - The module fails if the range does not have enough free ids for all the new vrfs
+    - The new vrfs are then created together with the vrfs that have a vrf_id
+    type: bool
+    default: false
+  vlan_block_allocation:
+    description:
+    - Allocate the vlan ids of all the new vrfs without a vlan_id in one go, before any of them is created
+    - The next available vlan id is fetched from DCNM once and the following ids are derived from it
+      within the VRF vlan range of the fabric, skipping the ids used by the vrfs and the attachments
+      already present on DCNM and the ones allocated on the switches the new vrfs are attached to
+    - The module fails if the range does not have enough free vlan ids for all the new vrfs
+    type: bool
+    default: false
+  max_workers:
+    description:
+    - Maximum number of vrf update requests, of vrf create requests when the vlan ids are allocated
+      with 'vlan_block_allocation', and of per member fabric attach requests in progress at a time.
+      Must be at least 1.
+    - The requests are still served one at a time by the persistent connection to the DCNM server.
+      More workers only overlap the processing of payloads and responses with the requests.
+    - Does not change how the vlan ids of the new vrfs are allocated
+    type: int
+    default: 1
+  bulk_create:
+    description:
+    - Create all the new vrfs with a single request to the bulk create API
+    - Supported on NDFC only, ignored on DCNM 11
+    - When the bulk create API is used, the vlan ids of the new vrfs are allocated as with
+      'vlan_block_allocation'
+    type: bool
+    default: false
+  query_switch_details:
+    description:
+    - Include the per switch details, such as the VRF Lite extensions, of each attachment in the
+      output of state query
+    - When false, the attachments are listed as returned by the attachments API, which is enough
+      when only the attachment state is needed
+    type: bool
+    default: true
+  snapshot_rollback:
+    description:
+    - Roll back a failed task from a snapshot of the vrfs it changes, taken before the changes are pushed
+    - Only the vrfs and the attachments changed by the task are reverted, without reading the fabric
+      state back from DCNM
+    - A change is recorded once the request making it succeeds, so a task failing part way only reverts
+      the changes made before the failure
+    - On NDFC, the vrfs to restore and the ones to delete are each sent with a single bulk request. The
+      vrfs updated are restored one at a time, as there is no bulk update API
+    - When false, the fabric state is read back from DCNM and the task is reverted as with state overridden
+    type: bool
+    default: false
+  split_by_member_fabric:
+    description:
+    - Split the attach and detach requests of a multisite fabric into one request per member fabric,
+      instead of a single request through the multisite fabric
+    - The requests are sent concurrently as per 'max_workers'
+    - The deploy requests name the vrfs only and are not split
+    type: bool
+    default: false
   config:
     description:
     - List of details of vrfs being managed. Not required for state deleted
@@ -578,12 +652,61 @@ from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm impor
     get_ip_sn_fabric_dict,
     dcnm_version_supported,
     dcnm_get_url,
+    dcnm_get_vlan_block,
+    dcnm_run_concurrently,
+    dcnm_normalize_template_config,
+    dcnm_split_attach_by_fabric,
+    dcnm_get_id_range,
+    dcnm_get_allocated_ids,
+    dcnm_take_snapshot,
+    dcnm_start_changes,
+    dcnm_record_change,
+    dcnm_get_attach_succeeded,
+    dcnm_get_diff_rollback,
 )
 from ansible.module_utils.basic import AnsibleModule
 
 
 class DcnmVrf:
 
+    # Fields of the vrfTemplateConfig as (name, default, minimum DCNM version)
+    vrf_template_fields = [
+        ("vrfSegmentId", None, 11),
+        ("vrfName", "", 11),
+        ("vrfVlanId", 0, 11),
+        ("vrfVlanName", "", 11),
+        ("vrfIntfDescription", "", 11),
+        ("vrfDescription", "", 11),
+        ("mtu", 9216, 11),
+        ("tag", 12345, 11),
+        ("vrfRouteMap", "", 11),
+        ("maxBgpPaths", 1, 11),
+        ("maxIbgpPaths", 2, 11),
+        ("ipv6LinkLocalFlag", True, 11),
+        ("trmEnabled", False, 11),
+        ("isRPExternal", False, 11),
+        ("rpAddress", "", 11),
+        ("loopbackNumber", "", 11),
+        ("L3VniMcastGroup", "", 11),
+        ("multicastGroup", "", 11),
+        ("trmBGWMSiteEnabled", False, 11),
+        ("advertiseHostRouteFlag", False, 11),
+        ("advertiseDefaultRouteFlag", True, 11),
+        ("configureStaticDefaultRouteFlag", True, 11),
+        ("bgpPassword", "", 11),
+        ("bgpPasswordKeyType", "", 11),
+        ("isRPAbsent", False, 12),
+        ("ENABLE_NETFLOW", False, 12),
+        ("NETFLOW_MONITOR", "", 12),
+        ("disableRtAuto", False, 12),
+        ("routeTargetImport", "", 12),
+        ("routeTargetExport", "", 12),
+        ("routeTargetImportEvpn", "", 12),
+        ("routeTargetExportEvpn", "", 12),
+        ("routeTargetImportMvpn", "", 12),
+        ("routeTargetExportMvpn", "", 12),
+    ]
+
     dcnm_vrf_paths = {
         11: {
             "GET_VRF": "/rest/top-down/fabrics/{}/vrfs",
@@ -591,6 +714,8 @@ class DcnmVrf:
             "GET_VRF_SWITCH": "/rest/top-down/fabrics/{}/vrfs/switches?vrf-names={}&serial-numbers={}",
             "GET_VRF_ID": "/rest/managed-pool/fabrics/{}/partitions/ids",
             "GET_VLAN": "/rest/resource-manager/vlan/{}?vlanUsageType=TOP_DOWN_VRF_VLAN",
+            "GET_SWITCH_VLAN_POOL": "/rest/resource-manager/switch/{}/pools/{}",
+            "GET_VRF_ID_POOL": "/rest/resource-manager/fabric/{}/pools/L3_VNI",
         },
         12: {
             "GET_VRF": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{}/vrfs",
@@ -598,6 +723,10 @@ class DcnmVrf:
             "GET_VRF_SWITCH": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{}/vrfs/switches?vrf-names={}&serial-numbers={}",
             "GET_VRF_ID": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{}/vrfinfo",
             "GET_VLAN": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/resource-manager/vlan/{}?vlanUsageType=TOP_DOWN_VRF_VLAN",
+            "GET_SWITCH_VLAN_POOL": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/resource-manager/switch/{}/pools/{}",
+            "GET_VRF_ID_POOL": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/resource-manager/fabric/{}/pools/L3_VNI",
+            "BULK_CREATE_VRF": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/bulk-create/vrfs",
+            "BULK_DELETE_VRF": "/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{}/bulk-delete/vrfs?vrf-names={}",
         },
     }
 
@@ -638,7 +767,9 @@ class DcnmVrf:
         self.inventory_data = get_fabric_inventory_details(self.module, self.fabric)
         self.ip_sn, self.hn_sn = get_ip_sn_dict(self.inventory_data)
         self.fabric_data = get_fabric_details(self.module, self.fabric)
-        self.fabric_type = self.fabric_data.get("fabricType")
+        self.is_ms_fabric = (
+            True if self.fabric_data.get("fabricType") == "MFD" else False
+        )
         self.ip_fab, self.sn_fab = get_ip_sn_fabric_dict(self.inventory_data)
         if self.dcnm_version > 12:
             self.paths = self.dcnm_vrf_paths[12]
@@ -648,7 +779,127 @@ class DcnmVrf:
         self.result = dict(changed=False, diff=[], response=[])
 
         self.failed_to_rollback = False
+        # Decoded template configs, indexed by their encoded string
+        self.template_configs = {}
+        # Serialized have state of each vrf and the changes pushed by the task, see take_snapshot()
+        self.snapshot = {}
+        self.changes = None
         self.WAIT_TIME_FOR_DELETE_LOOP = 5  # in seconds
+        # Maximum number of VRF names and of serial numbers included in a single GET_VRF_SWITCH request
+        self.GET_VRF_SWITCH_BATCH_SIZE = 100
+
+    def dump_template_config(self, template_config):
+
+        """
+        Routine to encode a vrfTemplateConfig. The dict is kept along with the encoded string, so that
+        load_template_config() does not need to parse it again.
+
+        Parameters:
+            template_config (dict): template config
+
+        Returns:
+            str: encoded template config
+        """
+
+        config = json.dumps(template_config)
+        self.template_configs[config] = template_config
+        return config
+
+    def load_template_config(self, config):
+
+        """
+        Routine to decode a vrfTemplateConfig. The template configs encoded by dump_template_config()
+        are not parsed again.
+
+        Parameters:
+            config (str): encoded template config
+
+        Returns:
+            dict: template config, a copy which the caller may modify
+        """
+
+        template_config = self.template_configs.get(config)
+        if template_config is None:
+            template_config = json.loads(config)
+        return dict(template_config)
+
+    def decode_attach_values(self, values):
+
+        """
+        Routine to decode the instanceValues or extensionValues of an attachment. The values built by
+        this module and read from DCNM are JSON strings, anything else is parsed as a python literal.
+
+        Parameters:
+            values (str): encoded values
+
+        Returns:
+            dict: decoded values
+        """
+
+        try:
+            return json.loads(values)
+        except ValueError:
+            return ast.literal_eval(values)
+
+    def get_vrf_lite_conn(self, ext_values):
+
+        """
+        Routine to extract the list of VRF LITE connections from the extensionValues of an attachment.
+
+        Parameters:
+            ext_values (str): extensionValues of the attachment
+
+        Returns:
+            list: VRF LITE connections
+        """
+
+        ext_values = self.decode_attach_values(ext_values)
+        return self.decode_attach_values(ext_values["VRF_LITE_CONN"])["VRF_LITE_CONN"]
+
+    def compare_vrf_lite_conn(self, want_e, have_e):
+
+        """
+        Routine to check if the VRF LITE connections in 'want_e' are all present in 'have_e'. Connections
+        are matched by (IF_NAME, DOT1Q_ID), or by IF_NAME alone if the DOT1Q_ID is not included in want
+        and is left to DCNM to allocate. Only the parameters included in want are compared.
+
+        Parameters:
+            want_e (list): VRF LITE connections from the playbook
+            have_e (list): VRF LITE connections present on DCNM
+
+        Returns:
+            True - if all the connections in want match the ones present on DCNM
+            False - otherwise
+        """
+
+        if not want_e:
+            return False
+
+        have_by_key = {}
+        have_by_name = {}
+        for hlite in have_e:
+            have_by_key.setdefault((hlite["IF_NAME"], str(hlite["DOT1Q_ID"])), hlite)
+            have_by_name.setdefault(hlite["IF_NAME"], hlite)
+
+        for wlite in want_e:
+            if wlite["DOT1Q_ID"]:
+                hlite = have_by_key.get((wlite["IF_NAME"], str(wlite["DOT1Q_ID"])))
+            else:
+                hlite = have_by_name.get(wlite["IF_NAME"])
+            if hlite is None:
+                return False
+
+            for key in [
+                "IP_MASK",
+                "NEIGHBOR_IP",
+                "IPV6_MASK",
+                "IPV6_NEIGHBOR",
+                "PEER_VRF_NAME",
+            ]:
+                if wlite[key] and wlite[key] != hlite[key]:
+                    return False
+
+        return True
 
     def diff_for_attach_deploy(self, want_a, have_a, replace=False):
 
@@ -657,152 +908,91 @@ class DcnmVrf:
         if not want_a:
             return attach_list
 
+        # Index the attachments present on DCNM by serial number. Their instanceValues and VRF LITE
+        # connections are decoded once and reused across the comparisons
+        have_index = {}
+        for have in have_a or []:
+            have_index.setdefault(have["serialNumber"], []).append(have)
+        have_inst = {}
+        have_lite = {}
+
         dep_vrf = False
         for want in want_a:
             found = False
-            interface_match = False
-            if have_a:
-                for have in have_a:
-                    if want["serialNumber"] == have["serialNumber"]:
-                        # handle instanceValues first
-                        want.update({"freeformConfig": have["freeformConfig"]})  # copy freeformConfig from have as module is not managing it
-                        want_inst_values = {}
-                        have_inst_values = {}
-                        if (
-                            want["instanceValues"] is not None
-                            and have["instanceValues"] is not None
-                        ):
-                            want_inst_values = ast.literal_eval(want["instanceValues"])
-                            have_inst_values = ast.literal_eval(have["instanceValues"])
-
-                            # update unsupported paramters using using have
-                            want_inst_values.update({"loopbackId": have_inst_values["loopbackId"]})
-                            want_inst_values.update({"loopbackIpAddress": have_inst_values["loopbackIpAddress"]})
-                            want_inst_values.update({"loopbackIpV6Address": have_inst_values["loopbackIpV6Address"]})
-                            want.update({"instanceValues": json.dumps(want_inst_values)})
-                        if (
-                            want["extensionValues"] != ""
-                            and have["extensionValues"] != ""
-                        ):
-                            want_ext_values = want["extensionValues"]
-                            want_ext_values = ast.literal_eval(want_ext_values)
-                            have_ext_values = have["extensionValues"]
-                            have_ext_values = ast.literal_eval(have_ext_values)
-
-                            want_e = ast.literal_eval(want_ext_values["VRF_LITE_CONN"])
-                            have_e = ast.literal_eval(have_ext_values["VRF_LITE_CONN"])
-
-                            if replace and (len(want_e["VRF_LITE_CONN"]) != len(have_e["VRF_LITE_CONN"])):
-                                # In case of replace/override if the length of want and have lite attach of a switch
-                                # is not same then we have to push the want to NDFC. No further check is required for
-                                # this switch
-                                break
-
-                            for wlite in want_e["VRF_LITE_CONN"]:
-                                for hlite in have_e["VRF_LITE_CONN"]:
-                                    found = False
-                                    interface_match = False
-                                    if wlite["IF_NAME"] == hlite["IF_NAME"]:
-                                        found = True
-                                        interface_match = True
-                                        if wlite["DOT1Q_ID"]:
-                                            if (
-                                                wlite["DOT1Q_ID"]
-                                                != hlite["DOT1Q_ID"]
-                                            ):
-                                                found = False
-                                                break
-
-                                        if wlite["IP_MASK"]:
-                                            if (
-                                                wlite["IP_MASK"]
-                                                != hlite["IP_MASK"]
-                                            ):
-                                                found = False
-                                                break
-
-                                        if wlite["NEIGHBOR_IP"]:
-                                            if (
-                                                wlite["NEIGHBOR_IP"]
-                                                != hlite["NEIGHBOR_IP"]
-                                            ):
-                                                found = False
-                                                break
-
-                                        if wlite["IPV6_MASK"]:
-                                            if (
-                                                wlite["IPV6_MASK"]
-                                                != hlite["IPV6_MASK"]
-                                            ):
-                                                found = False
-                                                break
-
-                                        if wlite["IPV6_NEIGHBOR"]:
-                                            if (
-                                                wlite["IPV6_NEIGHBOR"]
-                                                != hlite["IPV6_NEIGHBOR"]
-                                            ):
-                                                found = False
-                                                break
-
-                                        if wlite["PEER_VRF_NAME"]:
-                                            if (
-                                                wlite["PEER_VRF_NAME"]
-                                                != hlite["PEER_VRF_NAME"]
-                                            ):
-                                                found = False
-                                                break
-
-                                        if found:
-                                            break
-
-                                    if interface_match and not found:
-                                        break
-
-                                if interface_match and not found:
-                                    break
+            for have in have_index.get(want["serialNumber"], []):
+                # handle instanceValues first
+                want.update({"freeformConfig": have["freeformConfig"]})  # copy freeformConfig from have as module is not managing it
+                want_inst_values = {}
+                have_inst_values = {}
+                if (
+                    want["instanceValues"] is not None
+                    and have["instanceValues"] is not None
+                ):
+                    if id(have) not in have_inst:
+                        have_inst[id(have)] = self.decode_attach_values(have["instanceValues"])
+                    want_inst_values = self.decode_attach_values(want["instanceValues"])
+                    have_inst_values = have_inst[id(have)]
+
+                    # update unsupported paramters using using have
+                    want_inst_values.update({"loopbackId": have_inst_values["loopbackId"]})
+                    want_inst_values.update({"loopbackIpAddress": have_inst_values["loopbackIpAddress"]})
+                    want_inst_values.update({"loopbackIpV6Address": have_inst_values["loopbackIpV6Address"]})
+                    want.update({"instanceValues": json.dumps(want_inst_values)})
+                if (
+                    want["extensionValues"] != ""
+                    and have["extensionValues"] != ""
+                ):
+                    if id(have) not in have_lite:
+                        have_lite[id(have)] = self.get_vrf_lite_conn(have["extensionValues"])
+                    want_e = self.get_vrf_lite_conn(want["extensionValues"])
+                    have_e = have_lite[id(have)]
+
+                    if replace and (len(want_e) != len(have_e)):
+                        # In case of replace/override if the length of want and have lite attach of a switch
+                        # is not same then we have to push the want to NDFC. No further check is required for
+                        # this switch
+                        break
 
-                        elif (
-                            want["extensionValues"] != ""
-                            and have["extensionValues"] == ""
-                        ):
-                            found = False
-                        elif (
-                            want["extensionValues"] == ""
-                            and have["extensionValues"] != ""
+                    found = self.compare_vrf_lite_conn(want_e, have_e)
+
+                elif (
+                    want["extensionValues"] != ""
+                    and have["extensionValues"] == ""
+                ):
+                    found = False
+                elif (
+                    want["extensionValues"] == ""
+                    and have["extensionValues"] != ""
+                ):
+                    if replace:
+                        found = False
+                    else:
+                        found = True
+                else:
+                    found = True
+
+                    if want.get("isAttached") is not None:
+                        if bool(have["isAttached"]) is not bool(
+                            want["isAttached"]
                         ):
-                            if replace:
-                                found = False
-                            else:
-                                found = True
-                        else:
-                            found = True
-
-                            if want.get("isAttached") is not None:
-                                if bool(have["isAttached"]) is not bool(
-                                    want["isAttached"]
-                                ):
-                                    del want["isAttached"]
-                                    want["deployment"] = True
-                                    attach_list.append(want)
-                                    if bool(want["is_deploy"]):
-                                        dep_vrf = True
-                                    continue
-
-                            if ((bool(want["deployment"]) is not bool(have["deployment"])) or
-                               (bool(want["is_deploy"]) is not bool(have["is_deploy"]))):
-                                if bool(want["is_deploy"]):
-                                    dep_vrf = True
-
-                        for k, v in want_inst_values.items():
-                            if v != have_inst_values.get(k, ""):
-                                found = False
-
-                        if found:
-                            break
+                            del want["isAttached"]
+                            want["deployment"] = True
+                            attach_list.append(want)
+                            if bool(want["is_deploy"]):
+                                dep_vrf = True
+                            continue
 
-                    if interface_match and not found:
-                        break
+                    if ((bool(want["deployment"]) is not bool(have["deployment"])) or
+                       (bool(want["is_deploy"]) is not bool(have["is_deploy"]))):
+                        if bool(want["is_deploy"]):
+                            dep_vrf = True
+
+                for k, v in want_inst_values.items():
+                    if v != have_inst_values.get(k, ""):
+                        found = False
+
+                if found:
+                    break
 
             if not found:
                 if bool(want["isAttached"]):
@@ -968,8 +1158,8 @@ class DcnmVrf:
 
         create = {}
 
-        json_to_dict_want = json.loads(want["vrfTemplateConfig"])
-        json_to_dict_have = json.loads(have["vrfTemplateConfig"])
+        json_to_dict_want = self.load_template_config(want["vrfTemplateConfig"])
+        json_to_dict_have = self.load_template_config(have["vrfTemplateConfig"])
 
         vlanId_want = str(json_to_dict_want.get("vrfVlanId", ""))
         vlanId_have = json_to_dict_have.get("vrfVlanId", "")
@@ -1208,10 +1398,61 @@ class DcnmVrf:
             template_conf.update(routeTargetImportMvpn=vrf.get("import_mvpn_rt", ""))
             template_conf.update(routeTargetExportMvpn=vrf.get("export_mvpn_rt", ""))
 
-        vrf_upd.update({"vrfTemplateConfig": json.dumps(template_conf)})
+        vrf_upd.update({"vrfTemplateConfig": self.dump_template_config(template_conf)})
 
         return vrf_upd
 
+    def get_vrf_switch_details(self, vrf_attach_list):
+
+        """
+        Routine to read the switch details of all the VRF attachments. The GET_VRF_SWITCH endpoint takes
+        lists of VRF names and serial numbers, so the details are read in batches of at most
+        GET_VRF_SWITCH_BATCH_SIZE VRF names and serial numbers per request.
+
+        Parameters:
+            vrf_attach_list (list): VRF attachments as returned by GET_VRF_ATTACH
+
+        Returns:
+            dict: switch details indexed by (VRF name, serial number). Each entry is laid out like a
+                  GET_VRF_SWITCH record with only the switchDetailsList of that switch.
+        """
+
+        vrf_names = []
+        vrf_sns = {}
+        for vrf_attach in vrf_attach_list:
+            for attach in vrf_attach.get("lanAttachList") or []:
+                if attach["vrfName"] not in vrf_sns:
+                    vrf_names.append(attach["vrfName"])
+                    vrf_sns[attach["vrfName"]] = []
+                if attach["switchSerialNo"] not in vrf_sns[attach["vrfName"]]:
+                    vrf_sns[attach["vrfName"]].append(attach["switchSerialNo"])
+
+        size = self.GET_VRF_SWITCH_BATCH_SIZE
+        lite_index = {}
+        for i in range(0, len(vrf_names), size):
+            names = vrf_names[i:i + size]
+            sns = []
+            for name in names:
+                sns.extend(sn for sn in vrf_sns[name] if sn not in sns)
+
+            for j in range(0, len(sns), size):
+                path = self.paths["GET_VRF_SWITCH"].format(
+                    self.fabric, ",".join(names), ",".join(sns[j:j + size])
+                )
+                lite_objects = dcnm_send(self.module, "GET", path)
+
+                if not lite_objects.get("DATA"):
+                    continue
+
+                for sdl in lite_objects["DATA"]:
+                    for epv in sdl["switchDetailsList"]:
+                        key = (sdl["vrfName"], epv["serialNumber"])
+                        if key not in lite_index:
+                            lite_index[key] = dict(sdl, switchDetailsList=[])
+                        lite_index[key]["switchDetailsList"].append(epv)
+
+        return lite_index
+
     def get_have(self):
 
         have_create = []
@@ -1250,52 +1491,22 @@ class DcnmVrf:
             return
 
         for vrf in vrf_objects["DATA"]:
-            json_to_dict = json.loads(vrf["vrfTemplateConfig"])
-            t_conf = {
-                "vrfSegmentId": vrf["vrfId"],
-                "vrfName": vrf["vrfName"],
-                "vrfVlanId": json_to_dict.get("vrfVlanId", 0),
-                "vrfVlanName": json_to_dict.get("vrfVlanName", ""),
-                "vrfIntfDescription": json_to_dict.get("vrfIntfDescription", ""),
-                "vrfDescription": json_to_dict.get("vrfDescription", ""),
-                "mtu": json_to_dict.get("mtu", 9216),
-                "tag": json_to_dict.get("tag", 12345),
-                "vrfRouteMap": json_to_dict.get("vrfRouteMap", ""),
-                "maxBgpPaths": json_to_dict.get("maxBgpPaths", 1),
-                "maxIbgpPaths": json_to_dict.get("maxIbgpPaths", 2),
-                "ipv6LinkLocalFlag": json_to_dict.get("ipv6LinkLocalFlag", True),
-                "trmEnabled": json_to_dict.get("trmEnabled", False),
-                "isRPExternal": json_to_dict.get("isRPExternal", False),
-                "rpAddress": json_to_dict.get("rpAddress", ""),
-                "loopbackNumber": json_to_dict.get("loopbackNumber", ""),
-                "L3VniMcastGroup": json_to_dict.get("L3VniMcastGroup", ""),
-                "multicastGroup": json_to_dict.get("multicastGroup", ""),
-                "trmBGWMSiteEnabled": json_to_dict.get("trmBGWMSiteEnabled", False),
-                "advertiseHostRouteFlag": json_to_dict.get("advertiseHostRouteFlag", False),
-                "advertiseDefaultRouteFlag": json_to_dict.get("advertiseDefaultRouteFlag", True),
-                "configureStaticDefaultRouteFlag": json_to_dict.get("configureStaticDefaultRouteFlag", True),
-                "bgpPassword": json_to_dict.get("bgpPassword", ""),
-                "bgpPasswordKeyType": json_to_dict.get("bgpPasswordKeyType", ""),
-            }
+            t_conf = dcnm_normalize_template_config(
+                self.load_template_config(vrf["vrfTemplateConfig"]),
+                self.vrf_template_fields,
+                self.dcnm_version,
+                vrfSegmentId=vrf["vrfId"],
+                vrfName=vrf["vrfName"],
+            )
 
-            if self.dcnm_version > 11:
-                t_conf.update(isRPAbsent=json_to_dict.get("isRPAbsent", False))
-                t_conf.update(ENABLE_NETFLOW=json_to_dict.get("ENABLE_NETFLOW", False))
-                t_conf.update(NETFLOW_MONITOR=json_to_dict.get("NETFLOW_MONITOR", ""))
-                t_conf.update(disableRtAuto=json_to_dict.get("disableRtAuto", False))
-                t_conf.update(routeTargetImport=json_to_dict.get("routeTargetImport", ""))
-                t_conf.update(routeTargetExport=json_to_dict.get("routeTargetExport", ""))
-                t_conf.update(routeTargetImportEvpn=json_to_dict.get("routeTargetImportEvpn", ""))
-                t_conf.update(routeTargetExportEvpn=json_to_dict.get("routeTargetExportEvpn", ""))
-                t_conf.update(routeTargetImportMvpn=json_to_dict.get("routeTargetImportMvpn", ""))
-                t_conf.update(routeTargetExportMvpn=json_to_dict.get("routeTargetExportMvpn", ""))
-
-            vrf.update({"vrfTemplateConfig": json.dumps(t_conf)})
+            vrf.update({"vrfTemplateConfig": self.dump_template_config(t_conf)})
             del vrf["vrfStatus"]
             have_create.append(vrf)
 
         upd_vrfs = ""
 
+        lite_index = self.get_vrf_switch_details(vrf_attach_objects["DATA"])
+
         for vrf_attach in vrf_attach_objects["DATA"]:
             if not vrf_attach.get("lanAttachList"):
                 continue
@@ -1343,88 +1554,79 @@ class DcnmVrf:
                 attach.update({"instanceValues": inst_values})
                 attach.update({"isAttached": attach_state})
                 attach.update({"is_deploy": deployed})
+                attach.update({"freeformConfig": ""})
 
                 """ Get the VRF LITE extension template and update it to the attach['extensionvalues']"""
 
-                """Get the IP/Interface that is connected to edge router can be get from below query"""
-                method = "GET"
-                path = self.paths["GET_VRF_SWITCH"].format(
-                    self.fabric, attach["vrfName"], sn
-                )
-
-                lite_objects = dcnm_send(self.module, method, path)
-
-                if not lite_objects.get("DATA"):
-                    return
-
-                for sdl in lite_objects["DATA"]:
-                    for epv in sdl["switchDetailsList"]:
-                        if epv.get("extensionValues"):
-                            ext_values = epv["extensionValues"]
-                            ext_values = ast.literal_eval(ext_values)
-                            if ext_values.get("VRF_LITE_CONN") is not None:
-                                ext_values = ast.literal_eval(
-                                    ext_values["VRF_LITE_CONN"]
-                                )
-                                extension_values = {}
-                                extension_values["VRF_LITE_CONN"] = []
-
-                                for ev in ext_values.get("VRF_LITE_CONN"):
-                                    vrflite_con = {}
-
-                                    vrflite_con["VRF_LITE_CONN"] = []
-                                    vrflite_con["VRF_LITE_CONN"].append({})
-                                    vrflite_con["VRF_LITE_CONN"][0]["IF_NAME"] = ev[
-                                        "IF_NAME"
-                                    ]
-                                    vrflite_con["VRF_LITE_CONN"][0]["DOT1Q_ID"] = str(
-                                        ev["DOT1Q_ID"]
-                                    )
-                                    vrflite_con["VRF_LITE_CONN"][0]["IP_MASK"] = ev[
-                                        "IP_MASK"
-                                    ]
-                                    vrflite_con["VRF_LITE_CONN"][0]["NEIGHBOR_IP"] = ev[
-                                        "NEIGHBOR_IP"
-                                    ]
-                                    vrflite_con["VRF_LITE_CONN"][0]["IPV6_MASK"] = ev[
-                                        "IPV6_MASK"
-                                    ]
-                                    vrflite_con["VRF_LITE_CONN"][0][
-                                        "IPV6_NEIGHBOR"
-                                    ] = ev["IPV6_NEIGHBOR"]
-
-                                    vrflite_con["VRF_LITE_CONN"][0][
-                                        "AUTO_VRF_LITE_FLAG"
-                                    ] = "false"
-                                    vrflite_con["VRF_LITE_CONN"][0][
-                                        "PEER_VRF_NAME"
-                                    ] = ev["PEER_VRF_NAME"]
-                                    vrflite_con["VRF_LITE_CONN"][0][
-                                        "VRF_LITE_JYTHON_TEMPLATE"
-                                    ] = "Ext_VRF_Lite_Jython"
-
-                                    if (extension_values["VRF_LITE_CONN"]):
-                                        extension_values["VRF_LITE_CONN"]["VRF_LITE_CONN"].extend(vrflite_con["VRF_LITE_CONN"])
-                                    else:
-                                        extension_values["VRF_LITE_CONN"] = vrflite_con
-
-                                extension_values["VRF_LITE_CONN"] = json.dumps(
-                                    extension_values["VRF_LITE_CONN"]
+                """The IP/Interface that is connected to edge router is included in the switch details"""
+                lite = lite_index.get((attach["vrfName"], sn), {})
+                for epv in lite.get("switchDetailsList", []):
+                    if epv.get("extensionValues"):
+                        ext_values = epv["extensionValues"]
+                        ext_values = ast.literal_eval(ext_values)
+                        if ext_values.get("VRF_LITE_CONN") is not None:
+                            ext_values = ast.literal_eval(
+                                ext_values["VRF_LITE_CONN"]
+                            )
+                            extension_values = {}
+                            extension_values["VRF_LITE_CONN"] = []
+
+                            for ev in ext_values.get("VRF_LITE_CONN"):
+                                vrflite_con = {}
+
+                                vrflite_con["VRF_LITE_CONN"] = []
+                                vrflite_con["VRF_LITE_CONN"].append({})
+                                vrflite_con["VRF_LITE_CONN"][0]["IF_NAME"] = ev[
+                                    "IF_NAME"
+                                ]
+                                vrflite_con["VRF_LITE_CONN"][0]["DOT1Q_ID"] = str(
+                                    ev["DOT1Q_ID"]
                                 )
+                                vrflite_con["VRF_LITE_CONN"][0]["IP_MASK"] = ev[
+                                    "IP_MASK"
+                                ]
+                                vrflite_con["VRF_LITE_CONN"][0]["NEIGHBOR_IP"] = ev[
+                                    "NEIGHBOR_IP"
+                                ]
+                                vrflite_con["VRF_LITE_CONN"][0]["IPV6_MASK"] = ev[
+                                    "IPV6_MASK"
+                                ]
+                                vrflite_con["VRF_LITE_CONN"][0][
+                                    "IPV6_NEIGHBOR"
+                                ] = ev["IPV6_NEIGHBOR"]
+
+                                vrflite_con["VRF_LITE_CONN"][0][
+                                    "AUTO_VRF_LITE_FLAG"
+                                ] = "false"
+                                vrflite_con["VRF_LITE_CONN"][0][
+                                    "PEER_VRF_NAME"
+                                ] = ev["PEER_VRF_NAME"]
+                                vrflite_con["VRF_LITE_CONN"][0][
+                                    "VRF_LITE_JYTHON_TEMPLATE"
+                                ] = "Ext_VRF_Lite_Jython"
+
+                                if (extension_values["VRF_LITE_CONN"]):
+                                    extension_values["VRF_LITE_CONN"]["VRF_LITE_CONN"].extend(vrflite_con["VRF_LITE_CONN"])
+                                else:
+                                    extension_values["VRF_LITE_CONN"] = vrflite_con
 
-                                ms_con = {}
-                                ms_con["MULTISITE_CONN"] = []
-                                extension_values["MULTISITE_CONN"] = json.dumps(
-                                    ms_con
-                                )
-                                e_values = json.dumps(extension_values).replace(
-                                    " ", ""
-                                )
+                            extension_values["VRF_LITE_CONN"] = json.dumps(
+                                extension_values["VRF_LITE_CONN"]
+                            )
 
-                                attach.update({"extensionValues": e_values})
+                            ms_con = {}
+                            ms_con["MULTISITE_CONN"] = []
+                            extension_values["MULTISITE_CONN"] = json.dumps(
+                                ms_con
+                            )
+                            e_values = json.dumps(extension_values).replace(
+                                " ", ""
+                            )
 
-                        ff_config = epv.get("freeformConfig", "")
-                        attach.update({"freeformConfig": ff_config})
+                            attach.update({"extensionValues": e_values})
+
+                    ff_config = epv.get("freeformConfig", "")
+                    attach.update({"freeformConfig": ff_config})
 
             if dep_vrf:
                 upd_vrfs += dep_vrf + ","
@@ -1438,6 +1640,9 @@ class DcnmVrf:
         self.have_attach = have_attach
         self.have_deploy = have_deploy
 
+        if self.params["snapshot_rollback"]:
+            self.take_snapshot()
+
     def get_want(self):
 
         want_create = []
@@ -1686,6 +1891,96 @@ class DcnmVrf:
         self.diff_attach = diff_attach
         self.diff_deploy = diff_deploy
 
+    def get_next_vrf_id(self, vrf_name):
+
+        """
+        Routine to fetch the next available vrfId from DCNM.
+
+        Parameters:
+            vrf_name (str): name of the vrf the vrfId is fetched for, used in the error messages
+
+        Returns:
+            int: next available vrfId, None if DCNM did not return one
+        """
+
+        path = self.paths["GET_VRF_ID"].format(self.fabric)
+        if self.dcnm_version > 11:
+            vrf_id_obj = dcnm_send(self.module, "GET", path)
+        else:
+            vrf_id_obj = dcnm_send(self.module, "POST", path)
+
+        missing_fabric, not_ok = self.handle_response(vrf_id_obj, "query_dcnm")
+
+        if missing_fabric or not_ok:
+            msg1 = "Fabric {0} not present on DCNM".format(self.fabric)
+            msg2 = "Unable to generate vrfId for vrf: {0} under fabric: {1}".format(
+                vrf_name, self.fabric
+            )
+
+            self.module.fail_json(msg=msg1 if missing_fabric else msg2)
+
+        if not vrf_id_obj["DATA"]:
+            return None
+
+        if self.dcnm_version == 11:
+            return vrf_id_obj["DATA"].get("partitionSegmentId")
+        elif self.dcnm_version >= 12:
+            return vrf_id_obj["DATA"].get("l3vni")
+
+        msg = "Unsupported DCNM version: version {0}".format(self.dcnm_version)
+        self.module.fail_json(msg)
+
+    def get_vrf_id_block(self, vrfs):
+
+        """
+        Routine to allocate vrfIds for a block of new vrfs in one go. The next available vrfId is fetched
+        from DCNM once and the ids for the remaining vrfs are derived from it within the L3 VNI range of
+        the fabric, skipping the ids already used by the vrfs present on DCNM, the ones given in the
+        playbook and the ones allocated in the L3_VNI pool of the resource manager.
+
+        Parameters:
+            vrfs (list): create payloads of the vrfs without a vrfId
+
+        Returns:
+            list: vrfIds, in the order of 'vrfs'
+        """
+
+        used_ids = set()
+        for vrf in self.have_create + self.want_create:
+            if vrf.get("vrfId") is not None:
+                used_ids.add(int(vrf["vrfId"]))
+
+        vrf_id = None
+        attempt = 0
+        while vrf_id is None and attempt < 10:
+            attempt += 1
+            vrf_id = self.get_next_vrf_id(vrfs[0]["vrfName"])
+
+        if not vrf_id:
+            self.module.fail_json(
+                msg="Unable to generate vrfId for vrf: {0} "
+                "under fabric: {1}".format(vrfs[0]["vrfName"], self.fabric)
+            )
+
+        path = self.paths["GET_VRF_ID_POOL"].format(self.fabric)
+        used_ids.update(dcnm_get_allocated_ids(dcnm_send(self.module, "GET", path)))
+
+        first, last = dcnm_get_id_range(self.fabric_data, "L3_PARTITION_ID_RANGE", (1, 16777214))
+        vrf_id = max(int(vrf_id), first)
+        vrf_ids = []
+        for vrf in vrfs:
+            while vrf_id in used_ids:
+                vrf_id += 1
+            if vrf_id > last:
+                self.module.fail_json(
+                    msg="Unable to generate vrfId for vrf: {0} under fabric: {1}, no vrfIds left "
+                    "in the range {2}-{3}".format(vrf["vrfName"], self.fabric, first, last)
+                )
+            vrf_ids.append(vrf_id)
+            used_ids.add(vrf_id)
+
+        return vrf_ids
+
     def get_diff_merge(self, replace=False):
 
         # Special cases:
@@ -1699,6 +1994,7 @@ class DcnmVrf:
         diff_attach = []
         diff_deploy = {}
         prev_vrf_id_fetched = None
+        vrfs_without_id = []
         conf_changed = {}
 
         all_vrfs = ""
@@ -1720,89 +2016,33 @@ class DcnmVrf:
                 if vrf_id is None:
                     # vrfId is not provided by user.
                     # Need to query DCNM to fetch next available vrfId and use it here.
+                    if self.params["vrf_id_block_allocation"]:
+                        # vrfIds for these are derived together, once all the new vrfs are known
+                        vrfs_without_id.append(want_c)
+                        continue
+
                     method = "POST"
 
                     attempt = 0
                     while attempt < 10:
                         attempt += 1
-                        path = self.paths["GET_VRF_ID"].format(self.fabric)
-                        if self.dcnm_version > 11:
-                            vrf_id_obj = dcnm_send(self.module, "GET", path)
-                        else:
-                            vrf_id_obj = dcnm_send(self.module, method, path)
-
-                        missing_fabric, not_ok = self.handle_response(
-                            vrf_id_obj, "query_dcnm"
-                        )
-
-                        if missing_fabric or not_ok:
-                            msg1 = "Fabric {0} not present on DCNM".format(self.fabric)
-                            msg2 = (
-                                "Unable to generate vrfId for vrf: {0} "
-                                "under fabric: {1}".format(
-                                    want_c["vrfName"], self.fabric
-                                )
-                            )
-
-                            self.module.fail_json(msg=msg1 if missing_fabric else msg2)
-
-                        if not vrf_id_obj["DATA"]:
+                        vrf_id = self.get_next_vrf_id(want_c["vrfName"])
+                        if vrf_id is None:
                             continue
 
-                        if self.dcnm_version == 11:
-                            vrf_id = vrf_id_obj["DATA"].get("partitionSegmentId")
-                        elif self.dcnm_version >= 12:
-                            vrf_id = vrf_id_obj["DATA"].get("l3vni")
-                        else:
-                            msg = "Unsupported DCNM version: version {0}".format(
-                                self.dcnm_version
-                            )
-                            self.module.fail_json(msg)
-
                         if vrf_id != prev_vrf_id_fetched:
                             want_c.update({"vrfId": vrf_id})
-                            json_to_dict = json.loads(want_c["vrfTemplateConfig"])
-                            template_conf = {
-                                "vrfSegmentId": vrf_id,
-                                "vrfName": want_c["vrfName"],
-                                "vrfVlanId": json_to_dict.get("vrfVlanId"),
-                                "vrfVlanName": json_to_dict.get("vrfVlanName"),
-                                "vrfIntfDescription": json_to_dict.get("vrfIntfDescription"),
-                                "vrfDescription": json_to_dict.get("vrfDescription"),
-                                "mtu": json_to_dict.get("mtu"),
-                                "tag": json_to_dict.get("tag"),
-                                "vrfRouteMap": json_to_dict.get("vrfRouteMap"),
-                                "maxBgpPaths": json_to_dict.get("maxBgpPaths"),
-                                "maxIbgpPaths": json_to_dict.get("maxIbgpPaths"),
-                                "ipv6LinkLocalFlag": json_to_dict.get("ipv6LinkLocalFlag"),
-                                "trmEnabled": json_to_dict.get("trmEnabled"),
-                                "isRPExternal": json_to_dict.get("isRPExternal"),
-                                "rpAddress": json_to_dict.get("rpAddress"),
-                                "loopbackNumber": json_to_dict.get("loopbackNumber"),
-                                "L3VniMcastGroup": json_to_dict.get("L3VniMcastGroup"),
-                                "multicastGroup": json_to_dict.get("multicastGroup"),
-                                "trmBGWMSiteEnabled": json_to_dict.get("trmBGWMSiteEnabled"),
-                                "advertiseHostRouteFlag": json_to_dict.get("advertiseHostRouteFlag"),
-                                "advertiseDefaultRouteFlag": json_to_dict.get("advertiseDefaultRouteFlag"),
-                                "configureStaticDefaultRouteFlag": json_to_dict.get("configureStaticDefaultRouteFlag"),
-                                "bgpPassword": json_to_dict.get("bgpPassword"),
-                                "bgpPasswordKeyType": json_to_dict.get("bgpPasswordKeyType"),
-                            }
-
-                            if self.dcnm_version > 11:
-                                template_conf.update(isRPAbsent=json_to_dict.get("isRPAbsent"))
-                                template_conf.update(ENABLE_NETFLOW=json_to_dict.get("ENABLE_NETFLOW"))
-                                template_conf.update(NETFLOW_MONITOR=json_to_dict.get("NETFLOW_MONITOR"))
-                                template_conf.update(disableRtAuto=json_to_dict.get("disableRtAuto"))
-                                template_conf.update(routeTargetImport=json_to_dict.get("routeTargetImport"))
-                                template_conf.update(routeTargetExport=json_to_dict.get("routeTargetExport"))
-                                template_conf.update(routeTargetImportEvpn=json_to_dict.get("routeTargetImportEvpn"))
-                                template_conf.update(routeTargetExportEvpn=json_to_dict.get("routeTargetExportEvpn"))
-                                template_conf.update(routeTargetImportMvpn=json_to_dict.get("routeTargetImportMvpn"))
-                                template_conf.update(routeTargetExportMvpn=json_to_dict.get("routeTargetExportMvpn"))
+                            template_conf = dcnm_normalize_template_config(
+                                self.load_template_config(want_c["vrfTemplateConfig"]),
+                                self.vrf_template_fields,
+                                self.dcnm_version,
+                                use_defaults=False,
+                                vrfSegmentId=vrf_id,
+                                vrfName=want_c["vrfName"],
+                            )
 
                             want_c.update(
-                                {"vrfTemplateConfig": json.dumps(template_conf)}
+                                {"vrfTemplateConfig": self.dump_template_config(template_conf)}
                             )
                             prev_vrf_id_fetched = vrf_id
                             break
@@ -1831,6 +2071,12 @@ class DcnmVrf:
                 else:
                     diff_create.append(want_c)
 
+        if vrfs_without_id:
+            vrf_ids = self.get_vrf_id_block(vrfs_without_id)
+            for want_c, vrf_id in zip(vrfs_without_id, vrf_ids):
+                want_c.update({"vrfId": vrf_id})
+                diff_create.append(want_c)
+
         for want_a in self.want_attach:
             dep_vrf = ""
             attach_found = False
@@ -1921,7 +2167,7 @@ class DcnmVrf:
             found_c.update({"service_vrf_template": found_c["serviceVrfTemplate"]})
             found_c.update({"attach": []})
 
-            json_to_dict = json.loads(found_c["vrfTemplateConfig"])
+            json_to_dict = self.load_template_config(found_c["vrfTemplateConfig"])
             found_c.update({"vrf_vlan_name": json_to_dict.get("vrfVlanName", "")})
             found_c.update({"vrf_intf_desc": json_to_dict.get("vrfIntfDescription", "")})
             found_c.update({"vrf_description": json_to_dict.get("vrfDescription", "")})
@@ -2040,125 +2286,297 @@ class DcnmVrf:
             return
 
         if self.config:
-            query = []
-            for want_c in self.want_create:
-                # Query the VRF
-                for vrf in vrf_objects["DATA"]:
+            want_vrfs = [want_c["vrfName"] for want_c in self.want_create]
+            vrfs = [
+                vrf
+                for vrf_name in want_vrfs
+                for vrf in vrf_objects["DATA"]
+                if vrf["vrfName"] == vrf_name
+            ]
+        else:
+            vrfs = vrf_objects["DATA"]
 
-                    if want_c["vrfName"] == vrf["vrfName"]:
+        if not vrfs:
+            return
 
-                        item = {"parent": {}, "attach": []}
-                        item["parent"] = vrf
+        # Query the Attachments of all the VRFs together
+        vrf_attach_objects = dcnm_get_url(
+            self.module,
+            self.fabric,
+            self.paths["GET_VRF_ATTACH"],
+            ",".join(vrf["vrfName"] for vrf in vrfs),
+            "vrfs",
+        )
 
-                        # Query the Attachment for the found VRF
-                        method = "GET"
-                        path = self.paths["GET_VRF_ATTACH"].format(
-                            self.fabric, vrf["vrfName"]
-                        )
+        if not vrf_attach_objects["DATA"]:
+            return
 
-                        vrf_attach_objects = dcnm_send(self.module, method, path)
+        if self.params["query_switch_details"]:
+            lite_index = self.get_vrf_switch_details(vrf_attach_objects["DATA"])
 
-                        missing_fabric, not_ok = self.handle_response(
-                            vrf_attach_objects, "query_dcnm"
-                        )
+        query = []
+        for vrf in vrfs:
+            item = {"parent": {}, "attach": []}
+            item["parent"] = vrf
 
-                        if missing_fabric or not_ok:
-                            msg1 = "Fabric {0} not present on DCNM".format(self.fabric)
-                            msg2 = (
-                                "Unable to find attachments for "
-                                "vrfs: {0} under fabric: {1}".format(
-                                    vrf["vrfName"], self.fabric
-                                )
-                            )
+            for vrf_attach in vrf_attach_objects["DATA"]:
+                if vrf["vrfName"] != vrf_attach["vrfName"]:
+                    continue
+                if not vrf_attach.get("lanAttachList"):
+                    continue
+                attach_list = vrf_attach["lanAttachList"]
 
-                            self.module.fail_json(msg=msg1 if missing_fabric else msg2)
-                            return
+                for attach in attach_list:
+                    if not self.params["query_switch_details"]:
+                        item["attach"].append(attach)
+                        continue
+                    lite = lite_index.get((attach["vrfName"], attach["switchSerialNo"]))
+                    if not lite:
+                        continue
+                    item["attach"].append(lite)
+                query.append(item)
 
-                        if not vrf_attach_objects["DATA"]:
-                            return
+        self.query = query
 
-                        for vrf_attach in vrf_attach_objects["DATA"]:
-                            if want_c["vrfName"] == vrf_attach["vrfName"]:
-                                if not vrf_attach.get("lanAttachList"):
-                                    continue
-                                attach_list = vrf_attach["lanAttachList"]
-
-                                for attach in attach_list:
-                                    path = self.paths["GET_VRF_SWITCH"].format(
-                                        self.fabric,
-                                        attach["vrfName"],
-                                        attach["switchSerialNo"],
-                                    )
-                                    lite_objects = dcnm_send(self.module, method, path)
-                                    if not lite_objects.get("DATA"):
-                                        return
-                                    item["attach"].append(lite_objects.get("DATA")[0])
-                                query.append(item)
+    def assign_vlan_block(self):
+
+        """
+        Routine to allocate the vlan ids of all the vrfs being created without a vlan_id in one go, before
+        any of them is created. The vlan ids are taken from the VRF vlan range of the fabric, skipping the ones
+        used by the vrfs and the attachments present on DCNM, by the other vrfs being created and the ones
+        allocated on the switches the new vrfs are attached to.
+        """
+
+        vrfs = []
+        used_vlans = set()
+        for vrf in self.diff_create:
+            vlan_id = self.load_template_config(vrf["vrfTemplateConfig"]).get("vrfVlanId", "0")
+            if vlan_id == 0:
+                vrfs.append(vrf)
+            elif str(vlan_id).isdigit():
+                used_vlans.add(int(vlan_id))
+
+        for vrf in self.have_create:
+            vlan_id = self.load_template_config(vrf["vrfTemplateConfig"]).get("vrfVlanId", "0")
+            if str(vlan_id).isdigit():
+                used_vlans.add(int(vlan_id))
+
+        for vrf_attach in self.have_attach + self.want_attach:
+            for attach in vrf_attach.get("lanAttachList") or []:
+                vlan_id = attach.get("vlan", attach.get("vlanId"))
+                if str(vlan_id).isdigit():
+                    used_vlans.add(int(vlan_id))
+        used_vlans.discard(0)
+
+        if not vrfs:
+            return
 
-        else:
-            query = []
-            # Query the VRF
-            for vrf in vrf_objects["DATA"]:
-                item = {"parent": {}, "attach": []}
-                item["parent"] = vrf
-
-                # Query the Attachment for the found VRF
-                method = "GET"
-                path = self.paths["GET_VRF_ATTACH"].format(self.fabric, vrf["vrfName"])
-
-                vrf_attach_objects = dcnm_send(self.module, method, path)
-
-                missing_fabric, not_ok = self.handle_response(vrf_objects, "query_dcnm")
-
-                if missing_fabric or not_ok:
-                    msg1 = "Fabric {0} not present on DCNM".format(self.fabric)
-                    msg2 = (
-                        "Unable to find attachments for "
-                        "vrfs: {0} under fabric: {1}".format(
-                            vrf["vrfName"], self.fabric
-                        )
+        vlan_path = self.paths["GET_VLAN"].format(self.fabric)
+        vlan_data = dcnm_send(self.module, "GET", vlan_path)
+
+        # The vrf and network vlans share the vlan space of a switch, including the ones reserved
+        # outside of this task, so the pools of every switch the new vrfs are attached to are checked
+        names = set(vrf["vrfName"] for vrf in vrfs)
+        serials = sorted(set(
+            attach["serialNumber"]
+            for vrf_attach in self.want_attach
+            if vrf_attach["vrfName"] in names
+            for attach in vrf_attach.get("lanAttachList") or []
+        ))
+        for serial in serials:
+            for pool in ("TOP_DOWN_VRF_VLAN", "TOP_DOWN_NETWORK_VLAN"):
+                path = self.paths["GET_SWITCH_VLAN_POOL"].format(serial, pool)
+                used_vlans.update(dcnm_get_allocated_ids(dcnm_send(self.module, "GET", path)))
+
+        vlan_range = dcnm_get_id_range(self.fabric_data, "VRF_VLAN_RANGE", (1, 4094))
+        vlan_ids = dcnm_get_vlan_block(self.module, vlan_data, len(vrfs), used_vlans, vlan_range)
+        for vrf, vlan_id in zip(vrfs, vlan_ids):
+            json_to_dict = self.load_template_config(vrf["vrfTemplateConfig"])
+            json_to_dict.update({"vrfVlanId": vlan_id})
+            vrf.update({"vrfTemplateConfig": self.dump_template_config(json_to_dict)})
+
+    def update_create_payload(self, vrf):
+
+        """
+        Routine to normalize the vrfTemplateConfig of a vrf create payload, fetching a vlan id from DCNM
+        if the vrf has none yet.
+
+        Parameters:
+            vrf (dict): create payload of the vrf
+        """
+
+        json_to_dict = self.load_template_config(vrf["vrfTemplateConfig"])
+        vlanId = json_to_dict.get("vrfVlanId", "0")
+
+        if vlanId == 0:
+            vlan_path = self.paths["GET_VLAN"].format(self.fabric)
+            vlan_data = dcnm_send(self.module, "GET", vlan_path)
+
+            if vlan_data["RETURN_CODE"] != 200:
+                self.module.fail_json(
+                    msg="Failure getting autogenerated vlan_id {0}".format(
+                        vlan_data
                     )
+                )
+            vlanId = vlan_data["DATA"]
+
+        t_conf = dcnm_normalize_template_config(
+            json_to_dict,
+            self.vrf_template_fields,
+            self.dcnm_version,
+            use_defaults=False,
+            vrfSegmentId=vrf["vrfId"],
+            vrfName=json_to_dict.get("vrfName", ""),
+            vrfVlanId=vlanId,
+        )
 
-                    self.module.fail_json(msg=msg1 if missing_fabric else msg2)
-                    return
+        vrf.update({"vrfTemplateConfig": self.dump_template_config(t_conf)})
 
-                if not vrf_attach_objects["DATA"]:
-                    return
+    def send_vrf_requests(self, method, requests, is_rollback, op="create", record=None):
 
-                for vrf_attach in vrf_attach_objects["DATA"]:
-                    if not vrf_attach.get("lanAttachList"):
-                        continue
-                    attach_list = vrf_attach["lanAttachList"]
+        """
+        Routine to send the per vrf create or update requests, or the per member fabric attach requests,
+        to DCNM. The requests are sent concurrently as per 'max_workers' and the responses are handled in
+        the order of the requests. Once a request fails, the requests not yet sent are skipped.
 
-                    for attach in attach_list:
-                        path = self.paths["GET_VRF_SWITCH"].format(
-                            self.fabric, attach["vrfName"], attach["switchSerialNo"]
-                        )
+        Parameters:
+            method (str): HTTP method to be used
+            requests (list): (path, payload) tuples
+            is_rollback (bool): True if the requests are sent to rollback the changes made
+            op (str): Operation passed to handle_response()
+            record (str): Kind of change recorded by record_change() for each request that succeeds
 
-                        lite_objects = dcnm_send(self.module, method, path)
-                        if not lite_objects.get("DATA"):
-                            return
-                        item["attach"].append(lite_objects.get("DATA")[0])
-                    query.append(item)
+        Returns:
+            bool: False if a request failed during rollback, True otherwise
+        """
 
-        self.query = query
+        failed = []
+
+        def send_request(request):
+            if failed:
+                return None
+            req_path, payload = request
+            resp = dcnm_send(self.module, method, req_path, json.dumps(payload))
+            fail, changed = self.handle_response(resp, op)
+            if fail:
+                failed.append(request)
+            return resp, fail, changed
+
+        results = dcnm_run_concurrently(
+            send_request, requests, self.params["max_workers"]
+        )
+
+        for request, result in zip(requests, results):
+            if result is None:
+                continue
+            resp, fail, self.result["changed"] = result
+            self.result["response"].append(resp)
+            if fail:
+                if is_rollback:
+                    self.failed_to_rollback = True
+                    return False
+                if record in ("attached", "detached"):
+                    succeeded = dcnm_get_attach_succeeded(request[1], resp, "vrfName")
+                    self.record_change(record, succeeded, is_rollback)
+                self.failure(resp)
+            if record:
+                self.record_change(record, request[1], is_rollback)
+
+        return True
+
+    def split_by_member_fabric(self, diff):
+
+        """
+        Routine to split an attach or detach payload of a multisite fabric by member fabric when
+        'split_by_member_fabric' is set, so that the attachments of each member fabric are sent with
+        a request of their own.
+
+        Parameters:
+            diff (list): diff_attach or diff_detach, with the fabric of the attachments already updated
+
+        Returns:
+            list: Payloads to be sent
+        """
+
+        if not self.is_ms_fabric or not self.params["split_by_member_fabric"]:
+            return [diff]
+
+        return dcnm_split_attach_by_fabric(diff)
+
+    def take_snapshot(self):
+
+        """
+        Routine to serialize the have state of every vrf: its payload and its attachments. The snapshot
+        is taken before the diffs are computed, since computing them alters the have state, and lets
+        get_diff_rollback() revert a failed task without reading the state back from DCNM.
+        """
+
+        self.snapshot = dcnm_take_snapshot(self.have_create, self.have_attach, "vrfName")
+
+    def record_changes(self):
+
+        """
+        Routine to start recording the changes made by push_to_remote(). Only the snapshots of the vrfs
+        about to be changed are kept. The vrfs created by get_diff_merge() are already recorded, the other
+        changes are recorded by record_change() as their requests succeed.
+        """
+
+        names = set(vrf["vrfName"] for vrf in self.diff_create + self.diff_create_quick + self.diff_create_update)
+        names.update(self.diff_delete)
+        names.update(diff_a["vrfName"] for diff_a in self.diff_attach + self.diff_detach)
+        self.snapshot, self.changes = dcnm_start_changes(
+            self.snapshot,
+            names,
+            [vrf["vrfName"] for vrf in self.diff_create_quick],
+        )
+
+    def record_change(self, kind, payload, is_rollback):
+
+        """
+        Routine to record a change made by push_to_remote() once its request has succeeded, see
+        dcnm_record_change(). Nothing is recorded while rolling back or without 'snapshot_rollback'.
+        """
+
+        if is_rollback or self.changes is None:
+            return
+        dcnm_record_change(self.changes, kind, "vrfName", payload)
+
+    def get_diff_rollback(self):
+
+        """
+        Routine to compute the operations reverting the changes recorded by record_changes(). The detach,
+        attach and deploy operations are each sent as a single request by push_to_remote().
+        """
+
+        diff = dcnm_get_diff_rollback(self.snapshot, self.changes, "vrfName", drop_keys=("vrf_lite",))
+
+        self.diff_create = diff["create"]
+        self.diff_create_update = diff["create_update"]
+        self.diff_delete = diff["delete"]
+        self.diff_attach = diff["attach"]
+        self.diff_detach = diff["detach"]
+        self.diff_deploy = (
+            {"vrfNames": ",".join(diff["deploy_names"])} if diff["deploy_names"] else {}
+        )
+        self.diff_undeploy = (
+            {"vrfNames": ",".join(diff["undeploy_names"])} if diff["undeploy_names"] else {}
+        )
 
     def push_to_remote(self, is_rollback=False):
 
+        if self.params["snapshot_rollback"] and not is_rollback:
+            self.record_changes()
+
         path = self.paths["GET_VRF"].format(self.fabric)
 
         method = "PUT"
         if self.diff_create_update:
-            for vrf in self.diff_create_update:
-                update_path = path + "/{0}".format(vrf["vrfName"])
-                resp = dcnm_send(self.module, method, update_path, json.dumps(vrf))
-                self.result["response"].append(resp)
-                fail, self.result["changed"] = self.handle_response(resp, "create")
-                if fail:
-                    if is_rollback:
-                        self.failed_to_rollback = True
-                        return
-                    self.failure(resp)
+            requests = [
+                (path + "/{0}".format(vrf["vrfName"]), vrf)
+                for vrf in self.diff_create_update
+            ]
+            if not self.send_vrf_requests(method, requests, is_rollback, record="updated"):
+                return
 
         #
         # The detach and un-deploy operations are executed before the create,attach and deploy to particularly
@@ -2171,7 +2589,7 @@ class DcnmVrf:
             detach_path = path + "/attachments"
 
             # Update the fabric name to specific fabric to which the switches belong for multisite fabric.
-            if self.fabric_type == "MFD":
+            if self.is_ms_fabric:
                 for elem in self.diff_detach:
                     for node in elem["lanAttachList"]:
                         node["fabric"] = self.sn_fab[node["serialNumber"]]
@@ -2181,16 +2599,12 @@ class DcnmVrf:
                     if "is_deploy" in v_a.keys():
                         del v_a["is_deploy"]
 
-            resp = dcnm_send(
-                self.module, method, detach_path, json.dumps(self.diff_detach)
-            )
-            self.result["response"].append(resp)
-            fail, self.result["changed"] = self.handle_response(resp, "attach")
-            if fail:
-                if is_rollback:
-                    self.failed_to_rollback = True
-                    return
-                self.failure(resp)
+            requests = [
+                (detach_path, payload)
+                for payload in self.split_by_member_fabric(self.diff_detach)
+            ]
+            if not self.send_vrf_requests(method, requests, is_rollback, "attach", "detached"):
+                return
 
         method = "POST"
         if self.diff_undeploy:
@@ -2208,13 +2622,23 @@ class DcnmVrf:
 
         del_failure = ""
 
-        if self.diff_delete and self.wait_for_vrf_del_ready():
+        if self.diff_delete and self.wait_for_vrf_del_ready(is_rollback):
             method = "DELETE"
+            vrfs = []
             for vrf, state in self.diff_delete.items():
                 if state == "OUT-OF-SYNC":
                     del_failure += vrf + ","
                     continue
-                delete_path = path + "/" + vrf
+                vrfs.append(vrf)
+
+            # The vrfs created by the task are deleted with a single request when rolling back
+            if is_rollback and vrfs and "BULK_DELETE_VRF" in self.paths:
+                delete_path = self.paths["BULK_DELETE_VRF"].format(self.fabric, ",".join(vrfs))
+                requests = [(delete_path, vrfs)]
+            else:
+                requests = [(path + "/" + vrf, [vrf]) for vrf in vrfs]
+
+            for delete_path, names in requests:
                 resp = dcnm_send(self.module, method, delete_path)
                 self.result["response"].append(resp)
                 fail, self.result["changed"] = self.handle_response(resp, "delete")
@@ -2223,6 +2647,9 @@ class DcnmVrf:
                         self.failed_to_rollback = True
                         return
                     self.failure(resp)
+                self.record_change("deleted", names, is_rollback)
+        elif self.failed_to_rollback:
+            return
 
         if del_failure:
             self.result["response"].append(
@@ -2233,71 +2660,27 @@ class DcnmVrf:
         method = "POST"
         if self.diff_create:
 
-            for vrf in self.diff_create:
-                json_to_dict = json.loads(vrf["vrfTemplateConfig"])
-                vlanId = json_to_dict.get("vrfVlanId", "0")
-
-                if vlanId == 0:
-                    vlan_path = self.paths["GET_VLAN"].format(self.fabric)
-                    vlan_data = dcnm_send(self.module, "GET", vlan_path)
-
-                    if vlan_data["RETURN_CODE"] != 200:
-                        self.module.fail_json(
-                            msg="Failure getting autogenerated vlan_id {0}".format(
-                                vlan_data
-                            )
-                        )
-                    vlanId = vlan_data["DATA"]
-
-                t_conf = {
-                    "vrfSegmentId": vrf["vrfId"],
-                    "vrfName": json_to_dict.get("vrfName", ""),
-                    "vrfVlanId": vlanId,
-                    "vrfVlanName": json_to_dict.get("vrfVlanName"),
-                    "vrfIntfDescription": json_to_dict.get("vrfIntfDescription"),
-                    "vrfDescription": json_to_dict.get("vrfDescription"),
-                    "mtu": json_to_dict.get("mtu"),
-                    "tag": json_to_dict.get("tag"),
-                    "vrfRouteMap": json_to_dict.get("vrfRouteMap"),
-                    "maxBgpPaths": json_to_dict.get("maxBgpPaths"),
-                    "maxIbgpPaths": json_to_dict.get("maxIbgpPaths"),
-                    "ipv6LinkLocalFlag": json_to_dict.get("ipv6LinkLocalFlag"),
-                    "trmEnabled": json_to_dict.get("trmEnabled"),
-                    "isRPExternal": json_to_dict.get("isRPExternal"),
-                    "rpAddress": json_to_dict.get("rpAddress"),
-                    "loopbackNumber": json_to_dict.get("loopbackNumber"),
-                    "L3VniMcastGroup": json_to_dict.get("L3VniMcastGroup"),
-                    "multicastGroup": json_to_dict.get("multicastGroup"),
-                    "trmBGWMSiteEnabled": json_to_dict.get("trmBGWMSiteEnabled"),
-                    "advertiseHostRouteFlag": json_to_dict.get("advertiseHostRouteFlag"),
-                    "advertiseDefaultRouteFlag": json_to_dict.get("advertiseDefaultRouteFlag"),
-                    "configureStaticDefaultRouteFlag": json_to_dict.get("configureStaticDefaultRouteFlag"),
-                    "bgpPassword": json_to_dict.get("bgpPassword"),
-                    "bgpPasswordKeyType": json_to_dict.get("bgpPasswordKeyType"),
-                }
-
-                if self.dcnm_version > 11:
-                    t_conf.update(isRPAbsent=json_to_dict.get("isRPAbsent"))
-                    t_conf.update(ENABLE_NETFLOW=json_to_dict.get("ENABLE_NETFLOW"))
-                    t_conf.update(NETFLOW_MONITOR=json_to_dict.get("NETFLOW_MONITOR"))
-                    t_conf.update(disableRtAuto=json_to_dict.get("disableRtAuto"))
-                    t_conf.update(routeTargetImport=json_to_dict.get("routeTargetImport"))
-                    t_conf.update(routeTargetExport=json_to_dict.get("routeTargetExport"))
-                    t_conf.update(routeTargetImportEvpn=json_to_dict.get("routeTargetImportEvpn"))
-                    t_conf.update(routeTargetExportEvpn=json_to_dict.get("routeTargetExportEvpn"))
-                    t_conf.update(routeTargetImportMvpn=json_to_dict.get("routeTargetImportMvpn"))
-                    t_conf.update(routeTargetExportMvpn=json_to_dict.get("routeTargetExportMvpn"))
-
-                vrf.update({"vrfTemplateConfig": json.dumps(t_conf)})
-
-                resp = dcnm_send(self.module, method, path, json.dumps(vrf))
-                self.result["response"].append(resp)
-                fail, self.result["changed"] = self.handle_response(resp, "create")
-                if fail:
-                    if is_rollback:
-                        self.failed_to_rollback = True
+            # Each vlan id fetched from DCNM is only reserved once the vrf using it is created. The vlan
+            # ids must therefore be known before the creates are sent together, while the vrfs sent one
+            # at a time are created before the vlan id of the next one is fetched.
+            # The vrfs deleted by the task are restored with a single request when rolling back
+            bulk_create = (self.params["bulk_create"] or is_rollback) and "BULK_CREATE_VRF" in self.paths
+            if bulk_create or self.params["vlan_block_allocation"]:
+                self.assign_vlan_block()
+                for vrf in self.diff_create:
+                    self.update_create_payload(vrf)
+
+                if bulk_create:
+                    requests = [(self.paths["BULK_CREATE_VRF"], self.diff_create)]
+                else:
+                    requests = [(path, vrf) for vrf in self.diff_create]
+                if not self.send_vrf_requests(method, requests, is_rollback, record="created"):
+                    return
+            else:
+                for vrf in self.diff_create:
+                    self.update_create_payload(vrf)
+                    if not self.send_vrf_requests(method, [(path, vrf)], is_rollback, record="created"):
                         return
-                    self.failure(resp)
 
         if self.diff_attach:
             for d_a in self.diff_attach:
@@ -2453,20 +2836,16 @@ class DcnmVrf:
             attach_path = path + "/attachments"
 
             # Update the fabric name to specific fabric to which the switches belong for multisite fabric.
-            if self.fabric_type == "MFD":
+            if self.is_ms_fabric:
                 for elem in self.diff_attach:
                     for node in elem["lanAttachList"]:
                         node["fabric"] = self.sn_fab[node["serialNumber"]]
-            resp = dcnm_send(
-                self.module, method, attach_path, json.dumps(self.diff_attach)
-            )
-            self.result["response"].append(resp)
-            fail, self.result["changed"] = self.handle_response(resp, "attach")
-            if fail:
-                if is_rollback:
-                    self.failed_to_rollback = True
-                    return
-                self.failure(resp)
+            requests = [
+                (attach_path, payload)
+                for payload in self.split_by_member_fabric(self.diff_attach)
+            ]
+            if not self.send_vrf_requests(method, requests, is_rollback, "attach", "attached"):
+                return
 
         method = "POST"
         if self.diff_deploy:
@@ -2482,33 +2861,74 @@ class DcnmVrf:
                     return
                 self.failure(resp)
 
-    def wait_for_vrf_del_ready(self):
+    def wait_for_vrf_del_ready(self, is_rollback=False):
 
-        method = "GET"
-        if self.diff_delete:
-            for vrf in self.diff_delete:
-                state = False
-                path = self.paths["GET_VRF_ATTACH"].format(self.fabric, vrf)
-                while not state:
-                    resp = dcnm_send(self.module, method, path)
-                    state = True
-                    if resp.get("DATA") is not None:
-                        attach_list = resp["DATA"][0]["lanAttachList"]
-                        for atch in attach_list:
-                            if (
-                                atch["lanAttachState"] == "OUT-OF-SYNC"
-                                or atch["lanAttachState"] == "FAILED"
-                            ):
-                                self.diff_delete.update({vrf: "OUT-OF-SYNC"})
-                                break
-                            if atch["lanAttachState"] != "NA":
-                                self.diff_delete.update({vrf: "DEPLOYED"})
-                                state = False
-                                time.sleep(self.WAIT_TIME_FOR_DELETE_LOOP)
-                                break
-                            self.diff_delete.update({vrf: "NA"})
-
-            return True
+        """
+        Routine to wait until the VRFs in diff_delete are detached from all the switches. The VRFs still
+        pending are queried together in every poll and a VRF is dropped from the pending set once all its
+        attachments are NA, or as soon as one of them is OUT-OF-SYNC or FAILED. A failed query is retried
+        in the next poll. If some VRFs are still pending after 'delete_timeout' seconds, the module fails,
+        or the rollback is marked as failed when rolling back.
+
+        Parameters:
+            is_rollback (bool): True if the VRFs are being deleted as part of a rollback
+
+        Returns:
+            bool: True once all the VRFs in diff_delete are ready for deletion
+        """
+
+        if not self.diff_delete:
+            return False
+
+        pending = set(self.diff_delete)
+        deadline = time.time() + self.params["delete_timeout"]
+
+        while True:
+            resp = dcnm_get_url(
+                self.module,
+                self.fabric,
+                self.paths["GET_VRF_ATTACH"],
+                ",".join(sorted(pending)),
+                "vrfs",
+                fail=False,
+            )
+
+            if resp is not None:
+                attach_states = {}
+                for vrf_attach in resp.get("DATA") or []:
+                    attach_states[vrf_attach["vrfName"]] = [
+                        atch["lanAttachState"]
+                        for atch in vrf_attach.get("lanAttachList") or []
+                    ]
+
+                for vrf in sorted(pending):
+                    states = attach_states.get(vrf, [])
+                    if "OUT-OF-SYNC" in states or "FAILED" in states:
+                        self.diff_delete.update({vrf: "OUT-OF-SYNC"})
+                    elif any(state != "NA" for state in states):
+                        self.diff_delete.update({vrf: "DEPLOYED"})
+                        continue
+                    else:
+                        self.diff_delete.update({vrf: "NA"})
+                    pending.discard(vrf)
+
+                if not pending:
+                    return True
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                if is_rollback:
+                    self.failed_to_rollback = True
+                    return False
+                self.module.fail_json(
+                    msg="Timed out after {0} seconds waiting for vrfs {1} to be detached "
+                    "from all switches".format(
+                        self.params["delete_timeout"], ",".join(sorted(pending))
+                    )
+                )
+                return False
+
+            time.sleep(min(self.WAIT_TIME_FOR_DELETE_LOOP, remaining))
 
     def validate_input(self):
         """Parse the playbook values, validate to param specs."""
@@ -2757,7 +3177,7 @@ class DcnmVrf:
     def failure(self, resp):
 
         # Donot Rollback for Multi-site fabrics
-        if self.fabric_type == "MFD":
+        if self.is_ms_fabric:
             self.failed_to_rollback = True
             self.module.fail_json(msg=resp)
             return
@@ -2765,15 +3185,18 @@ class DcnmVrf:
         # Implementing a per task rollback logic here so that we rollback DCNM to the have state
         # whenever there is a failure in any of the APIs.
         # The idea would be to run overridden state with want=have and have=dcnm_state
-        self.want_create = self.have_create
-        self.want_attach = self.have_attach
-        self.want_deploy = self.have_deploy
+        if self.changes is not None:
+            self.get_diff_rollback()
+        else:
+            self.want_create = self.have_create
+            self.want_attach = self.have_attach
+            self.want_deploy = self.have_deploy
 
-        self.have_create = []
-        self.have_attach = []
-        self.have_deploy = {}
-        self.get_have()
-        self.get_diff_override()
+            self.have_create = []
+            self.have_attach = []
+            self.have_deploy = {}
+            self.get_have()
+            self.get_diff_override()
 
         self.push_to_remote(True)
 
@@ -2809,10 +3232,25 @@ def main():
             default="merged",
             choices=["merged", "replaced", "deleted", "overridden", "query"],
         ),
+        delete_timeout=dict(required=False, type="int", default=600),
+        vrf_id_block_allocation=dict(required=False, type="bool", default=False),
+        vlan_block_allocation=dict(required=False, type="bool", default=False),
+        max_workers=dict(required=False, type="int", default=1),
+        bulk_create=dict(required=False, type="bool", default=False),
+        query_switch_details=dict(required=False, type="bool", default=True),
+        snapshot_rollback=dict(required=False, type="bool", default=False),
+        split_by_member_fabric=dict(required=False, type="bool", default=False),
     )
 
     module = AnsibleModule(argument_spec=element_spec, supports_check_mode=True)
 
+    if module.params["max_workers"] < 1:
+        module.fail_json(
+            msg="'max_workers' must be at least 1, given = '{0}'".format(
+                module.params["max_workers"]
+            )
+        )
+
     dcnm_vrf = DcnmVrf(module)
 
     if not dcnm_vrf.ip_sn:
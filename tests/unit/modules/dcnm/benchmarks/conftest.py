@@ -0,0 +1,35 @@
+# Copyright (c) 2020-2022 Cisco and/or its affiliates.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+
+    # The scale benchmarks take minutes at 1000 switches. Run them only when asked for
+    # explicitly with --benchmark-only, so that they stay out of the regular unit test runs.
+    if config.pluginmanager.hasplugin("benchmark") and config.getoption(
+        "benchmark_only"
+    ):
+        return
+
+    skip = pytest.mark.skip(reason="scale benchmarks run only with --benchmark-only")
+    for item in items:
+        if "benchmarks" in item.nodeid:
+            item.add_marker(skip)
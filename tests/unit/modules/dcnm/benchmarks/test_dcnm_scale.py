@@ -0,0 +1,241 @@
+# Copyright (c) 2020-2022 Cisco and/or its affiliates.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Scale benchmarks for the dcnm modules. Each benchmark runs a module in check mode against a
+# synthetic fabric of 10, 100 and 1000 switches, which exercises get_want, get_have and the
+# get_diff_* routines without pushing any changes. Besides the wall clock timings collected by
+# pytest-benchmark, the following are reported in 'extra_info' for every run:
+#
+#   cpu_time      - CPU seconds used by a single module run
+#   peak_memory   - peak memory in bytes allocated during a single module run
+#   api_calls     - total number of controller requests
+#   api_endpoints - number of controller requests per (method, endpoint)
+#
+# The benchmarks need pytest-benchmark and run only with --benchmark-only, see conftest.py.
+# To run them:
+#
+#   pytest tests/unit/modules/dcnm/benchmarks --benchmark-only
+#   pytest tests/unit/modules/dcnm/benchmarks --benchmark-only -k dcnm_vrf
+#   pytest tests/unit/modules/dcnm/benchmarks --benchmark-only --benchmark-json=scale.json
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import copy
+import time
+import tracemalloc
+
+import pytest
+
+from unittest.mock import patch
+
+from ansible.module_utils import basic
+from ansible_collections.ansible.netcommon.tests.unit.modules.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    exit_json,
+    fail_json,
+)
+from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm import dcnm as dcnm_utils
+from ansible_collections.cisco.dcnm.plugins.modules import (
+    dcnm_interface,
+    dcnm_links,
+    dcnm_network,
+    dcnm_policy,
+    dcnm_resource_manager,
+    dcnm_vrf,
+)
+
+from ..dcnm_module import set_module_args
+from ..fabric_generator import FabricGenerator, FakeController
+
+pytest.importorskip("pytest_benchmark")
+
+SCALES = [10, 100, 1000]
+SEED = 2022
+VERSION = 12
+
+# Number of timed rounds per scale. The 1000 switch runs are slow enough that a single
+# round gives a stable number.
+ROUNDS = {10: 5, 100: 3, 1000: 1}
+
+_fabrics = {}
+
+
+def get_fabric(num_switches):
+
+    if num_switches not in _fabrics:
+        _fabrics[num_switches] = FabricGenerator(num_switches, seed=SEED)
+    return _fabrics[num_switches]
+
+
+def run_module(module, args, gen):
+
+    """
+    Run 'module' in check mode against the fabric described by 'gen'.
+
+    Returns:
+        result (dict): result of the module run
+        controller (FakeController): controller with the requests made by the module
+    """
+
+    controller = FakeController(gen, module, VERSION)
+
+    def inventory(mod, fabric):
+        controller.calls[("GET", "INVENTORY")] += 1
+        return gen.inventory()
+
+    def fabric_details(mod, fabric):
+        controller.calls[("GET", "FABRIC_DETAILS")] += 1
+        return gen.fabric_details()
+
+    mocks = {
+        "dcnm_send": controller.send,
+        "dcnm_version_supported": lambda mod: VERSION,
+        "get_fabric_inventory_details": inventory,
+        "get_fabric_details": fabric_details,
+    }
+
+    patches = [patch.object(dcnm_utils, "dcnm_send", controller.send)]
+    for name, mock in mocks.items():
+        if hasattr(module, name):
+            patches.append(patch.object(module, name, mock))
+    patches.append(
+        patch.multiple(basic.AnsibleModule, exit_json=exit_json, fail_json=fail_json)
+    )
+    patches.append(patch("time.sleep"))
+
+    args = copy.deepcopy(args)
+    args["_ansible_check_mode"] = True
+    set_module_args(args)
+
+    for p in patches:
+        p.start()
+    try:
+        module.main()
+    except AnsibleExitJson as exc:
+        result = exc.args[0]
+    except AnsibleFailJson as exc:
+        pytest.fail("{0} failed: {1}".format(module.__name__, exc.args[0]))
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+    return result, controller
+
+
+def run_benchmark(benchmark, module, args, gen):
+
+    # One instrumented run for CPU time, memory and call counts. These are measured outside
+    # the timed rounds since tracemalloc slows down the run considerably.
+    start = time.process_time()
+    result, controller = run_module(module, args, gen)
+    cpu_time = time.process_time() - start
+
+    tracemalloc.start()
+    try:
+        run_module(module, args, gen)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    benchmark.extra_info["switches"] = gen.num_switches
+    benchmark.extra_info["cpu_time"] = cpu_time
+    benchmark.extra_info["peak_memory"] = peak_memory
+    benchmark.extra_info["api_calls"] = sum(controller.calls.values())
+    benchmark.extra_info["api_endpoints"] = dict(
+        ("{0} {1}".format(method, name), count)
+        for (method, name), count in sorted(controller.calls.items())
+    )
+
+    benchmark.pedantic(
+        run_module,
+        args=(module, args, gen),
+        rounds=ROUNDS.get(gen.num_switches, 1),
+        iterations=1,
+    )
+    return result
+
+
+@pytest.mark.parametrize("num_switches", SCALES)
+@pytest.mark.parametrize("state", ["merged", "overridden"])
+def test_dcnm_intf_scale(benchmark, num_switches, state):
+
+    gen = get_fabric(num_switches)
+    config = gen.intf_config(count=gen.num_eth // 2)
+    args = dict(fabric=gen.fabric, state=state, config=config)
+
+    result = run_benchmark(benchmark, dcnm_interface, args, gen)
+    assert result["diff"][0][state]
+
+
+@pytest.mark.parametrize("num_switches", SCALES)
+@pytest.mark.parametrize("state", ["merged", "overridden", "query"])
+def test_dcnm_vrf_scale(benchmark, num_switches, state):
+
+    gen = get_fabric(num_switches)
+    config = gen.vrf_config() if state != "query" else None
+    args = dict(fabric=gen.fabric, state=state, config=config)
+
+    result = run_benchmark(benchmark, dcnm_vrf, args, gen)
+    if state == "query":
+        assert len(result["response"]) == gen.num_vrfs
+    else:
+        assert result["diff"]
+
+
+@pytest.mark.parametrize("num_switches", SCALES)
+@pytest.mark.parametrize("state", ["merged", "overridden", "query"])
+def test_dcnm_network_scale(benchmark, num_switches, state):
+
+    gen = get_fabric(num_switches)
+    config = gen.network_config() if state != "query" else None
+    args = dict(fabric=gen.fabric, state=state, config=config)
+
+    result = run_benchmark(benchmark, dcnm_network, args, gen)
+    if state == "query":
+        assert len(result["response"]) == len(gen.networks)
+    else:
+        assert result["diff"]
+
+
+@pytest.mark.parametrize("num_switches", SCALES)
+def test_dcnm_policy_scale(benchmark, num_switches):
+
+    gen = get_fabric(num_switches)
+    args = dict(fabric=gen.fabric, state="merged", config=gen.policy_config())
+
+    result = run_benchmark(benchmark, dcnm_policy, args, gen)
+    assert result["diff"][0]["merged"]
+
+
+@pytest.mark.parametrize("num_switches", SCALES)
+def test_dcnm_rm_scale(benchmark, num_switches):
+
+    gen = get_fabric(num_switches)
+    args = dict(fabric=gen.fabric, state="merged", config=gen.rm_config())
+
+    run_benchmark(benchmark, dcnm_resource_manager, args, gen)
+
+
+@pytest.mark.parametrize("num_switches", SCALES)
+def test_dcnm_links_scale(benchmark, num_switches):
+
+    gen = get_fabric(num_switches)
+    args = dict(src_fabric=gen.fabric, state="merged", config=gen.links_config())
+
+    result = run_benchmark(benchmark, dcnm_links, args, gen)
+    assert len(result["diff"][0]["modified"]) == len(gen.links)
@@ -18,8 +18,11 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import os
+import re
 import json
 
+from collections import Counter
+
 from ansible_collections.ansible.netcommon.tests.unit.modules.utils import (
     AnsibleExitJson,
     AnsibleFailJson,
@@ -52,6 +55,84 @@ def loadPlaybookData(module_name):
     return j_data
 
 
+def api_call_budget(endpoints=None, **methods):
+    """
+    Declare the maximum number of controller requests a test scenario may make.
+
+    Parameters:
+        endpoints: dict mapping (method, endpoint) to the maximum number of
+                   requests allowed to that endpoint. The endpoint is the key
+                   used in the module's path table (e.g. "IF_WITH_SNO_IFNAME")
+                   or the normalized path if the module has no matching entry
+        methods: maximum number of requests per HTTP method (e.g. GET=10).
+                 TOTAL bounds the number of requests of all methods
+
+    Returns:
+        decorator which attaches the budget to the test method. The budget is
+        checked by TestDcnmModule.execute_module once the module exits
+
+    Example:
+        @api_call_budget(GET=10, endpoints={("POST", "GLOBAL_IF_DEPLOY"): 1})
+        def test_dcnm_intf_eth_merged_new(self):
+    """
+
+    budget = dict(methods)
+    budget.update(endpoints or {})
+
+    def decorator(func):
+        func.api_call_budget = budget
+        return func
+
+    return decorator
+
+
+def get_endpoint_templates(module):
+    """
+    Collect the path templates from the 'dcnm_*_paths' tables of all classes in
+    the given module. Returns a list of (name, compiled regex, template) tuples,
+    most specific template first.
+    """
+
+    templates = {}
+    for obj in vars(module).values():
+        if not isinstance(obj, type):
+            continue
+        for attr, paths in vars(obj).items():
+            if not (attr.startswith("dcnm_") and attr.endswith("_paths")):
+                continue
+            for version_paths in paths.values():
+                for name, path in version_paths.items():
+                    templates[path] = name
+
+    endpoints = []
+    for path, name in templates.items():
+        base, sep, query = path.partition("?")
+        regex = re.sub(r"\\\{\d*\\\}", "[^/?]+", re.escape(base))
+        if sep:
+            regex += re.escape(sep) + re.sub(
+                r"\\\{\d*\\\}", "[^&]*", re.escape(query)
+            )
+        endpoints.append((name, re.compile("^" + regex + "$"), path))
+
+    # Prefer the template with the most literal characters when more than one matches
+    endpoints.sort(key=lambda e: len(re.sub(r"\{\d*\}", "", e[2])), reverse=True)
+    return endpoints
+
+
+def get_endpoint(path, endpoints):
+    """
+    Map a request path to the name of the endpoint template it was built from. Paths
+    which do not match any template are returned with the fabric name and query values
+    masked.
+    """
+
+    for name, regex, template in endpoints:
+        if regex.match(path):
+            return name
+    path = re.sub(r"/fabrics/[^/?]+", "/fabrics/{}", path)
+    return re.sub(r"=[^&]*", "={}", path)
+
+
 def load_fixture(module_name, name, device=""):
     path = os.path.join(fixture_path, module_name, device, name)
     if not os.path.exists(path):
@@ -73,6 +154,20 @@ def load_fixture(module_name, name, device=""):
 
 
 class TestDcnmModule(ModuleTestCase):
+
+    # Mocks (attributes of the test case) whose calls are recorded as controller requests.
+    # dcnm_get_url issues GET requests for the path it is given.
+    api_call_mocks = {
+        "run_dcnm_send": lambda args, kwargs: (
+            kwargs.get("method", args[1] if len(args) > 1 else None),
+            kwargs.get("path", args[2] if len(args) > 2 else None),
+        ),
+        "run_dcnm_get_url": lambda args, kwargs: (
+            "GET",
+            kwargs.get("path", args[2] if len(args) > 2 else None),
+        ),
+    }
+
     def execute_module_devices(
         self, failed=False, changed=False, response=None, sort=True, defaults=False
     ):
@@ -108,6 +203,8 @@ class TestDcnmModule(ModuleTestCase):
             result = self.changed(changed)
             self.assertEqual(result["changed"], changed, result)
 
+        self.check_api_call_budget()
+
         if response is not None:
             if sort:
                 self.assertEqual(
@@ -118,6 +215,56 @@ class TestDcnmModule(ModuleTestCase):
 
         return result
 
+    def get_api_calls(self):
+        """
+        Count the controller requests made by the module under test.
+
+        Returns:
+            Counter: (method, endpoint) - number of requests
+        """
+
+        if getattr(self, "_endpoints", None) is None:
+            self._endpoints = get_endpoint_templates(self.module)
+
+        calls = Counter()
+        for mock_name, get_request in self.api_call_mocks.items():
+            mock = getattr(self, mock_name, None)
+            if mock is None:
+                continue
+            for call in mock.call_args_list:
+                method, path = get_request(call[0], call[1])
+                calls[(method, get_endpoint(path, self._endpoints))] += 1
+        return calls
+
+    def assertApiCallBudget(self, budget):
+        """
+        Fail the test if the requests made so far exceed the given budget. See
+        api_call_budget() for the format of 'budget'.
+        """
+
+        calls = self.get_api_calls()
+        for key, limit in budget.items():
+            if isinstance(key, tuple):
+                used = calls[key]
+            elif key.upper() == "TOTAL":
+                used = sum(calls.values())
+            else:
+                used = sum(v for k, v in calls.items() if k[0] == key.upper())
+            self.assertLessEqual(
+                used,
+                limit,
+                "API call budget exceeded for {0}: {1} > {2}, calls = {3}".format(
+                    key, used, limit, dict(calls)
+                ),
+            )
+
+    def check_api_call_budget(self):
+
+        test = getattr(self, self._testMethodName, None)
+        budget = getattr(test, "api_call_budget", None)
+        if budget:
+            self.assertApiCallBudget(budget)
+
     def failed(self):
         with self.assertRaises(AnsibleFailJson) as exc:
             self.module.main()
@@ -0,0 +1,1054 @@
+# Copyright (c) 2020-2022 Cisco and/or its affiliates.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import copy
+import json
+import random
+import string
+import ipaddress
+
+from collections import Counter
+
+from ansible.module_utils.six.moves.urllib.parse import urlsplit, parse_qs
+
+from .dcnm_module import get_endpoint_templates, get_endpoint
+
+
+class FabricGenerator(object):
+
+    """
+    Generate the controller view of a VXLAN fabric of a given size. The generated data is
+    deterministic for a given (num_switches, seed) pair, so that benchmark results from
+    different runs can be compared with each other.
+
+    The fabric is made up of spines, border switches and leaf switches. Leaf switches are
+    grouped into vPC pairs. Every switch has 'num_eth' ethernet interfaces configured as
+    trunk host ports and two loopbacks. Each VRF has 'nets_per_vrf' networks and every VRF
+    and network is attached to all leaf and border switches. Border switches carry a VRF
+    LITE extension for every VRF.
+
+    Parameters:
+        num_switches (int): number of switches in the fabric
+        seed (int): seed used to generate serial numbers and other random values
+        fabric (str): fabric name
+        num_vrfs (int): number of VRFs in the fabric
+        nets_per_vrf (int): number of networks per VRF
+        num_eth (int): number of ethernet interfaces per switch
+        num_policies (int): number of switch policies per switch
+    """
+
+    ETH_POLICY = {11: "int_trunk_host_11_1", 12: "int_trunk_host"}
+    LO_POLICY = {11: "int_loopback_11_1", 12: "int_loopback"}
+
+    def __init__(
+        self,
+        num_switches,
+        seed=0,
+        fabric="scale-fabric",
+        num_vrfs=10,
+        nets_per_vrf=2,
+        num_eth=16,
+        num_policies=4,
+    ):
+
+        self.fabric = fabric
+        self.num_switches = num_switches
+        self.num_vrfs = num_vrfs
+        self.nets_per_vrf = nets_per_vrf
+        self.num_eth = num_eth
+        self.num_policies = num_policies
+        self.rng = random.Random(seed)
+
+        self.switches = []
+        self.vpc_peer = {}
+        self.vrfs = []
+        self.networks = []
+        self.links = []
+
+        self._build_switches()
+        self._build_vrfs_and_networks()
+        self._build_links()
+
+        self.by_serial = dict((sw["serialNumber"], sw) for sw in self.switches)
+        self.index = dict((sw["serialNumber"], i) for i, sw in enumerate(self.switches))
+
+    # -------------------------- TOPOLOGY --------------------------
+
+    def _serial(self):
+
+        chars = string.ascii_uppercase + string.digits
+        return "".join(self.rng.choice(chars) for i in range(11))
+
+    def _build_switches(self):
+
+        num_spines = max(2, self.num_switches // 16)
+        num_borders = max(2, self.num_switches // 32)
+        base = ipaddress.IPv4Address(u"10.1.0.1")
+        serials = set()
+
+        for index in range(self.num_switches):
+            if index < num_spines:
+                role = "spine"
+            elif index < num_spines + num_borders:
+                role = "border"
+            else:
+                role = "leaf"
+
+            sno = self._serial()
+            while sno in serials:
+                sno = self._serial()
+            serials.add(sno)
+
+            self.switches.append(
+                {
+                    "ipAddress": str(base + index),
+                    "logicalName": "{0}-{1:04d}".format(role, index + 1),
+                    "serialNumber": sno,
+                    "switchRole": role,
+                    "switchRoleEnum": role.capitalize(),
+                    "isVpcConfigured": "False",
+                    "vpcDomain": 0,
+                    "managable": "True",
+                    "fabricName": self.fabric,
+                }
+            )
+
+        # Pair up the leaf switches into vPC pairs
+        leafs = self.leafs()
+        for index in range(0, len(leafs) - 1, 2):
+            sw1 = leafs[index]
+            sw2 = leafs[index + 1]
+            for sw in (sw1, sw2):
+                sw["isVpcConfigured"] = "True"
+                sw["vpcDomain"] = index // 2 + 1
+            self.vpc_peer[sw1["serialNumber"]] = sw2["serialNumber"]
+            self.vpc_peer[sw2["serialNumber"]] = sw1["serialNumber"]
+
+    def _build_vrfs_and_networks(self):
+
+        for index in range(self.num_vrfs):
+            name = "scale-vrf-{0}".format(index + 1)
+            self.vrfs.append(
+                {
+                    "vrfName": name,
+                    "vrfId": 50000 + index + 1,
+                    "vlanId": 2000 + index + 1,
+                    "asn": str(self.rng.randint(64512, 65534)),
+                }
+            )
+            for net in range(self.nets_per_vrf):
+                net_index = index * self.nets_per_vrf + net
+                self.networks.append(
+                    {
+                        "networkName": "scale-net-{0}".format(net_index + 1),
+                        "networkId": 30000 + net_index + 1,
+                        "vlanId": 100 + net_index + 1,
+                        "vrf": name,
+                        "gatewayIpAddress": "172.{0}.{1}.1/24".format(
+                            16 + net_index // 256, net_index % 256
+                        ),
+                    }
+                )
+
+    def _build_links(self):
+
+        # Every leaf and border switch is connected to every spine. The uplinks use the
+        # last ethernet ports on the leaf and the spine port is derived from the leaf index
+        spines = self.spines()
+        for index, sw in enumerate(self.leafs() + self.borders()):
+            for sp_index, spine in enumerate(spines):
+                self.links.append(
+                    {
+                        "sw1": sw,
+                        "if1": "Ethernet1/{0}".format(49 + sp_index),
+                        "sw2": spine,
+                        "if2": "Ethernet1/{0}".format(index + 1),
+                        "ip1": "10.{0}.{1}.{2}".format(
+                            64 + sp_index, (index * 4) // 256, (index * 4) % 256 + 1
+                        ),
+                        "ip2": "10.{0}.{1}.{2}".format(
+                            64 + sp_index, (index * 4) // 256, (index * 4) % 256 + 2
+                        ),
+                    }
+                )
+
+    def spines(self):
+        return [sw for sw in self.switches if sw["switchRole"] == "spine"]
+
+    def borders(self):
+        return [sw for sw in self.switches if sw["switchRole"] == "border"]
+
+    def leafs(self):
+        return [sw for sw in self.switches if sw["switchRole"] == "leaf"]
+
+    def attached_switches(self):
+        return self.leafs() + self.borders()
+
+    # -------------------------- HELPER RESPONSES --------------------------
+
+    def inventory(self):
+
+        """
+        Returns:
+            dict: inventory in the format returned by get_fabric_inventory_details()
+        """
+
+        return dict((sw["ipAddress"], copy.deepcopy(sw)) for sw in self.switches)
+
+    def ip_sn(self):
+
+        ip_sn = dict((sw["ipAddress"], sw["serialNumber"]) for sw in self.switches)
+        hn_sn = dict((sw["logicalName"], sw["serialNumber"]) for sw in self.switches)
+        return ip_sn, hn_sn
+
+    def fabric_details(self):
+
+        """
+        Returns:
+            dict: fabric details in the format returned by get_fabric_details()
+        """
+
+        return {
+            "fabricName": self.fabric,
+            "fabricType": "Switch_Fabric",
+            "fabricTechnology": "VXLANFabric",
+            "replicationMode": "Multicast",
+            "nvPairs": {
+                "FABRIC_NAME": self.fabric,
+                "UNDERLAY_IS_V6": "False",
+                "BGP_AS": "65001",
+            },
+        }
+
+    # -------------------------- CONTROLLER RESPONSES --------------------------
+
+    @staticmethod
+    def response(data, method="GET", code=200, message="OK"):
+
+        return {
+            "RETURN_CODE": code,
+            "METHOD": method,
+            "MESSAGE": message,
+            "DATA": data,
+        }
+
+    def vpc_pair_serial(self, sno):
+
+        peer = self.vpc_peer.get(sno)
+        if peer is None:
+            return ""
+        return "~".join(sorted([sno, peer]))
+
+    def eth_interface(self, sw, port, version=12):
+
+        ifname = "Ethernet1/{0}".format(port)
+        return {
+            "policy": self.ETH_POLICY[version],
+            "interfaces": [
+                {
+                    "interfaceType": "INTERFACE_ETHERNET",
+                    "nvPairs": {
+                        "CONF": "no shutdown",
+                        "MTU": "jumbo",
+                        "PORTTYPE_FAST_ENABLED": "true",
+                        "ADMIN_STATE": "true",
+                        "INTF_NAME": ifname,
+                        "BPDUGUARD_ENABLED": "true",
+                        "ALLOWED_VLANS": "none",
+                        "SPEED": "Auto",
+                        "DESC": "host port {0}".format(port),
+                    },
+                    "ifName": ifname,
+                    "serialNumber": sw["serialNumber"],
+                    "fabricName": self.fabric,
+                }
+            ],
+            "skipResourceCheck": "true",
+        }
+
+    def lo_interface(self, sw, lo_id, version=12):
+
+        ifname = "Loopback{0}".format(lo_id)
+        index = self.index[sw["serialNumber"]]
+        return {
+            "policy": self.LO_POLICY[version],
+            "interfaces": [
+                {
+                    "interfaceType": "INTERFACE_LOOPBACK",
+                    "nvPairs": {
+                        "CONF": "",
+                        "ADMIN_STATE": "true",
+                        "INTF_NAME": ifname,
+                        "IP": "10.{0}.{1}.{2}".format(
+                            2 + lo_id, index // 256, index % 256
+                        ),
+                        "V6IP": "",
+                        "ROUTE_MAP_TAG": "12345",
+                        "INTF_VRF": "default",
+                        "DESC": "",
+                    },
+                    "ifName": ifname,
+                    "serialNumber": sw["serialNumber"],
+                    "fabricName": self.fabric,
+                }
+            ],
+            "skipResourceCheck": "true",
+        }
+
+    def interfaces(self, sno, version=12):
+
+        sw = self.by_serial.get(sno)
+        if sw is None:
+            return []
+        intfs = [self.eth_interface(sw, port, version) for port in range(1, self.num_eth + 1)]
+        intfs.extend([self.lo_interface(sw, lo_id, version) for lo_id in (0, 1)])
+        return intfs
+
+    def interface(self, sno, ifname, version=12):
+
+        for intf in self.interfaces(sno, version):
+            if intf["interfaces"][0]["ifName"].lower() == ifname.lower():
+                return intf
+        return None
+
+    def interface_details(self, sno):
+
+        """
+        Returns:
+            list: interface records as returned by the interface detail API for the switch
+        """
+
+        sw = self.by_serial.get(sno)
+        if sw is None:
+            return []
+
+        details = []
+        names = ["Ethernet1/{0}".format(port) for port in range(1, 65)]
+        names.extend(["Loopback0", "Loopback1"])
+        for ifname in names:
+            eth = ifname.startswith("Ethernet")
+            port = int(ifname.split("/")[1]) if eth else 0
+            details.append(
+                {
+                    "ifName": ifname,
+                    "mode": "trunk" if eth else "",
+                    "serialNo": sno,
+                    "fabricName": self.fabric,
+                    "ifType": "INTERFACE_ETHERNET" if eth else "INTERFACE_LOOPBACK",
+                    "isPhysical": "True" if eth else "False",
+                    "deletable": "False" if eth else "True",
+                    "markDeleted": "False",
+                    "alias": "host port {0}".format(port) if eth and port <= self.num_eth else "",
+                    "deleteReason": None,
+                    "complianceStatus": "In-Sync",
+                    "underlayPolicies": [{"source": "" if port <= self.num_eth else "UNDERLAY"}],
+                    "interfaces": [{"nvPairs": {}}],
+                }
+            )
+        return details
+
+    def vrf_template_config(self, vrf):
+
+        return json.dumps(
+            {
+                "advertiseDefaultRouteFlag": "true",
+                "vrfVlanId": str(vrf["vlanId"]),
+                "isRPExternal": "false",
+                "vrfDescription": "",
+                "L3VniMcastGroup": "",
+                "maxBgpPaths": "1",
+                "maxIbgpPaths": "2",
+                "vrfSegmentId": str(vrf["vrfId"]),
+                "ipv6LinkLocalFlag": "true",
+                "vrfRouteMap": "FABRIC-RMAP-REDIST-SUBNET",
+                "configureStaticDefaultRouteFlag": "true",
+                "trmBGWMSiteEnabled": "false",
+                "tag": "12345",
+                "rpAddress": "",
+                "nveId": "1",
+                "bgpPasswordKeyType": "3",
+                "bgpPassword": "",
+                "mtu": "9216",
+                "multicastGroup": "",
+                "advertiseHostRouteFlag": "false",
+                "vrfVlanName": "",
+                "trmEnabled": "false",
+                "loopbackNumber": "",
+                "asn": vrf["asn"],
+                "vrfIntfDescription": "",
+                "vrfName": vrf["vrfName"],
+            }
+        )
+
+    def vrf_objects(self):
+
+        return [
+            {
+                "fabric": self.fabric,
+                "serviceVrfTemplate": None,
+                "source": None,
+                "vrfExtensionTemplate": "Default_VRF_Extension_Universal",
+                "vrfId": vrf["vrfId"],
+                "vrfName": vrf["vrfName"],
+                "vrfTemplate": "Default_VRF_Universal",
+                "vrfTemplateConfig": self.vrf_template_config(vrf),
+                "tenantName": None,
+                "vrfStatus": "DEPLOYED",
+            }
+            for vrf in self.vrfs
+        ]
+
+    def vrf_attachments(self, vrf_names):
+
+        data = []
+        vrfs = dict((vrf["vrfName"], vrf) for vrf in self.vrfs)
+        for name in vrf_names:
+            vrf = vrfs.get(name)
+            if vrf is None:
+                continue
+            lan_attach_list = []
+            for sw in self.attached_switches():
+                lan_attach_list.append(
+                    {
+                        "vrfName": name,
+                        "switchName": sw["logicalName"],
+                        "lanAttachState": "DEPLOYED",
+                        "instanceValues": json.dumps(
+                            {
+                                "loopbackId": "",
+                                "loopbackIpAddress": "",
+                                "loopbackIpV6Address": "",
+                                "switchRouteTargetImportEvpn": "",
+                                "switchRouteTargetExportEvpn": "",
+                            }
+                        ),
+                        "isLanAttached": True,
+                        "switchSerialNo": sw["serialNumber"],
+                        "switchRole": sw["switchRole"],
+                        "fabricName": self.fabric,
+                        "ipAddress": sw["ipAddress"],
+                        "vlanId": str(vrf["vlanId"]),
+                        "vrfId": str(vrf["vrfId"]),
+                    }
+                )
+            data.append({"vrfName": name, "lanAttachList": lan_attach_list})
+        return data
+
+    def vrf_lite_extension(self, vrf, sw):
+
+        index = self.borders().index(sw)
+        return {
+            "PEER_VRF_NAME": vrf["vrfName"],
+            "NEIGHBOR_IP": "10.33.{0}.1".format(index),
+            "VRF_LITE_JYTHON_TEMPLATE": "Ext_VRF_Lite_Jython",
+            "enableBorderExtension": "VRF_LITE",
+            "AUTO_VRF_LITE_FLAG": "false",
+            "IP_MASK": "10.33.{0}.2/30".format(index),
+            "MTU": "9216",
+            "NEIGHBOR_ASN": "65535",
+            "IF_NAME": "Ethernet1/{0}".format(self.num_eth + 1),
+            "IPV6_NEIGHBOR": "",
+            "IPV6_MASK": "",
+            "DOT1Q_ID": str(vrf["vlanId"]),
+            "asn": "65001",
+        }
+
+    def vrf_switch_details(self, vrf_names, serials):
+
+        data = []
+        vrfs = dict((vrf["vrfName"], vrf) for vrf in self.vrfs)
+        for name in vrf_names:
+            vrf = vrfs.get(name)
+            if vrf is None:
+                continue
+            details = []
+            for sno in serials:
+                sw = self.by_serial.get(sno)
+                if sw is None:
+                    continue
+                prototypes = []
+                extension_values = ""
+                if sw["switchRole"] == "border":
+                    ext = self.vrf_lite_extension(vrf, sw)
+                    prototypes.append(
+                        {
+                            "interfaceName": ext["IF_NAME"],
+                            "extensionType": "VRF_LITE",
+                            "extensionValues": json.dumps(ext),
+                            "destInterfaceName": "Ethernet1/1",
+                            "destSwitchName": "edge-router",
+                        }
+                    )
+                    extension_values = json.dumps(
+                        {
+                            "VRF_LITE_CONN": json.dumps({"VRF_LITE_CONN": [ext]}),
+                            "MULTISITE_CONN": json.dumps({"MULTISITE_CONN": []}),
+                        }
+                    )
+                details.append(
+                    {
+                        "switchName": sw["logicalName"],
+                        "vlan": vrf["vlanId"],
+                        "serialNumber": sno,
+                        "peerSerialNumber": self.vpc_peer.get(sno),
+                        "extensionValues": extension_values,
+                        "extensionPrototypeValues": prototypes,
+                        "islanAttached": True,
+                        "lanAttachedState": "DEPLOYED",
+                        "errorMessage": None,
+                        "instanceValues": "",
+                        "freeformConfig": "",
+                        "role": sw["switchRole"],
+                        "vlanModifiable": True,
+                    }
+                )
+            data.append(
+                {
+                    "vrfName": name,
+                    "templateName": "Default_VRF_Extension_Universal",
+                    "switchDetailsList": details,
+                }
+            )
+        return data
+
+    def network_template_config(self, net):
+
+        return json.dumps(
+            {
+                "suppressArp": "false",
+                "secondaryGW1": "",
+                "secondaryGW2": "",
+                "secondaryGW3": "",
+                "secondaryGW4": "",
+                "loopbackId": "",
+                "enableL3OnBorder": "false",
+                "networkName": net["networkName"],
+                "enableIR": "false",
+                "rtBothAuto": "false",
+                "isLayer2Only": "false",
+                "vrfDhcp": "",
+                "vrfDhcp2": "",
+                "vrfDhcp3": "",
+                "segmentId": str(net["networkId"]),
+                "dhcpServerAddr1": "",
+                "dhcpServerAddr2": "",
+                "dhcpServerAddr3": "",
+                "gatewayIpV6Address": "",
+                "tag": "12345",
+                "nveId": "1",
+                "vlanId": str(net["vlanId"]),
+                "gatewayIpAddress": net["gatewayIpAddress"],
+                "vlanName": "",
+                "mtu": "",
+                "intfDescription": "",
+                "mcastGroup": "239.1.1.0",
+                "trmEnabled": "false",
+                "vrfName": net["vrf"],
+            }
+        )
+
+    def network_objects(self, vrf_name=None):
+
+        return [
+            {
+                "fabric": self.fabric,
+                "networkName": net["networkName"],
+                "displayName": net["networkName"],
+                "networkId": net["networkId"],
+                "networkTemplate": "Default_Network_Universal",
+                "networkExtensionTemplate": "Default_Network_Extension_Universal",
+                "networkTemplateConfig": self.network_template_config(net),
+                "vrf": net["vrf"],
+                "tenantName": None,
+                "serviceNetworkTemplate": None,
+                "source": None,
+                "interfaceGroups": None,
+                "networkStatus": "DEPLOYED",
+            }
+            for net in self.networks
+            if vrf_name is None or net["vrf"] == vrf_name
+        ]
+
+    def network_attachments(self, net_names):
+
+        data = []
+        nets = dict((net["networkName"], net) for net in self.networks)
+        for name in net_names:
+            net = nets.get(name)
+            if net is None:
+                continue
+            lan_attach_list = []
+            for sw in self.attached_switches():
+                lan_attach_list.append(
+                    {
+                        "networkName": name,
+                        "displayName": name,
+                        "switchName": sw["logicalName"],
+                        "switchRole": sw["switchRole"],
+                        "fabricName": self.fabric,
+                        "lanAttachState": "DEPLOYED",
+                        "isLanAttached": True,
+                        "portNames": "Ethernet1/1,Ethernet1/2",
+                        "switchSerialNo": sw["serialNumber"],
+                        "switchDbId": self.index[sw["serialNumber"]] + 1000,
+                        "ipAddress": sw["ipAddress"],
+                        "networkId": net["networkId"],
+                        "vlanId": net["vlanId"],
+                        "interfaceGroups": None,
+                    }
+                )
+            data.append({"networkName": name, "lanAttachList": lan_attach_list})
+        return data
+
+    def policies(self, serials):
+
+        data = []
+        for sno in serials:
+            sw = self.by_serial.get(sno)
+            if sw is None:
+                continue
+            index = self.index[sw["serialNumber"]]
+            for pol in range(self.num_policies):
+                data.append(
+                    {
+                        "id": index * 100 + pol,
+                        "policyId": "POLICY-{0}".format(index * 100 + pol),
+                        "description": "",
+                        "serialNumber": sno,
+                        "entityType": "SWITCH",
+                        "entityName": "SWITCH",
+                        "templateName": "scale_template_{0}".format(pol + 1),
+                        "templateContentType": "TEMPLATE_CLI",
+                        "nvPairs": {"FABRIC_NAME": self.fabric},
+                        "autoGenerated": False,
+                        "deleted": False,
+                        "source": "",
+                        "priority": 500,
+                        "status": "NA",
+                        "fabricName": self.fabric,
+                    }
+                )
+        return data
+
+    def resources(self, sno, pool):
+
+        sw = self.by_serial.get(sno)
+        if sw is None or pool != "LOOPBACK_ID":
+            return []
+        return [
+            {
+                "id": self.index[sw["serialNumber"]] * 10 + lo_id,
+                "resourcePool": {
+                    "id": 0,
+                    "poolName": None,
+                    "fabricName": self.fabric,
+                    "vrfName": None,
+                    "poolType": "ID_POOL",
+                    "dynamicSubnetRange": None,
+                    "targetSubnet": 0,
+                    "overlapAllowed": False,
+                },
+                "entityType": "Device",
+                "entityName": "loopback{0}".format(lo_id),
+                "allocatedIp": str(lo_id),
+                "allocatedOn": 1649049896210,
+                "allocatedFlag": True,
+                "allocatedScopeValue": sno,
+                "ipAddress": sw["ipAddress"],
+                "switchName": sw["logicalName"],
+            }
+            for lo_id in (0, 1)
+        ]
+
+    def link_object(self, link):
+
+        sw1 = link["sw1"]
+        sw2 = link["sw2"]
+        uuid = "LINK-UUID-{0}".format(self.links.index(link) + 1)
+        return {
+            "link-uuid": uuid,
+            "templateName": "int_intra_fabric_num_link",
+            "fabricName": self.fabric,
+            "sw1-info": {
+                "fabric-name": self.fabric,
+                "if-name": link["if1"],
+                "sw-sys-name": sw1["logicalName"],
+                "sw-serial-number": sw1["serialNumber"],
+            },
+            "sw2-info": {
+                "fabric-name": self.fabric,
+                "if-name": link["if2"],
+                "sw-sys-name": sw2["logicalName"],
+                "sw-serial-number": sw2["serialNumber"],
+            },
+            "nvPairs": {
+                "FABRIC1": self.fabric,
+                "FABRIC2": self.fabric,
+                "PEER1_SN": sw1["serialNumber"],
+                "PEER2_SN": sw2["serialNumber"],
+                "PEER1_INTF": link["if1"],
+                "PEER2_INTF": link["if2"],
+                "PEER1_IP": link["ip1"],
+                "PEER2_IP": link["ip2"],
+                "PEER1_DESC": "",
+                "PEER2_DESC": "",
+                "PEER1_CONF": "",
+                "PEER2_CONF": "",
+                "PEER1_BFD_ECHO_DISABLE": "false",
+                "PEER2_BFD_ECHO_DISABLE": "false",
+                "ENABLE_MACSEC": "false",
+                "ADMIN_STATE": "true",
+                "MTU": "9216",
+                "PRIORITY": "500",
+                "LINK_UUID": uuid,
+            },
+        }
+
+    def link_objects(self, sw1=None, sw2=None, if1=None, if2=None):
+
+        data = []
+        for link in self.links:
+            if sw1 is not None and link["sw1"]["serialNumber"] != sw1:
+                continue
+            if sw2 is not None and link["sw2"]["serialNumber"] != sw2:
+                continue
+            if if1 is not None and link["if1"] != if1:
+                continue
+            if if2 is not None and link["if2"] != if2:
+                continue
+            data.append(self.link_object(link))
+        return data
+
+    # -------------------------- PLAYBOOK CONFIGS --------------------------
+
+    def intf_config(self, count=None, description="updated host port"):
+
+        """
+        Returns:
+            list: dcnm_interface config for trunk host ports on the first 'count' ethernet
+                  interfaces of every leaf. All ports get a new description.
+        """
+
+        count = self.num_eth if count is None else count
+        config = []
+        for sw in self.leafs():
+            for port in range(1, count + 1):
+                config.append(
+                    {
+                        "name": "eth1/{0}".format(port),
+                        "type": "eth",
+                        "switch": [sw["ipAddress"]],
+                        "deploy": True,
+                        "profile": {
+                            "admin_state": True,
+                            "mode": "trunk",
+                            "speed": "Auto",
+                            "bpdu_guard": "true",
+                            "port_type_fast": True,
+                            "mtu": "jumbo",
+                            "allowed_vlans": "none",
+                            "cmds": ["no shutdown"],
+                            "description": description,
+                        },
+                    }
+                )
+        return config
+
+    def vrf_config(self, new_vrfs=1):
+
+        """
+        Returns:
+            list: dcnm_vrf config for all existing VRFs, attached to all leaf and border
+                  switches, followed by 'new_vrfs' VRFs which do not exist yet
+        """
+
+        config = []
+        for index, vrf in enumerate(self.vrfs + self._new_vrfs(new_vrfs)):
+            attach = []
+            for sw in self.attached_switches():
+                att = {"ip_address": sw["ipAddress"], "deploy": True}
+                if sw["switchRole"] == "border" and index < len(self.vrfs):
+                    att["vrf_lite"] = [
+                        {
+                            "interface": "Ethernet1/{0}".format(self.num_eth + 1),
+                            "dot1q": vrf["vlanId"],
+                        }
+                    ]
+                attach.append(att)
+            config.append(
+                {
+                    "vrf_name": vrf["vrfName"],
+                    "vrf_id": vrf["vrfId"],
+                    "vlan_id": vrf["vlanId"],
+                    "vrf_template": "Default_VRF_Universal",
+                    "vrf_extension_template": "Default_VRF_Extension_Universal",
+                    "attach": attach,
+                    "deploy": True,
+                }
+            )
+        return config
+
+    def _new_vrfs(self, count):
+
+        return [
+            {
+                "vrfName": "scale-vrf-new-{0}".format(index + 1),
+                "vrfId": 60000 + index + 1,
+                "vlanId": 3000 + index + 1,
+            }
+            for index in range(count)
+        ]
+
+    def network_config(self, new_networks=1):
+
+        """
+        Returns:
+            list: dcnm_network config for all existing networks, attached to all leaf and
+                  border switches, followed by 'new_networks' networks which do not exist yet
+        """
+
+        new = [
+            {
+                "networkName": "scale-net-new-{0}".format(index + 1),
+                "networkId": 40000 + index + 1,
+                "vlanId": 3500 + index + 1,
+                "vrf": self.vrfs[0]["vrfName"],
+                "gatewayIpAddress": "192.168.{0}.1/24".format(index % 256),
+            }
+            for index in range(new_networks)
+        ]
+
+        config = []
+        for net in self.networks + new:
+            config.append(
+                {
+                    "net_name": net["networkName"],
+                    "vrf_name": net["vrf"],
+                    "net_id": net["networkId"],
+                    "vlan_id": net["vlanId"],
+                    "gw_ip_subnet": net["gatewayIpAddress"],
+                    "net_template": "Default_Network_Universal",
+                    "net_extension_template": "Default_Network_Extension_Universal",
+                    "attach": [
+                        {
+                            "ip_address": sw["ipAddress"],
+                            "ports": ["Ethernet1/1", "Ethernet1/2"],
+                            "deploy": True,
+                        }
+                        for sw in self.attached_switches()
+                    ],
+                    "deploy": True,
+                }
+            )
+        return config
+
+    def policy_config(self, new_policies=1):
+
+        """
+        Returns:
+            list: dcnm_policy config with all existing templates and 'new_policies' new ones
+                  applied to every switch
+        """
+
+        config = [
+            {"name": "scale_template_{0}".format(pol + 1), "priority": 500}
+            for pol in range(self.num_policies + new_policies)
+        ]
+        config.append({"switch": [{"ip": sw["ipAddress"]} for sw in self.switches]})
+        return config
+
+    def rm_config(self):
+
+        """
+        Returns:
+            list: dcnm_resource_manager config for the loopback IDs of every switch
+        """
+
+        return [
+            {
+                "entity_name": "loopback{0}".format(lo_id),
+                "pool_type": "ID",
+                "pool_name": "LOOPBACK_ID",
+                "scope_type": "device",
+                "resource": str(lo_id),
+                "switch": [sw["ipAddress"] for sw in self.switches],
+            }
+            for lo_id in (0, 1)
+        ]
+
+    def links_config(self):
+
+        """
+        Returns:
+            list: dcnm_links config for all spine uplinks with a new MTU
+        """
+
+        return [
+            {
+                "dst_fabric": self.fabric,
+                "src_interface": link["if1"],
+                "dst_interface": link["if2"],
+                "src_device": link["sw1"]["ipAddress"],
+                "dst_device": link["sw2"]["ipAddress"],
+                "template": "int_intra_fabric_num_link",
+                "profile": {
+                    "peer1_ipv4_addr": link["ip1"],
+                    "peer2_ipv4_addr": link["ip2"],
+                    "admin_state": True,
+                    "mtu": 9100,
+                    "peer1_description": "",
+                    "peer2_description": "",
+                },
+            }
+            for link in self.links
+        ]
+
+
+class FakeController(object):
+
+    """
+    Serve controller requests from a FabricGenerator. Use send() in place of dcnm_send().
+    Requests are routed using the path tables of the module under test and every request is
+    counted, so that the number of requests per endpoint can be reported.
+
+    Parameters:
+        generator (FabricGenerator): the fabric to serve
+        module: the module under test (e.g. plugins.modules.dcnm_vrf)
+        version (int): controller version
+    """
+
+    def __init__(self, generator, module, version=12):
+
+        self.gen = generator
+        self.version = version
+        self.endpoints = get_endpoint_templates(module)
+        self.calls = Counter()
+        self.next_id = 70000
+
+        self.handlers = {
+            "FABRIC_ACCESS_MODE": self._access_mode,
+            "VPC_SNO": self._vpc_sno,
+            "IF_WITH_SNO_IFNAME": self._interface,
+            "IF_DETAIL_WITH_SNO": self._interface_detail,
+            "GET_VRF": self._vrfs,
+            "GET_VRF_ATTACH": self._vrf_attach,
+            "GET_VRF_SWITCH": self._vrf_switch,
+            "GET_VRF_ID": self._segment_id,
+            "GET_VRF_NET": self._vrf_networks,
+            "GET_NET": self._networks,
+            "GET_NET_ATTACH": self._net_attach,
+            "GET_NET_ID": self._segment_id,
+            "GET_NET_NAME": self._network,
+            "GET_VLAN": self._vlan,
+            "POLICY_GET_SWITCHES": self._policies,
+            "RM_GET_RESOURCES_BY_SNO_AND_POOLNAME": self._resources,
+            "LINKS_GET_BY_SWITCH_PAIR": self._links,
+            "LINKS_GET_BY_FABRIC": self._links,
+            # Shares its path with LINKS_GET_BY_SWITCH_PAIR
+            "LINKS_CREATE": self._links,
+        }
+
+    def endpoint(self, path):
+
+        name = get_endpoint(path, self.endpoints)
+        if name not in self.handlers:
+            # Some modules append the query string to a path template without one
+            name = get_endpoint(path.split("?")[0], self.endpoints)
+        return name
+
+    def send(self, module, method, path, data=None, data_type="json"):
+
+        name = self.endpoint(path)
+        self.calls[(method, name)] += 1
+
+        if method != "GET":
+            return self.gen.response([], method=method)
+
+        handler = self.handlers.get(name)
+        if handler is None:
+            return self.gen.response([], code=404, message="Not Found")
+
+        url = urlsplit(path)
+        query = dict((k, v[0]) for k, v in parse_qs(url.query).items())
+        return self.gen.response(handler(url.path.split("/"), query))
+
+    def _access_mode(self, segments, query):
+        return {"readonly": "False"}
+
+    def _vpc_sno(self, segments, query):
+        return {"vpc_pair_sn": self.gen.vpc_pair_serial(query.get("serial_number"))}
+
+    def _interface(self, segments, query):
+        intf = self.gen.interface(query.get("serialNumber"), query.get("ifName", ""), self.version)
+        return [intf] if intf else []
+
+    def _interface_detail(self, segments, query):
+        return self.gen.interface_details(query.get("serialNumber"))
+
+    def _vrfs(self, segments, query):
+        return self.gen.vrf_objects()
+
+    def _vrf_attach(self, segments, query):
+        return self.gen.vrf_attachments(query.get("vrf-names", "").split(","))
+
+    def _vrf_switch(self, segments, query):
+        return self.gen.vrf_switch_details(
+            query.get("vrf-names", "").split(","),
+            query.get("serial-numbers", "").split(","),
+        )
+
+    def _segment_id(self, segments, query):
+        self.next_id += 1
+        return {
+            "l3vni": self.next_id,
+            "partitionSegmentId": self.next_id,
+            "l2vni": self.next_id,
+            "segmentId": self.next_id,
+        }
+
+    def _vrf_networks(self, segments, query):
+        return self.gen.network_objects(query.get("vrf-name"))
+
+    def _networks(self, segments, query):
+        return self.gen.network_objects()
+
+    def _net_attach(self, segments, query):
+        return self.gen.network_attachments(query.get("network-names", "").split(","))
+
+    def _network(self, segments, query):
+        nets = [net for net in self.gen.network_objects() if net["networkName"] == segments[-1]]
+        return nets[0] if nets else []
+
+    def _vlan(self, segments, query):
+        return "3900"
+
+    def _policies(self, segments, query):
+        return self.gen.policies(query.get("serialNumber", "").split(","))
+
+    def _resources(self, segments, query):
+        # .../resource-manager/switch/{sno}/pools/{pool}
+        return self.gen.resources(segments[-3], segments[-1])
+
+    def _links(self, segments, query):
+        return self.gen.link_objects(
+            query.get("switch1Sn"),
+            query.get("switch2Sn"),
+            query.get("switch1IfName"),
+            query.get("switch2IfName"),
+        )
@@ -22,7 +22,12 @@ from unittest.mock import patch
 # from units.compat.mock import patch
 
 from ansible_collections.cisco.dcnm.plugins.modules import dcnm_interface
-from .dcnm_module import TestDcnmModule, set_module_args, loadPlaybookData
+from .dcnm_module import (
+    TestDcnmModule,
+    set_module_args,
+    loadPlaybookData,
+    api_call_budget,
+)
 
 import json
 import copy
@@ -81,6 +86,13 @@ class TestDcnmIntfModule(TestDcnmModule):
 
     def load_multi_intf_fixtures(self):
 
+        if "_shared_profile_merged" in self._testMethodName:
+            # No I/F exists case
+            self.run_dcnm_send.side_effect = [
+                self.mock_monitor_false_resp,
+                self.playbook_mock_vpc_resp,
+            ] + [[]] * 8
+
         if "_multi_intf_merged_new" in self._testMethodName:
             # No I/F exists case
             playbook_pc_intf = []
@@ -98,7 +110,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_pc_intf,
                 playbook_vpc_intf,
                 playbook_subint_intf,
@@ -140,7 +151,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_pc_intf,
                 playbook_vpc_intf,
                 playbook_subint_intf,
@@ -184,7 +194,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_pc_intf1,
                 playbook_pc_intf2,
                 playbook_vpc_intf,
@@ -228,7 +237,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_pc_intf,
                 playbook_eth_intf,
                 playbook_vpc_intf,
@@ -277,7 +285,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_pc_intf1,
                 playbook_pc_intf2,
                 playbook_pc_intf3,
@@ -322,7 +329,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_intf,
                 playbook_have_all_data,
                 self.playbook_mock_succ_resp,
@@ -401,6 +407,61 @@ class TestDcnmIntfModule(TestDcnmModule):
 
     def load_query_state_fixtures(self):
 
+        if "_query_fetch_switch" in self._testMethodName:
+            # Details of all the interfaces on the switch returned by a single GET
+            playbook_sw_detail = {
+                "RETURN_CODE": 200,
+                "MESSAGE": "OK",
+                "METHOD": "GET",
+                "DATA": [
+                    {
+                        "ifName": ifname,
+                        "serialNo": "FOX1821H035~SAL1819SAN8"
+                        if ifname.startswith("vPC")
+                        else "SAL1819SAN8",
+                        "fabricName": "test_fabric",
+                        "complianceStatus": "In-Sync",
+                    }
+                    for ifname in [
+                        "port-channel150",
+                        "vlan1001",
+                        "Ethernet1/10",
+                        "port-channel350",
+                        "loopback450",
+                        "Ethernet1/1",
+                        "Ethernet1/15.2",
+                        "vPC750",
+                    ]
+                ],
+            }
+
+            # Policies of all the interfaces on the switch returned by a single GET
+            playbook_sw_intf = {
+                "RETURN_CODE": 200,
+                "MESSAGE": "OK",
+                "METHOD": "GET",
+                "DATA": [
+                    elem
+                    for key in [
+                        "st_fex_payload",
+                        "svi_payload",
+                        "pc_payload",
+                        "lo_payload",
+                        "eth_payload",
+                        "subint_payload",
+                        "vpc_payload",
+                    ]
+                    for elem in self.payloads_data.get(key)["DATA"]
+                ],
+            }
+
+            self.run_dcnm_send.side_effect = [
+                self.playbook_mock_vpc_resp,
+                playbook_sw_detail,
+                playbook_sw_intf,
+            ]
+            return
+
         if "_query" in self._testMethodName:
             playbook_all_intf = self.payloads_data.get("all_payload")
             playbook_pc_intf = self.payloads_data.get("pc_payload")
@@ -529,6 +590,7 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
             ]
 
         if "_svi_overridden_existing" in self._testMethodName:
@@ -581,6 +643,7 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
             ]
 
         if "_aa_fex_merged_idempotent" in self._testMethodName:
@@ -613,6 +676,7 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
             ]
 
         if "_aa_fex_merged_multi" in self._testMethodName:
@@ -626,7 +690,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_aa_fex_intf1,
                 playbook_aa_fex_intf2,
                 playbook_have_all_data,
@@ -681,6 +744,7 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
             ]
 
         if "_aa_fex_overridden_existing" in self._testMethodName:
@@ -764,6 +828,7 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
             ]
 
         if "_st_fex_merged_idempotent" in self._testMethodName:
@@ -796,6 +861,7 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
             ]
 
         if "_st_fex_merged_multi" in self._testMethodName:
@@ -809,7 +875,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_st_fex_intf1,
                 playbook_st_fex_intf2,
                 playbook_have_all_data,
@@ -863,6 +928,7 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
             ]
 
         if "_st_fex_overridden_existing" in self._testMethodName:
@@ -1204,6 +1270,38 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
             ]
 
+        if "_pc_switch_batch_overridden" in self._testMethodName:
+
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+
+            # Split the interfaces into a response per switch. The vPC is returned for the first
+            # switch and the rest of the interfaces for the second one.
+            playbook_have_all_vpc = copy.deepcopy(playbook_have_all_data)
+            playbook_have_all_vpc["DATA"] = [
+                intf
+                for intf in playbook_have_all_data["DATA"]
+                if intf["ifType"] == "INTERFACE_VPC"
+            ]
+            playbook_have_all_sw = copy.deepcopy(playbook_have_all_data)
+            playbook_have_all_sw["DATA"] = [
+                intf
+                for intf in playbook_have_all_data["DATA"]
+                if intf["ifType"] != "INTERFACE_VPC"
+            ]
+
+            self.run_dcnm_send.side_effect = (
+                [
+                    self.mock_monitor_false_resp,
+                    playbook_have_all_vpc,
+                    self.playbook_mock_succ_resp,
+                    self.playbook_mock_succ_resp,
+                    playbook_have_all_sw,
+                ]
+                + [self.playbook_mock_succ_resp] * 20
+            )
+
     # -------------------------- ETH-FIXTURES --------------------------
 
     def load_eth_fixtures(self):
@@ -1237,6 +1335,7 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
+                playbook_deployed_data,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
@@ -1245,9 +1344,183 @@ class TestDcnmIntfModule(TestDcnmModule):
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
                 self.playbook_mock_succ_resp,
-                playbook_deployed_data,
             ]
 
+        if "_eth_partial_sync_merged_new" in self._testMethodName:
+            # No I/F exists case. Some of the deployed interfaces are not 'In-Sync' after deploy
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+            playbook_deployed_data = copy.deepcopy(
+                self.have_all_payloads_data.get("deployed_payloads")
+            )
+            for have in playbook_deployed_data["DATA"]:
+                if have["ifName"] == "Ethernet1/30":
+                    have["complianceStatus"] = "Pending"
+                if have["ifName"] == "Ethernet1/31":
+                    have["complianceStatus"] = "Out-of-Sync"
+
+            self.run_dcnm_send.side_effect = (
+                [self.mock_monitor_false_resp, self.playbook_mock_vpc_resp]
+                + [[]] * 5
+                + [playbook_have_all_data]
+                + [self.playbook_mock_succ_resp] * 6
+                + [playbook_deployed_data]
+                + [self.playbook_mock_succ_resp]
+            )
+
+        if "_eth_check_deploy_merged_new" in self._testMethodName:
+            # No I/F exists case. Deployment status is checked after deploy
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+            playbook_deployed_data = self.have_all_payloads_data.get(
+                "deployed_payloads"
+            )
+
+            self.run_dcnm_send.side_effect = (
+                [self.mock_monitor_false_resp, self.playbook_mock_vpc_resp]
+                + [[]] * 5
+                + [playbook_have_all_data]
+                + [self.playbook_mock_succ_resp] * 6
+                + [playbook_deployed_data]
+            )
+
+        if "_eth_check_deploy_timeout_merged_new" in self._testMethodName:
+            # No I/F exists case. Interfaces never reach 'In-Sync' state after deploy
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+            playbook_out_of_sync_data = copy.deepcopy(
+                self.have_all_payloads_data.get("deployed_payloads")
+            )
+            for have in playbook_out_of_sync_data["DATA"]:
+                have["complianceStatus"] = "Out-of-Sync"
+
+            self.run_dcnm_send.side_effect = (
+                [self.mock_monitor_false_resp, self.playbook_mock_vpc_resp]
+                + [[]] * 5
+                + [playbook_have_all_data]
+                + [self.playbook_mock_succ_resp] * 6
+                + [playbook_out_of_sync_data]
+                + [self.playbook_mock_succ_resp]
+                + [playbook_out_of_sync_data] * 9
+                + [self.playbook_mock_succ_resp]
+                + [playbook_out_of_sync_data] * 10
+                + [self.playbook_mock_succ_resp]
+                + [playbook_out_of_sync_data] * 40
+            )
+
+        if "_eth_check_deploy_straggler_merged_new" in self._testMethodName:
+            # No I/F exists case. Ethernet1/30 reaches 'In-Sync' state after 15 polls and Ethernet1/31 never
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+            playbook_out_of_sync_data = copy.deepcopy(
+                self.have_all_payloads_data.get("deployed_payloads")
+            )
+            for have in playbook_out_of_sync_data["DATA"]:
+                have["complianceStatus"] = "Out-of-Sync"
+            playbook_straggler_data = copy.deepcopy(playbook_out_of_sync_data)
+            for have in playbook_straggler_data["DATA"]:
+                if have["ifName"] == "Ethernet1/30":
+                    have["complianceStatus"] = "In-Sync"
+
+            self.run_dcnm_send.side_effect = (
+                [self.mock_monitor_false_resp, self.playbook_mock_vpc_resp]
+                + [[]] * 5
+                + [playbook_have_all_data]
+                + [self.playbook_mock_succ_resp] * 6
+                + [playbook_out_of_sync_data]
+                + [self.playbook_mock_succ_resp]
+                + [playbook_out_of_sync_data] * 9
+                + [self.playbook_mock_succ_resp]
+                + [playbook_out_of_sync_data] * 5
+                + [playbook_straggler_data] * 5
+                + [self.playbook_mock_succ_resp]
+                + [playbook_straggler_data] * 40
+            )
+
+        if "_eth_check_deploy_out_of_sync_merged_new" in self._testMethodName:
+            # No I/F exists case. Interfaces remain 'Out-of-Sync' for a while after deploy
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+            playbook_deployed_data = self.have_all_payloads_data.get(
+                "deployed_payloads"
+            )
+            playbook_out_of_sync_data = copy.deepcopy(playbook_deployed_data)
+            for have in playbook_out_of_sync_data["DATA"]:
+                have["complianceStatus"] = "Out-of-Sync"
+
+            self.run_dcnm_send.side_effect = (
+                [self.mock_monitor_false_resp, self.playbook_mock_vpc_resp]
+                + [[]] * 5
+                + [playbook_have_all_data]
+                + [self.playbook_mock_succ_resp] * 6
+                + [playbook_out_of_sync_data]
+                + [self.playbook_mock_succ_resp]
+                + [playbook_out_of_sync_data] * 9
+                + [self.playbook_mock_succ_resp]
+                + [playbook_deployed_data]
+            )
+
+        if "_eth_batch_merged_new" in self._testMethodName:
+            # No I/F exists case. Five interfaces with the same policy sent in chunks of two
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+
+            self.run_dcnm_send.side_effect = (
+                [self.mock_monitor_false_resp, self.playbook_mock_vpc_resp]
+                + [[]] * 5
+                + [playbook_have_all_data]
+                + [self.playbook_mock_succ_resp] * 5
+            )
+
+        if "_eth_batch_fallback_merged_new" in self._testMethodName:
+            # No I/F exists case. First chunk fails and the interfaces in it are sent one at a time
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+            playbook_fail_resp = copy.deepcopy(self.playbook_mock_succ_resp)
+            playbook_fail_resp["RETURN_CODE"] = 500
+            playbook_fail_resp["MESSAGE"] = "Internal Server Error"
+
+            self.run_dcnm_send.side_effect = (
+                [self.mock_monitor_false_resp, self.playbook_mock_vpc_resp]
+                + [[]] * 5
+                + [playbook_have_all_data]
+                + [playbook_fail_resp]
+                + [[]]
+                + [self.playbook_mock_succ_resp]
+                + [playbook_fail_resp]
+            )
+
+        if "_eth_batch_created_merged_new" in self._testMethodName:
+            # No I/F exists case. First chunk fails after creating one of its interfaces
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+            playbook_fail_resp = copy.deepcopy(self.playbook_mock_succ_resp)
+            playbook_fail_resp["RETURN_CODE"] = 500
+            playbook_fail_resp["MESSAGE"] = "Internal Server Error"
+            playbook_created_data = {
+                "RETURN_CODE": 200,
+                "MESSAGE": "OK",
+                "METHOD": "GET",
+                "DATA": [{"ifName": "Ethernet1/30", "serialNo": "SAL1819SAN8"}],
+            }
+
+            self.run_dcnm_send.side_effect = (
+                [self.mock_monitor_false_resp, self.playbook_mock_vpc_resp]
+                + [[]] * 5
+                + [playbook_have_all_data]
+                + [playbook_fail_resp]
+                + [playbook_created_data]
+                + [self.playbook_mock_succ_resp] * 3
+            )
+
         if "_eth_merged_existing" in self._testMethodName:
             # No I/F exists case
             playbook_eth_intf1 = self.payloads_data.get(
@@ -1458,6 +1731,56 @@ class TestDcnmIntfModule(TestDcnmModule):
                 playbook_deployed_data,
             ]
 
+        if "_eth_fetch_switch_merged_new" in self._testMethodName:
+            # No I/F exists case. A single GET returns all the interfaces on the switch
+            playbook_eth_intf = {"RETURN_CODE": 200, "MESSAGE": "OK", "DATA": []}
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+            playbook_deployed_data = self.have_all_payloads_data.get(
+                "deployed_payloads"
+            )
+
+            self.run_dcnm_send.side_effect = [
+                self.mock_monitor_false_resp,
+                self.playbook_mock_vpc_resp,
+                playbook_eth_intf,
+                playbook_have_all_data,
+                self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
+                self.playbook_mock_succ_resp,
+                playbook_deployed_data,
+            ]
+
+        if "_eth_fetch_switch_merged_idempotent" in self._testMethodName:
+
+            playbook_eth_intf = copy.deepcopy(
+                self.payloads_data.get("eth_merged_trunk_payloads")
+            )
+            for key in [
+                "eth_merged_access_payloads",
+                "eth_merged_routed_payloads",
+                "eth_merged_epl_routed_payloads",
+                "eth_merged_monitor_payloads",
+            ]:
+                playbook_eth_intf["DATA"].extend(
+                    self.payloads_data.get(key)["DATA"]
+                )
+            playbook_have_all_data = self.have_all_payloads_data.get(
+                "payloads"
+            )
+
+            self.run_dcnm_send.side_effect = [
+                self.mock_monitor_false_resp,
+                self.playbook_mock_vpc_resp,
+                playbook_eth_intf,
+                playbook_have_all_data,
+                playbook_have_all_data,
+            ]
+
     # -------------------------- SUBINT-FIXTURES --------------------------
 
     def load_subint_fixtures(self):
@@ -1922,7 +2245,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_vpc_intf1,
                 playbook_vpc_intf2,
                 playbook_have_all_data,
@@ -1956,7 +2278,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_vpc_intf1,
                 playbook_vpc_intf2,
                 playbook_have_all_data,
@@ -1990,7 +2311,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_vpc_intf1,
                 playbook_vpc_intf2,
                 self.playbook_mock_succ_resp,
@@ -2021,7 +2341,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_vpc_intf1,
                 playbook_vpc_intf2,
                 playbook_have_all_data,
@@ -2056,7 +2375,6 @@ class TestDcnmIntfModule(TestDcnmModule):
             self.run_dcnm_send.side_effect = [
                 self.mock_monitor_false_resp,
                 self.playbook_mock_vpc_resp,
-                self.playbook_mock_vpc_resp,
                 playbook_vpc_intf1,
                 playbook_have_all_data,
                 self.playbook_mock_succ_resp,
@@ -2133,6 +2451,7 @@ class TestDcnmIntfModule(TestDcnmModule):
 
     # -------------------------- GEN-INTF --------------------------
 
+    @api_call_budget(GET=12, POST=7)
     def test_dcnm_intf_multi_intf_merged_new(self):
 
         # load the json from playbooks
@@ -2279,6 +2598,63 @@ class TestDcnmIntfModule(TestDcnmModule):
                     True,
                 )
 
+    @api_call_budget(GET=10, POST=0)
+    def test_dcnm_intf_check_shared_profile_merged(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_multi_intf_configs")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+        self.payloads_data = []
+
+        # load required config data
+        self.playbook_config = self.config_data.get("multi_intf_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+
+        # Port-channels and vPCs sharing the same profile. The PCIDs of the first two vPCs are
+        # derived from their names and the last one has the PCIDs included in the profile
+        pc = self.playbook_config[0]
+        vpc = self.playbook_config[1]
+        config = []
+        for name in ["po300", "po301", "po302"]:
+            config.append(dict(pc, name=name))
+        for name, pcid in [("vpc301", None), ("vpc302", None), ("vpc303", 55)]:
+            profile = dict(vpc["profile"])
+            profile.pop("peer1_pcid")
+            profile.pop("peer2_pcid")
+            if pcid is not None:
+                profile.update(peer1_pcid=pcid, peer2_pcid=pcid)
+            config.append(dict(vpc, name=name, profile=profile))
+
+        set_module_args(
+            dict(
+                state="merged",
+                _ansible_check_mode=True,
+                fabric="test_fabric",
+                config=config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=False)
+
+        nvpairs = {}
+        for d in result["diff"][0]["merged"]:
+            for intf in d["interfaces"]:
+                nvpairs[intf["ifName"]] = intf["nvPairs"]
+
+        self.assertEqual(len(nvpairs), 6)
+        for name in ["Port-channel300", "Port-channel301", "Port-channel302"]:
+            self.assertEqual(nvpairs[name]["PO_ID"], name)
+            self.assertEqual(nvpairs[name]["MEMBER_INTERFACES"], "e1/9")
+        for name, pcid in [("vPC301", "301"), ("vPC302", "302"), ("vPC303", "55")]:
+            self.assertEqual(nvpairs[name]["PEER1_PCID"], pcid)
+            self.assertEqual(nvpairs[name]["PEER2_PCID"], pcid)
+
     def test_dcnm_intf_check_multi_intf_merged_new(self):
 
         # load the json from playbooks
@@ -2659,21 +3035,17 @@ class TestDcnmIntfModule(TestDcnmModule):
                     (intf["ifName"].lower() in ovr_if_names), True
                 )
 
-    # -------------------------- ETH --------------------------
-
-    def test_dcnm_intf_eth_merged_existing(self):
+    def test_dcnm_intf_pc_overridden_existing_delete_order(self):
 
         # load the json from playbooks
-        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
-        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.config_data = loadPlaybookData("dcnm_intf_pc_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_pc_payloads")
         self.have_all_payloads_data = loadPlaybookData(
             "dcnm_intf_have_all_payloads"
         )
 
         # load required config data
-        self.playbook_config = self.config_data.get(
-            "eth_merged_config_existing"
-        )
+        self.playbook_config = self.config_data.get("pc_overridden_config")
         self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
         self.mock_ip_sn = self.config_data.get("mock_ip_sn")
         self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
@@ -2683,28 +3055,41 @@ class TestDcnmIntfModule(TestDcnmModule):
 
         set_module_args(
             dict(
-                state="merged",
+                state="overridden",
                 fabric="test_fabric",
+                max_workers=4,
                 config=self.playbook_config,
             )
         )
         result = self.execute_module(changed=True, failed=False)
-        self.assertEqual(len(result["diff"][0]["merged"]), 1)
-        for d in result["diff"][0]["merged"]:
-            for intf in d["interfaces"]:
-                self.assertEqual((intf["ifName"] in ["Ethernet1/2"]), True)
 
-    def test_dcnm_intf_eth_merged_new(self):
+        self.assertEqual(len(result["diff"][0]["deleted"]), 7)
+
+        # Port-channels must be deleted and deployed only after the vPCs and sub-interfaces
+        for method in ["DELETE", "POST"]:
+            sent = [
+                [intf["ifName"] for intf in json.loads(call[0][3])]
+                for call in self.run_dcnm_send.call_args_list
+                if call[0][1] == method
+                and (method == "DELETE" or call[0][2].endswith("/deploy"))
+            ]
+            pc_index = sent.index(
+                ["port-channel301", "port-channel302", "port-channel303"]
+            )
+            self.assertIn(["vPC300"], sent[:pc_index])
+            self.assertIn(["Ethernet1/3.2"], sent[:pc_index])
+
+    def test_dcnm_intf_pc_overridden_existing_sequential_delete_order(self):
 
         # load the json from playbooks
-        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
-        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.config_data = loadPlaybookData("dcnm_intf_pc_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_pc_payloads")
         self.have_all_payloads_data = loadPlaybookData(
             "dcnm_intf_have_all_payloads"
         )
 
         # load required config data
-        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_config = self.config_data.get("pc_overridden_config")
         self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
         self.mock_ip_sn = self.config_data.get("mock_ip_sn")
         self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
@@ -2714,40 +3099,40 @@ class TestDcnmIntfModule(TestDcnmModule):
 
         set_module_args(
             dict(
-                state="merged",
+                state="overridden",
                 fabric="test_fabric",
                 config=self.playbook_config,
             )
         )
         result = self.execute_module(changed=True, failed=False)
-        self.assertEqual(len(result["diff"][0]["merged"]), 5)
-        for d in result["diff"][0]["merged"]:
-            for intf in d["interfaces"]:
-                self.assertEqual(
-                    (
-                        intf["ifName"]
-                        in [
-                            "Ethernet1/30",
-                            "Ethernet1/31",
-                            "Ethernet1/32",
-                            "Ethernet1/33",
-                            "Ethernet1/34",
-                        ]
-                    ),
-                    True,
-                )
 
-    def test_dcnm_intf_eth_merged_idempotent(self):
+        self.assertEqual(len(result["diff"][0]["deleted"]), 7)
+
+        # With a single worker the interfaces are deleted one type at a time, port-channels first
+        sent = [
+            [intf["ifName"] for intf in json.loads(call[0][3])]
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][1] == "DELETE"
+        ]
+        self.assertEqual(
+            sent[:3],
+            [
+                ["port-channel301", "port-channel302", "port-channel303"],
+                ["vPC300"],
+                ["Ethernet1/3.2"],
+            ],
+        )
+
+    def test_dcnm_intf_pc_switch_batch_overridden_all(self):
 
         # load the json from playbooks
-        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
-        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.config_data = loadPlaybookData("dcnm_intf_pc_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_pc_payloads")
         self.have_all_payloads_data = loadPlaybookData(
             "dcnm_intf_have_all_payloads"
         )
 
         # load required config data
-        self.playbook_config = self.config_data.get("eth_merged_config")
         self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
         self.mock_ip_sn = self.config_data.get("mock_ip_sn")
         self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
@@ -2755,30 +3140,56 @@ class TestDcnmIntfModule(TestDcnmModule):
         self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
         self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
 
-        for cfg in self.playbook_config:
-            cfg["deploy"] = "False"
-
         set_module_args(
             dict(
-                state="merged",
+                state="overridden",
                 fabric="test_fabric",
-                config=self.playbook_config,
+                switch_batch_size=1,
+                config=[],
             )
         )
-        result = self.execute_module(changed=False, failed=False)
-        self.assertEqual(len(result["diff"][0]["merged"]), 0)
+        result = self.execute_module(changed=True, failed=False)
 
-    def test_dcnm_intf_eth_replaced_existing(self):
+        del_if_names = [
+            "port-channel301",
+            "port-channel302",
+            "port-channel303",
+            "ethernet1/3.2",
+            "loopback200",
+            "vpc300",
+            "vlan2001",
+            "port-channel300",
+        ]
+        self.assertEqual(len(result["diff"][0]["deleted"]), 8)
+        for intf in result["diff"][0]["deleted"]:
+            self.assertEqual((intf["ifName"].lower() in del_if_names), True)
+
+        # The vPC of the first switch must be deleted before the interfaces of the second
+        # switch are read
+        calls = [call[0] for call in self.run_dcnm_send.call_args_list]
+        vpc_delete = [
+            index
+            for index, call in enumerate(calls)
+            if call[1] == "DELETE" and "vPC300" in call[3]
+        ]
+        have_all_gets = [
+            index
+            for index, call in enumerate(calls)
+            if call[1] == "GET" and "/interface/detail?" in call[2]
+        ]
+        self.assertEqual(len(have_all_gets), 2)
+        self.assertLess(vpc_delete[0], have_all_gets[1])
+
+    def test_dcnm_intf_pc_switch_batch_overridden_release(self):
 
         # load the json from playbooks
-        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
-        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.config_data = loadPlaybookData("dcnm_intf_pc_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_pc_payloads")
         self.have_all_payloads_data = loadPlaybookData(
             "dcnm_intf_have_all_payloads"
         )
 
         # load required config data
-        self.playbook_config = self.config_data.get("eth_replaced_config")
         self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
         self.mock_ip_sn = self.config_data.get("mock_ip_sn")
         self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
@@ -2788,7 +3199,733 @@ class TestDcnmIntfModule(TestDcnmModule):
 
         set_module_args(
             dict(
-                state="replaced",
+                state="overridden",
+                fabric="test_fabric",
+                switch_batch_size=1,
+                config=[],
+            )
+        )
+
+        # Record the state left over from the earlier batches whenever the interfaces of a switch are read
+        states = []
+        instances = []
+        get_have_all = dcnm_interface.DcnmIntf.dcnm_intf_get_have_all
+
+        def record_state(intf, sw):
+            instances.append(intf)
+            states.append(
+                (
+                    len(intf.have_all),
+                    len(intf.diff_replace) + len(intf.diff_deploy),
+                    sum(len(d) for d in intf.diff_delete + intf.diff_delete_deploy),
+                )
+            )
+            return get_have_all(intf, sw)
+
+        with patch.object(
+            dcnm_interface.DcnmIntf,
+            "dcnm_intf_get_have_all",
+            autospec=True,
+            side_effect=record_state,
+        ):
+            result = self.execute_module(changed=True, failed=False)
+
+        self.assertEqual(states, [(0, 0, 0)] * len(states))
+
+        # Nothing is left over after the last batch either
+        intf = instances[-1]
+        self.assertEqual(intf.have_all, [])
+        self.assertEqual(intf.have_all_index, {})
+        self.assertEqual(intf.diff_replace + intf.diff_deploy, [])
+        self.assertFalse(any(intf.diff_delete) or any(intf.diff_delete_deploy))
+
+        # Only summaries of the changes and the responses are kept across the batches
+        self.assertEqual(len(result["diff"][0]["deleted"]), 8)
+        for entries in result["diff"][0].values():
+            for entry in entries:
+                self.assertTrue(
+                    set(entry) in [set(["ifName", "serialNumber"]), set(["Name"])]
+                )
+        self.assertTrue(result["response"])
+        for resp in result["response"]:
+            self.assertEqual(set(resp), set(["RETURN_CODE", "MESSAGE"]))
+
+    # -------------------------- ETH --------------------------
+
+    def test_dcnm_intf_eth_merged_existing(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get(
+            "eth_merged_config_existing"
+        )
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=True, failed=False)
+        self.assertEqual(len(result["diff"][0]["merged"]), 1)
+        for d in result["diff"][0]["merged"]:
+            for intf in d["interfaces"]:
+                self.assertEqual((intf["ifName"] in ["Ethernet1/2"]), True)
+
+    @api_call_budget(GET=9, POST=6)
+    def test_dcnm_intf_eth_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=True, failed=False)
+        self.assertEqual(len(result["diff"][0]["merged"]), 5)
+
+        # Deployed interfaces are already 'In-Sync'. So nothing is deployed again
+        self.assertEqual(result["redeployed"], 0)
+        for d in result["diff"][0]["merged"]:
+            for intf in d["interfaces"]:
+                self.assertEqual(
+                    (
+                        intf["ifName"]
+                        in [
+                            "Ethernet1/30",
+                            "Ethernet1/31",
+                            "Ethernet1/32",
+                            "Ethernet1/33",
+                            "Ethernet1/34",
+                        ]
+                    ),
+                    True,
+                )
+
+    def test_dcnm_intf_eth_merged_idempotent(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        for cfg in self.playbook_config:
+            cfg["deploy"] = "False"
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=False)
+        self.assertEqual(len(result["diff"][0]["merged"]), 0)
+
+    @api_call_budget(GET=0)
+    def test_dcnm_intf_eth_merged_new_budget_exceeded(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                config=self.playbook_config,
+            )
+        )
+
+        # The module makes GET requests, so a budget of no GETs must fail the test
+        with self.assertRaises(AssertionError) as exc:
+            self.execute_module(changed=True, failed=False)
+        self.assertIn("API call budget exceeded for GET", str(exc.exception))
+
+        # Budgets per endpoint and for all the requests are enforced the same way
+        for budget in [{("POST", "GLOBAL_IF_DEPLOY"): 0}, {"TOTAL": 1}]:
+            with self.assertRaises(AssertionError):
+                self.assertApiCallBudget(budget)
+
+        # A budget which is not exceeded passes
+        self.assertApiCallBudget({"DELETE": 0, ("POST", "GLOBAL_IF_DEPLOY"): 2})
+
+    @api_call_budget(
+        GET=9,
+        endpoints={("GET", "IF_DETAIL_WITH_SNO"): 2, ("POST", "GLOBAL_IF_DEPLOY"): 2},
+    )
+    def test_dcnm_intf_eth_partial_sync_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=True, failed=False)
+
+        # Ethernet1/30 and Ethernet1/31 are deployed. After the deploy Ethernet1/30 is 'Pending' and
+        # is left alone, while Ethernet1/31 is 'Out-of-Sync' and is the only one deployed again
+        deploys = [
+            json.loads(call[0][3])
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][1] == "POST" and call[0][2].endswith("/globalInterface/deploy")
+        ]
+        self.assertEqual(len(deploys), 2)
+        self.assertEqual(
+            sorted(item["ifName"] for item in deploys[0]),
+            ["Ethernet1/30", "Ethernet1/31"],
+        )
+        self.assertEqual(
+            deploys[1],
+            [
+                {
+                    "serialNumber": "SAL1819SAN8",
+                    "ifName": "Ethernet1/31",
+                    "fabricName": "test_fabric",
+                }
+            ],
+        )
+        self.assertEqual(result["redeployed"], 1)
+
+    @api_call_budget(
+        GET=5,
+        endpoints={("GET", "IF_WITH_SNO"): 1, ("GET", "IF_WITH_SNO_IFNAME"): 0},
+    )
+    def test_dcnm_intf_eth_fetch_switch_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                fetch_mode="switch",
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=True, failed=False)
+        self.assertEqual(len(result["diff"][0]["merged"]), 5)
+
+    @api_call_budget(
+        GET=5,
+        endpoints={("GET", "IF_WITH_SNO"): 1, ("GET", "IF_WITH_SNO_IFNAME"): 0},
+    )
+    def test_dcnm_intf_eth_fetch_switch_merged_idempotent(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        for cfg in self.playbook_config:
+            cfg["deploy"] = "False"
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                fetch_mode="switch",
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=False)
+        self.assertEqual(len(result["diff"][0]["merged"]), 0)
+
+    @api_call_budget(endpoints={("GET", "IF_DETAIL_WITH_SNO"): 2})
+    def test_dcnm_intf_eth_check_deploy_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                check_deploy=True,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=True, failed=False)
+        self.assertEqual(len(result["diff"][0]["merged"]), 5)
+        self.assertEqual(len(result["diff"][0]["deploy"]), 2)
+
+    @api_call_budget(
+        endpoints={
+            ("GET", "IF_DETAIL_WITH_SNO"): 12,
+            ("POST", "GLOBAL_IF_DEPLOY"): 3,
+        }
+    )
+    def test_dcnm_intf_eth_check_deploy_out_of_sync_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                check_deploy=True,
+                config=self.playbook_config,
+            )
+        )
+        with patch("time.sleep") as mock_sleep:
+            result = self.execute_module(changed=True, failed=False)
+
+        # Switch is polled once per interval for both the interfaces and the interfaces
+        # which are not 'In-Sync' are deployed again in a single request
+        self.assertEqual(mock_sleep.call_count, 10)
+        redeploy = [
+            json.loads(call[0][3])
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][1] == "POST" and call[0][2].endswith("/deploy")
+        ][-1]
+        self.assertEqual(
+            sorted(intf["ifName"] for intf in redeploy),
+            ["Ethernet1/30", "Ethernet1/31"],
+        )
+        self.assertEqual(len(result["diff"][0]["deploy"]), 2)
+        self.assertEqual(result["redeployed"], 2)
+
+    def test_dcnm_intf_eth_check_deploy_timeout_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                check_deploy=True,
+                config=self.playbook_config,
+            )
+        )
+        with patch("time.sleep") as mock_sleep:
+            result = self.execute_module(changed=False, failed=True)
+
+        # The first interface is given 60 polls, as when the interfaces were checked one at a time
+        self.assertEqual(mock_sleep.call_count, 59)
+        self.assertEqual(len(result["msg"]["PENDING"]), 2)
+
+    def test_dcnm_intf_eth_check_deploy_timeout_merged_new_deadline(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                check_deploy=True,
+                config=self.playbook_config,
+            )
+        )
+
+        # Every poll appears to take 100 seconds, so the 300 seconds allowed run out after 3 polls
+        with patch("time.sleep") as mock_sleep, patch.object(
+            dcnm_interface.time, "time", side_effect=[0, 100, 200, 300]
+        ):
+            result = self.execute_module(changed=False, failed=True)
+
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(len(result["msg"]["PENDING"]), 2)
+
+    def test_dcnm_intf_eth_check_deploy_straggler_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                check_deploy=True,
+                config=self.playbook_config,
+            )
+        )
+        with patch("time.sleep") as mock_sleep:
+            result = self.execute_module(changed=False, failed=True)
+
+        # Both the interfaces are charged every poll, so the check gives up after 60 polls in total
+        # rather than 60 more polls once Ethernet1/30 is 'In-Sync'
+        self.assertEqual(mock_sleep.call_count, 59)
+        self.assertEqual(
+            result["msg"]["PENDING"],
+            [{"ifName": "Ethernet1/31", "serialNumber": "SAL1819SAN8"}],
+        )
+
+        # Each interface is deployed again after 10 and 20 of its own polls
+        redeploys = [
+            sorted(intf["ifName"] for intf in json.loads(call[0][3]))
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][1] == "POST" and call[0][2].endswith("/deploy")
+        ][2:]
+        self.assertEqual(
+            redeploys, [["Ethernet1/30", "Ethernet1/31"], ["Ethernet1/31"]]
+        )
+
+    def test_dcnm_intf_eth_invalid_batch_size_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        for param, value in [("batch_size", -1), ("switch_batch_size", -1), ("max_workers", 0)]:
+            args = dict(state="merged", fabric="test_fabric", config=self.playbook_config)
+            args[param] = value
+            set_module_args(args)
+            result = self.execute_module(changed=False, failed=True)
+            self.assertEqual(
+                result["msg"],
+                "'{0}' must be at least {1}, given = '{2}'".format(
+                    param, 0 if value < 0 else 1, value
+                ),
+            )
+
+    @api_call_budget(endpoints={("POST", "GLOBAL_IF"): 3})
+    def test_dcnm_intf_eth_batch_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        # All the interfaces use the same 'trunk' policy
+        self.playbook_config = []
+        for num in range(30, 35):
+            cfg = copy.deepcopy(self.config_data.get("eth_merged_config")[0])
+            cfg["name"] = "eth1/" + str(num)
+            cfg["profile"]["ifname"] = "Ethernet1/" + str(num)
+            cfg["deploy"] = "False"
+            self.playbook_config.append(cfg)
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                batch_size=2,
+                max_workers=2,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=True, failed=False)
+
+        # Chunks are sent concurrently, so the order of the requests may vary
+        create = [
+            json.loads(call[0][3])
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][1] == "POST"
+        ]
+        self.assertEqual(sorted(len(p["interfaces"]) for p in create), [1, 2, 2])
+        self.assertEqual(len(result["diff"][0]["merged"]), 5)
+
+    @api_call_budget(endpoints={("POST", "GLOBAL_IF"): 3})
+    def test_dcnm_intf_eth_batch_fallback_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_merged_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        # All the interfaces use the same 'trunk' policy
+        self.playbook_config = []
+        for num in range(30, 35):
+            cfg = copy.deepcopy(self.config_data.get("eth_merged_config")[0])
+            cfg["name"] = "eth1/" + str(num)
+            cfg["profile"]["ifname"] = "Ethernet1/" + str(num)
+            cfg["deploy"] = "False"
+            self.playbook_config.append(cfg)
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                batch_size=2,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+
+        # The failing interface is reported
+        create = [
+            json.loads(call[0][3])
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][1] == "POST"
+        ]
+        self.assertEqual([len(p["interfaces"]) for p in create], [2, 1, 1])
+        self.assertEqual(create[2]["interfaces"][0]["ifName"], "Ethernet1/31")
+        self.assertEqual(result["msg"]["RETURN_CODE"], 500)
+
+        # The response for the failed chunk is reported along with the one for the interface
+        self.assertEqual(result["msg"]["CHUNK_RESPONSE"]["RETURN_CODE"], 500)
+
+    @api_call_budget(
+        endpoints={("POST", "GLOBAL_IF"): 4, ("GET", "IF_DETAIL_WITH_SNO"): 2}
+    )
+    def test_dcnm_intf_eth_batch_created_merged_new(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        # All the interfaces use the same 'trunk' policy
+        self.playbook_config = []
+        for num in range(30, 35):
+            cfg = copy.deepcopy(self.config_data.get("eth_merged_config")[0])
+            cfg["name"] = "eth1/" + str(num)
+            cfg["profile"]["ifname"] = "Ethernet1/" + str(num)
+            cfg["deploy"] = "False"
+            self.playbook_config.append(cfg)
+
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                batch_size=2,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=True, failed=False)
+
+        # Ethernet1/30 was created by the failed chunk, so only Ethernet1/31 is sent again
+        create = [
+            json.loads(call[0][3])
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][1] == "POST"
+        ]
+        self.assertEqual([len(p["interfaces"]) for p in create], [2, 1, 2, 1])
+        self.assertEqual(create[1]["interfaces"][0]["ifName"], "Ethernet1/31")
+
+        # The response for the failed chunk is kept in the result
+        self.assertEqual(result["response"][0]["RETURN_CODE"], 500)
+        self.assertEqual(len(result["response"]), 4)
+
+    def test_dcnm_intf_eth_replaced_existing(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_eth_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_eth_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("eth_replaced_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="replaced",
                 fabric="test_fabric",
                 config=self.playbook_config,
             )
@@ -3547,6 +4684,8 @@ class TestDcnmIntfModule(TestDcnmModule):
 
     # -------------------------- vPC --------------------------
 
+    # Both the switches are part of the same vPC pair, which is resolved with a single request
+    @api_call_budget(GET=6, POST=4, endpoints={("GET", "VPC_SNO"): 1})
     def test_dcnm_intf_vpc_merged_new(self):
 
         # load the json from playbooks
@@ -5045,6 +6184,109 @@ class TestDcnmIntfModule(TestDcnmModule):
         self.assertEqual(len(result["diff"][0]["deploy"]), 0)
         self.assertEqual(len(result["diff"][0]["query"]), 8)
 
+    @api_call_budget(
+        GET=3,
+        endpoints={
+            ("GET", "IF_DETAIL_WITH_SNO"): 1,
+            ("GET", "IF_WITH_SNO"): 1,
+            ("GET", "IF_WITH_SNO_IFNAME"): 0,
+        },
+    )
+    def test_dcnm_intf_query_fetch_switch(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_query_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_query_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("query_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        # Repeated query targets must be reported once
+        config = self.playbook_config + [
+            self.playbook_config[0],
+            self.playbook_config[2],
+        ]
+
+        set_module_args(
+            dict(
+                state="query",
+                fabric="test_fabric",
+                fetch_mode="switch",
+                config=config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=False)
+
+        self.assertEqual(result["changed"], False)
+        self.assertEqual(len(result["diff"][0]["query"]), 8)
+
+        # Interfaces are reported in the order of the query targets, each one once. Named interfaces are
+        # reported as with 'fetch_mode' set to 'interface'. The target without a name reports the details
+        # of the interfaces of the switch which are not reported already.
+        self.assertEqual(
+            result["response"][:2],
+            [
+                self.payloads_data.get("st_fex_payload")["DATA"][0],
+                self.payloads_data.get("svi_payload")["DATA"][0],
+            ],
+        )
+        names = [elem["ifName"].lower() for elem in result["response"][2:]]
+        self.assertEqual(
+            names,
+            [
+                "ethernet1/10",
+                "port-channel350",
+                "loopback450",
+                "ethernet1/1",
+                "ethernet1/15.2",
+                "vpc750",
+            ],
+        )
+
+    def test_dcnm_intf_query_fetch_switch_fields(self):
+
+        # load the json from playbooks
+        self.config_data = loadPlaybookData("dcnm_intf_query_configs")
+        self.payloads_data = loadPlaybookData("dcnm_intf_query_payloads")
+        self.have_all_payloads_data = loadPlaybookData(
+            "dcnm_intf_have_all_payloads"
+        )
+
+        # load required config data
+        self.playbook_config = self.config_data.get("query_config")
+        self.playbook_mock_succ_resp = self.config_data.get("mock_succ_resp")
+        self.mock_ip_sn = self.config_data.get("mock_ip_sn")
+        self.mock_fab_inv = self.config_data.get("mock_fab_inv_data")
+        self.mock_monitor_true_resp = self.config_data.get("mock_monitor_true_resp")
+        self.mock_monitor_false_resp = self.config_data.get("mock_monitor_false_resp")
+        self.playbook_mock_vpc_resp = self.config_data.get("mock_vpc_resp")
+
+        set_module_args(
+            dict(
+                state="query",
+                fabric="test_fabric",
+                fetch_mode="switch",
+                query_fields=["ifName", "policy"],
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=False)
+
+        self.assertEqual(len(result["response"]), 8)
+        for elem in result["response"][:2]:
+            self.assertEqual(list(elem.keys()), ["policy"])
+        for elem in result["response"][2:]:
+            self.assertEqual(list(elem.keys()), ["ifName"])
+
     def test_dcnm_intf_merge_fabric_monitoring(self):
 
         # load the json from playbooks
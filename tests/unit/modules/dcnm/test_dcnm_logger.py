@@ -0,0 +1,151 @@
+# Copyright (c) 2020-2023 Cisco and/or its affiliates.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm import (
+    DcnmLogger,
+)
+
+
+class TestDcnmLogger(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "dcnm.log")
+
+        # Keep the loggers created by a test and their exit handler out of the other tests
+        self.mock_atexit = patch(
+            "ansible_collections.cisco.dcnm.plugins.module_utils.network.dcnm.dcnm.atexit.register"
+        )
+        self.run_atexit = self.mock_atexit.start()
+        self.loggers = DcnmLogger.loggers
+        DcnmLogger.loggers = []
+
+    def tearDown(self):
+
+        DcnmLogger.loggers = self.loggers
+        self.mock_atexit.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def records(self):
+
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as fd:
+            return [json.loads(line) for line in fd.read().splitlines()]
+
+    def test_dcnm_logger_disabled_without_env(self):
+
+        with patch.dict(os.environ, {}, clear=True):
+            logger = DcnmLogger("test")
+
+        logger.error("not written")
+        logger.flush()
+
+        self.assertFalse(logger.enabled("error"))
+        self.assertEqual(logger.buffer, [])
+        self.assertEqual(self.run_atexit.call_count, 0)
+
+    def test_dcnm_logger_enabled_from_env(self):
+
+        with patch.dict(os.environ, {"DCNM_LOG_FILE": self.path}, clear=True):
+            logger = DcnmLogger("test")
+
+        logger.debug("GET %s", "/rest/path", serial="SAL1819SAN8")
+        logger.flush()
+
+        records = self.records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["logger"], "test")
+        self.assertEqual(records[0]["level"], "debug")
+        self.assertEqual(records[0]["msg"], "GET /rest/path")
+        self.assertEqual(records[0]["serial"], "SAL1819SAN8")
+
+    def test_dcnm_logger_level_from_env(self):
+
+        env = {"DCNM_LOG_FILE": self.path, "DCNM_LOG_LEVEL": "WARNING"}
+        with patch.dict(os.environ, env, clear=True):
+            logger = DcnmLogger("test")
+
+        logger.debug("debug")
+        logger.info("info")
+        logger.warning("warning")
+        logger.error("error")
+        logger.flush()
+
+        self.assertFalse(logger.enabled("info"))
+        self.assertTrue(logger.enabled("warning"))
+        self.assertEqual([r["msg"] for r in self.records()], ["warning", "error"])
+
+    def test_dcnm_logger_callables_evaluated_lazily(self):
+
+        calls = []
+
+        def dump():
+            calls.append(1)
+            return {"have": "all"}
+
+        logger = DcnmLogger("test", path=self.path, level="info")
+
+        logger.debug("HAVE %s", dump, have_all=dump)
+        self.assertEqual(calls, [])
+
+        logger.info("HAVE %s", dump, have_all=dump)
+        logger.flush()
+        self.assertEqual(len(calls), 2)
+
+        records = self.records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["have_all"], {"have": "all"})
+
+    def test_dcnm_logger_buffering_and_flush(self):
+
+        logger = DcnmLogger("test", path=self.path, buffer_size=3)
+
+        logger.debug("one")
+        logger.debug("two")
+        self.assertEqual(self.records(), [])
+
+        # The buffer is written out once it fills up
+        logger.debug("three")
+        self.assertEqual([r["msg"] for r in self.records()], ["one", "two", "three"])
+
+        logger.debug("four")
+        self.assertEqual(len(self.records()), 3)
+
+        DcnmLogger.flush_all()
+        self.assertEqual(
+            [r["msg"] for r in self.records()], ["one", "two", "three", "four"]
+        )
+
+    def test_dcnm_logger_exit_handler_registered_once(self):
+
+        loggers = [DcnmLogger("test", path=self.path) for i in range(3)]
+
+        self.assertEqual(self.run_atexit.call_count, 1)
+        self.run_atexit.assert_called_with(DcnmLogger.flush_all)
+        self.assertEqual(DcnmLogger.loggers, loggers)
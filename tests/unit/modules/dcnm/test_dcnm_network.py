@@ -182,6 +182,98 @@ class TestDcnmNetworkModule(TestDcnmModule):
                 self.deploy_success_resp,
             ]
 
+        elif "_merged_split_member_fabric" in self._testMethodName:
+            self.init_data()
+            inv_data = copy.deepcopy(self.net_inv_data)
+            inv_data["10.10.10.217"]["fabricName"] = "test-fabric-1"
+            inv_data["10.10.10.218"]["fabricName"] = "test-fabric-2"
+            self.run_dcnm_ip_sn.side_effect = [inv_data]
+            self.run_dcnm_send.side_effect = [
+                self.mock_vrf_object,
+                self.blank_data,
+                self.blank_data,
+                self.attach_success_resp,
+                self.attach_success_resp,
+                self.deploy_success_resp,
+            ]
+
+        elif "_merged_novlan_block" in self._testMethodName:
+            self.init_data()
+            # vlan 203 is allocated to a network on the first switch outside of this task
+            pool_resp = {
+                "RETURN_CODE": 200,
+                "MESSAGE": "OK",
+                "DATA": [{"resourcePool": {"poolName": "TOP_DOWN_NETWORK_VLAN"}, "allocatedIp": "203"}],
+            }
+            last = "203" if "_exhausted" in self._testMethodName else "204"
+            nv_pairs = dict(self.fabric_details["nvPairs"], NETWORK_VLAN_RANGE="200-" + last)
+            self.run_dcnm_fabric_details.side_effect = [dict(self.fabric_details, nvPairs=nv_pairs)]
+            self.run_dcnm_send.side_effect = [
+                self.mock_vrf_object,
+                self.blank_data,
+                self.mock_vlan_get,
+                self.blank_data,
+                pool_resp,
+                self.blank_data,
+                self.blank_data,
+                self.blank_data,
+                self.blank_data,
+                self.attach_success_resp,
+                self.deploy_success_resp,
+            ]
+
+        elif "_snapshot_rollback" in self._testMethodName:
+            self.init_data()
+            # Rollback is not attempted on multisite fabrics
+            self.run_dcnm_fabric_details.side_effect = [
+                dict(self.fabric_details, fabricType="Switch_Fabric")
+            ]
+            if "update_failure" in self._testMethodName:
+                self.run_dcnm_get_url.side_effect = [self.mock_net_attach_object]
+                self.run_dcnm_send.side_effect = [
+                    self.mock_vrf_object,
+                    self.mock_net_object,
+                    self.error1,
+                ]
+            elif "create_failure" in self._testMethodName:
+                self.run_dcnm_get_url.side_effect = [self.mock_net_attach_object]
+                self.run_dcnm_send.side_effect = [
+                    self.mock_vrf_object,
+                    self.mock_net_object,
+                    self.attach_success_resp,
+                    self.deploy_success_resp,
+                    self.mock_net_attach_object_del_not_ready,
+                    self.mock_net_attach_object_del_ready,
+                    self.mock_net_attach_object_del_ready,
+                    self.delete_success_resp,
+                    self.error1,
+                    self.blank_data,
+                    self.attach_success_resp,
+                    self.deploy_success_resp,
+                ]
+            else:
+                # Only the first switch is attached before the request fails
+                attach_partial_resp = {
+                    "RETURN_CODE": 200,
+                    "MESSAGE": "OK",
+                    "ERROR": "There is an error",
+                    "DATA": {
+                        "test_network--9NN7E41N16A(leaf1)": "SUCCESS",
+                        "test_network--9YO9A29F27U(leaf2)": "Entered Network VLAN ID 202 is in use already",
+                    },
+                }
+                self.run_dcnm_send.side_effect = [
+                    self.mock_vrf_object,
+                    self.blank_data,
+                    self.blank_data,
+                    attach_partial_resp,
+                    self.blank_data,
+                    self.blank_data,
+                    self.mock_net_attach_object_del_ready,
+                    self.mock_net_attach_object_del_ready,
+                    self.delete_success_resp,
+                ]
+
         elif "error1" in self._testMethodName:
             self.init_data()
             self.run_dcnm_send.side_effect = [
@@ -470,6 +562,40 @@ class TestDcnmNetworkModule(TestDcnmModule):
         self.assertTrue(result.get("diff"))
         self.assertFalse(result.get("response"))
 
+    def test_dcnm_net_merged_split_member_fabric(self):
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_network",
+                split_by_member_fabric=True,
+                max_workers=2,
+                config=self.playbook_config,
+            )
+        )
+        handle_response = dcnm_network.DcnmNetwork.handle_response
+        with patch.object(
+            dcnm_network.DcnmNetwork, "handle_response", autospec=True, side_effect=handle_response
+        ) as mock_handle:
+            result = self.execute_module(changed=True, failed=False)
+        # Each attach response is handled once, by the worker that sent the request
+        attach_handled = [call for call in mock_handle.call_args_list if call[0][2] == "attach"]
+        self.assertEqual(len(attach_handled), 2)
+        self.assertEqual(len(result["response"]), 4)
+        attach_calls = [
+            json.loads(call[0][3])
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][2].endswith("/attachments")
+        ]
+        self.assertEqual(len(attach_calls), 2)
+        self.assertEqual(
+            [(atch["fabric"], atch["serialNumber"]) for atch in attach_calls[0][0]["lanAttachList"]],
+            [("test-fabric-1", "9NN7E41N16A")],
+        )
+        self.assertEqual(
+            [(atch["fabric"], atch["serialNumber"]) for atch in attach_calls[1][0]["lanAttachList"]],
+            [("test-fabric-2", "9YO9A29F27U")],
+        )
+
     def test_dcnm_net_merged_new(self):
         set_module_args(
             dict(state="merged", fabric="test_network", config=self.playbook_config)
@@ -505,6 +631,60 @@ class TestDcnmNetworkModule(TestDcnmModule):
             result.get("diff")[0]["attach"][0]["ip_address"], "10.10.10.217"
         )
 
+    def test_dcnm_net_merged_novlan_block_new(self):
+        config = copy.deepcopy(self.playbook_config_novlan)
+        config.append(dict(copy.deepcopy(config[0]), net_name="test_network_2", net_id="9008012"))
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_network",
+                vlan_block_allocation=True,
+                config=config,
+            )
+        )
+        self.execute_module(changed=True, failed=False)
+        # The vlan ids are fetched once, before the networks are created
+        calls = self.run_dcnm_send.call_args_list
+        vlan_gets = [call for call in calls if "resource-manager/vlan" in call[0][2]]
+        self.assertEqual(len(vlan_gets), 1)
+        creates = [
+            json.loads(call[0][3])
+            for call in calls
+            if call[0][1] == "POST" and call[0][2].endswith("/networks")
+        ]
+        vlan_ids = [json.loads(net["networkTemplateConfig"])["vlanId"] for net in creates]
+        self.assertEqual(vlan_ids, [202, 204])
+        # The vlan pools of both the switches the networks are attached to are checked
+        pool_gets = [call for call in calls if "/pools/" in call[0][2]]
+        self.assertEqual(len(pool_gets), 4)
+
+    def test_dcnm_net_merged_invalid_max_workers(self):
+        set_module_args(
+            dict(state="merged", fabric="test_network", max_workers=0, config=self.playbook_config)
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(result["msg"], "'max_workers' must be at least 1, given = '0'")
+
+    def test_dcnm_net_merged_novlan_block_exhausted(self):
+        config = copy.deepcopy(self.playbook_config_novlan)
+        config.append(dict(copy.deepcopy(config[0]), net_name="test_network_2", net_id="9008012"))
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_network",
+                vlan_block_allocation=True,
+                config=config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(
+            result["msg"],
+            "Unable to allocate 2 vlan ids starting at 202, the range 200-203 has only 1 free",
+        )
+        # Nothing is created once the block can not be satisfied
+        posts = [call for call in self.run_dcnm_send.call_args_list if call[0][1] == "POST"]
+        self.assertEqual(posts, [])
+
     def test_dcnm_net_error1(self):
         set_module_args(
             dict(state="merged", fabric="test_network", config=self.playbook_config)
@@ -513,6 +693,122 @@ class TestDcnmNetworkModule(TestDcnmModule):
         self.assertEqual(result["msg"]["RETURN_CODE"], 400)
         self.assertEqual(result["msg"]["ERROR"], "There is an error")
 
+    def test_dcnm_net_attach_failure_snapshot_rollback(self):
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_network",
+                snapshot_rollback=True,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(result["msg"]["ERROR"], "There is an error")
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # The network created by the task is detached and deleted, without reading the fabric again
+        calls = [call[0] for call in self.run_dcnm_send.call_args_list]
+        self.assertEqual(
+            [call[1] for call in calls[3:]], ["POST", "POST", "POST", "GET", "GET", "DELETE"]
+        )
+        # Only the attachment made before the failure is detached
+        detach = json.loads(calls[4][3])
+        self.assertEqual(detach[0]["networkName"], "test_network")
+        self.assertEqual(
+            [(a["serialNumber"], a["deployment"]) for a in detach[0]["lanAttachList"]],
+            [("9NN7E41N16A", False)],
+        )
+        self.assertTrue(calls[-1][2].endswith("/test_network"))
+
+    def test_dcnm_net_12attach_failure_snapshot_rollback(self):
+        self.version = 12
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_network",
+                snapshot_rollback=True,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.version = 11
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # The networks created by the task are deleted with the bulk delete API
+        delete = self.run_dcnm_send.call_args_list[-1][0]
+        self.assertEqual(delete[1], "DELETE")
+        self.assertTrue(
+            delete[2].endswith("/fabrics/test_network/bulk-delete/networks?network-names=test_network")
+        )
+
+    def test_dcnm_net_12create_failure_snapshot_rollback(self):
+        self.version = 12
+        set_module_args(
+            dict(
+                state="overridden",
+                fabric="test_network",
+                snapshot_rollback=True,
+                config=self.playbook_config_override,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.version = 11
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # The networks deleted by the task are restored with the bulk create API
+        create = self.run_dcnm_send.call_args_list[9][0]
+        self.assertTrue(create[2].endswith("/bulk-create/networks"))
+        self.assertEqual([net["networkName"] for net in json.loads(create[3])], ["test_network"])
+
+    def test_dcnm_net_update_failure_snapshot_rollback(self):
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_network",
+                snapshot_rollback=True,
+                config=self.playbook_config_update,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # Nothing was changed before the update failed, so nothing is reverted
+        calls = [call[0] for call in self.run_dcnm_send.call_args_list]
+        self.assertEqual([call[1] for call in calls], ["GET", "GET", "PUT"])
+
+    def test_dcnm_net_create_failure_snapshot_rollback(self):
+        set_module_args(
+            dict(
+                state="overridden",
+                fabric="test_network",
+                snapshot_rollback=True,
+                config=self.playbook_config_override,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # test_network was detached and deleted before the create of the new network failed. It is
+        # restored and attached again, and the new network which was never created is not deleted.
+        calls = [call[0] for call in self.run_dcnm_send.call_args_list]
+        self.assertEqual(
+            [call[1] for call in calls[8:]], ["POST", "POST", "POST", "POST"]
+        )
+        self.assertEqual(json.loads(calls[9][3])["networkName"], "test_network")
+        attach = json.loads(calls[10][3])
+        self.assertEqual(attach[0]["networkName"], "test_network")
+        self.assertTrue(all(a["deployment"] for a in attach[0]["lanAttachList"]))
+
     def test_dcnm_net_error2(self):
         set_module_args(
             dict(state="merged", fabric="test_network", config=self.playbook_config)
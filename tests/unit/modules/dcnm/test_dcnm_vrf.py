@@ -22,7 +22,12 @@ from unittest.mock import patch
 # from units.compat.mock import patch
 
 from ansible_collections.cisco.dcnm.plugins.modules import dcnm_vrf
-from .dcnm_module import TestDcnmModule, set_module_args, loadPlaybookData
+from .dcnm_module import (
+    TestDcnmModule,
+    set_module_args,
+    loadPlaybookData,
+    api_call_budget,
+)
 
 import json
 import copy
@@ -165,6 +170,15 @@ class TestDcnmVrfModule(TestDcnmModule):
         self.mock_dcnm_version_supported.stop()
         self.mock_dcnm_get_url.stop()
 
+    def lite_objects(self, *objects):
+
+        # Switch details of several VRF attachments returned by a single GET_VRF_SWITCH request
+        resp = copy.deepcopy(objects[0])
+        resp["DATA"] = []
+        for obj in objects:
+            resp["DATA"].extend(copy.deepcopy(obj["DATA"]))
+        return resp
+
     def load_fixtures(self, response=None, device=""):
 
         if self.version == 12:
@@ -182,13 +196,187 @@ class TestDcnmVrfModule(TestDcnmModule):
         if "get_have_failure" in self._testMethodName:
             self.run_dcnm_send.side_effect = [self.get_have_failure]
 
+        elif "_snapshot_rollback" in self._testMethodName:
+            self.init_data()
+            # Rollback is not attempted on multisite fabrics
+            self.run_dcnm_fabric_details.side_effect = [
+                dict(self.fabric_details, fabricType="Switch_Fabric")
+            ]
+            if "update_failure" in self._testMethodName:
+                self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
+                self.run_dcnm_send.side_effect = [
+                    self.mock_vrf_object,
+                    self.lite_objects(
+                        self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                        self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                    ),
+                    self.error1,
+                ]
+            elif "create_failure" in self._testMethodName:
+                self.run_dcnm_get_url.side_effect = [
+                    self.mock_vrf_attach_object,
+                    self.mock_vrf_attach_object_del_not_ready,
+                    self.mock_vrf_attach_object_del_ready,
+                ]
+                self.run_dcnm_send.side_effect = [
+                    self.mock_vrf_object,
+                    self.lite_objects(
+                        self.mock_vrf_attach_get_ext_object_ov_att1_only,
+                        self.mock_vrf_attach_get_ext_object_ov_att2_only,
+                    ),
+                    self.attach_success_resp,
+                    self.deploy_success_resp,
+                    self.delete_success_resp,
+                    self.error1,
+                    self.blank_data,
+                    self.attach_success_resp,
+                    self.deploy_success_resp,
+                ]
+            elif "delete_timeout" in self._testMethodName:
+                attach_fail_resp = {
+                    "RETURN_CODE": 200,
+                    "MESSAGE": "OK",
+                    "ERROR": "There is an error",
+                    "DATA": {
+                        "test_vrf_1--XYZKSJHSMK1(leaf1)": "SUCCESS",
+                        "test_vrf_1--XYZKSJHSMK2(leaf2)": "Entered VRF VLAN ID 202 is in use already",
+                    },
+                }
+                # The first query of the attachments fails and the vrf is never detached after that
+                self.run_dcnm_get_url.side_effect = [
+                    None,
+                    self.mock_vrf_attach_object_del_not_ready,
+                ]
+                self.run_dcnm_send.side_effect = [
+                    self.blank_data,
+                    self.blank_data,
+                    attach_fail_resp,
+                    self.blank_data,
+                    self.blank_data,
+                ]
+            else:
+                # Only the first switch is attached before the request fails
+                attach_partial_resp = {
+                    "RETURN_CODE": 200,
+                    "MESSAGE": "OK",
+                    "ERROR": "There is an error",
+                    "DATA": {
+                        "test_vrf_1--XYZKSJHSMK1(leaf1)": "SUCCESS",
+                        "test_vrf_1--XYZKSJHSMK2(leaf2)": "Entered VRF VLAN ID 202 is in use already",
+                    },
+                }
+                self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object_del_ready]
+                self.run_dcnm_send.side_effect = [
+                    self.blank_data,
+                    self.blank_data,
+                    attach_partial_resp,
+                    self.blank_data,
+                    self.blank_data,
+                    self.delete_success_resp,
+                ]
+
+        elif "_12merged_bulk_create" in self._testMethodName:
+            self.run_dcnm_send.side_effect = [
+                self.blank_data,
+                self.blank_data,
+                self.attach_success_resp,
+                self.deploy_success_resp,
+            ]
+
+        elif "_merged_novlan_sequential" in self._testMethodName:
+            # DCNM hands out the next vlan id only once the vrf using the previous one is created
+            vlan_resps = [
+                {"RETURN_CODE": 200, "MESSAGE": "OK", "DATA": str(vlan_id)}
+                for vlan_id in (202, 203, 204)
+            ]
+            self.run_dcnm_send.side_effect = [
+                self.blank_data,
+                vlan_resps[0],
+                self.blank_data,
+                vlan_resps[1],
+                self.blank_data,
+                vlan_resps[2],
+                self.blank_data,
+                self.attach_success_resp,
+                self.deploy_success_resp,
+            ]
+
+        elif "_merged_novlan_block" in self._testMethodName:
+            vlan_resp = {"RETURN_CODE": 200, "MESSAGE": "OK", "DATA": "202"}
+            # vlan 203 is allocated to a vrf on the first switch outside of this task
+            pool_resp = {
+                "RETURN_CODE": 200,
+                "MESSAGE": "OK",
+                "DATA": [{"resourcePool": {"poolName": "TOP_DOWN_VRF_VLAN"}, "allocatedIp": "203"}],
+            }
+            nv_pairs = dict(self.fabric_details["nvPairs"], VRF_VLAN_RANGE="200-204")
+            self.run_dcnm_fabric_details.side_effect = [dict(self.fabric_details, nvPairs=nv_pairs)]
+            self.run_dcnm_send.side_effect = [
+                self.blank_data,
+                vlan_resp,
+                pool_resp,
+                self.blank_data,
+                self.blank_data,
+                self.blank_data,
+                self.blank_data,
+                self.blank_data,
+                self.attach_success_resp,
+                self.deploy_success_resp,
+            ]
+
+        elif "_merged_concurrent_create" in self._testMethodName:
+            self.run_dcnm_send.side_effect = [
+                self.blank_data,
+                self.blank_data,
+                self.blank_data,
+                self.attach_success_resp,
+                self.deploy_success_resp,
+            ]
+
+        elif "_merged_split_member_fabric" in self._testMethodName:
+            inv_data = copy.deepcopy(self.vrf_inv_data)
+            inv_data["10.10.10.224"]["fabricName"] = "test-fabric-1"
+            inv_data["10.10.10.225"]["fabricName"] = "test-fabric-2"
+            self.run_dcnm_ip_sn.side_effect = [inv_data]
+            self.run_dcnm_send.side_effect = [
+                self.blank_data,
+                self.blank_data,
+                self.attach_success_resp,
+                self.attach_success_resp,
+                self.deploy_success_resp,
+            ]
+
+        elif "_12merged_block_vrf_ids" in self._testMethodName:
+            vrf_id_resp = {"RETURN_CODE": 200, "MESSAGE": "OK", "DATA": {"l3vni": 9008011}}
+            # 9008013 is reserved in the L3_VNI pool by someone else
+            pool_resp = {
+                "RETURN_CODE": 200,
+                "MESSAGE": "OK",
+                "DATA": [{"resourcePool": {"poolName": "L3_VNI"}, "allocatedIp": "9008013"}],
+            }
+            last = "9008013" if "_exhausted" in self._testMethodName else "9008020"
+            nv_pairs = dict(self.fabric_details["nvPairs"], L3_PARTITION_ID_RANGE="9008000-" + last)
+            self.run_dcnm_fabric_details.side_effect = [dict(self.fabric_details, nvPairs=nv_pairs)]
+            self.run_dcnm_send.side_effect = [
+                self.blank_data,
+                vrf_id_resp,
+                pool_resp,
+                self.blank_data,
+                self.blank_data,
+                self.blank_data,
+                self.attach_success_resp,
+                self.deploy_success_resp,
+            ]
+
         elif "_check_mode" in self._testMethodName:
             self.init_data()
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
             ]
 
         elif "_merged_new" in self._testMethodName:
@@ -239,8 +427,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
             ]
 
         elif "_merged_lite_duplicate" in self._testMethodName:
@@ -248,8 +438,31 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
+            ]
+
+        elif "_merged_lite_dot1q_duplicate" in self._testMethodName:
+            self.init_data()
+            # Two VRF LITE connections on the same interface, told apart by the DOT1Q_ID
+            lite_obj = copy.deepcopy(self.mock_vrf_attach_get_ext_object_merge_att4_only)
+            details = lite_obj["DATA"][0]["switchDetailsList"][0]
+            ext_values = json.loads(details["extensionValues"])
+            conns = json.loads(ext_values["VRF_LITE_CONN"])
+            conn = dict(conns["VRF_LITE_CONN"][0], DOT1Q_ID="3", IP_MASK="10.33.0.6/30", NEIGHBOR_IP="10.33.0.5")
+            conns["VRF_LITE_CONN"].append(conn)
+            ext_values["VRF_LITE_CONN"] = json.dumps(conns)
+            details["extensionValues"] = json.dumps(ext_values)
+
+            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
+            self.run_dcnm_send.side_effect = [
+                self.mock_vrf_object,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    lite_obj,
+                ),
             ]
 
         elif "_merged_with_incorrect" in self._testMethodName:
@@ -257,8 +470,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
             ]
 
         elif "_merged_with_update" in self._testMethodName:
@@ -266,8 +481,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
                 self.blank_data,
                 self.attach_success_resp,
                 self.deploy_success_resp,
@@ -278,8 +495,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
                 self.mock_vrf_lite_obj,
                 self.attach_success_resp,
                 self.deploy_success_resp,
@@ -290,8 +509,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
                 self.blank_data,
                 self.mock_vrf_lite_obj,
                 self.attach_success_resp,
@@ -328,8 +549,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
                 self.attach_success_resp,
                 self.deploy_success_resp,
                 self.delete_success_resp,
@@ -340,8 +563,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
                 self.attach_success_resp,
                 self.deploy_success_resp,
                 self.delete_success_resp,
@@ -352,8 +577,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
                 self.attach_success_resp,
                 self.deploy_success_resp,
                 self.delete_success_resp,
@@ -364,8 +591,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
                 self.mock_vrf_lite_obj,
                 self.attach_success_resp,
                 self.deploy_success_resp,
@@ -377,8 +606,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
             ]
 
         elif "replace_lite_without_changes" in self._testMethodName:
@@ -386,8 +617,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
             ]
 
         elif "lite_override_with_additions" in self._testMethodName:
@@ -410,16 +643,20 @@ class TestDcnmVrfModule(TestDcnmModule):
 
         elif "lite_override_with_deletions" in self._testMethodName:
             self.init_data()
-            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object2,
+                self.mock_vrf_attach_object_del_not_ready,
+                self.mock_vrf_attach_object_del_ready,
+            ]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
                 self.mock_vrf_lite_obj,
                 self.attach_success_resp,
                 self.deploy_success_resp,
-                self.mock_vrf_attach_object_del_not_ready,
-                self.mock_vrf_attach_object_del_ready,
                 self.delete_success_resp,
                 self.blank_data,
                 self.attach_success_resp2,
@@ -428,15 +665,19 @@ class TestDcnmVrfModule(TestDcnmModule):
 
         elif "override_with_deletions" in self._testMethodName:
             self.init_data()
-            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object,
+                self.mock_vrf_attach_object_del_not_ready,
+                self.mock_vrf_attach_object_del_ready,
+            ]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_ov_att1_only,
-                self.mock_vrf_attach_get_ext_object_ov_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_ov_att1_only,
+                    self.mock_vrf_attach_get_ext_object_ov_att2_only,
+                ),
                 self.attach_success_resp,
                 self.deploy_success_resp,
-                self.mock_vrf_attach_object_del_not_ready,
-                self.mock_vrf_attach_object_del_ready,
                 self.delete_success_resp,
                 self.blank_data,
                 self.attach_success_resp2,
@@ -448,8 +689,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
             ]
 
         elif "override_no_changes_lite" in self._testMethodName:
@@ -457,49 +700,79 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att3_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att3_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
             ]
 
         elif "delete_std" in self._testMethodName:
             self.init_data()
-            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object,
+                self.mock_vrf_attach_object_del_not_ready,
+                self.mock_vrf_attach_object_del_ready,
+            ]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_dcnm_att1_only,
-                self.mock_vrf_attach_get_ext_object_dcnm_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_dcnm_att1_only,
+                    self.mock_vrf_attach_get_ext_object_dcnm_att2_only,
+                ),
                 self.attach_success_resp,
                 self.deploy_success_resp,
-                self.mock_vrf_attach_object_del_not_ready,
-                self.mock_vrf_attach_object_del_ready,
                 self.delete_success_resp,
             ]
 
         elif "delete_std_lite" in self._testMethodName:
             self.init_data()
-            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object2,
+                self.mock_vrf_attach_object_del_not_ready,
+                self.mock_vrf_attach_object_del_ready,
+            ]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_dcnm_att1_only,
-                self.mock_vrf_attach_get_ext_object_dcnm_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_dcnm_att1_only,
+                    self.mock_vrf_attach_get_ext_object_dcnm_att4_only,
+                ),
                 self.attach_success_resp,
                 self.deploy_success_resp,
-                self.mock_vrf_attach_object_del_not_ready,
-                self.mock_vrf_attach_object_del_ready,
                 self.delete_success_resp,
             ]
 
         elif "delete_failure" in self._testMethodName:
             self.init_data()
-            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object,
+                self.mock_vrf_attach_object_del_not_ready,
+                self.mock_vrf_attach_object_del_oos,
+            ]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_dcnm_att1_only,
-                self.mock_vrf_attach_get_ext_object_dcnm_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_dcnm_att1_only,
+                    self.mock_vrf_attach_get_ext_object_dcnm_att2_only,
+                ),
                 self.attach_success_resp,
                 self.deploy_success_resp,
+            ]
+
+        elif "delete_timeout" in self._testMethodName:
+            self.init_data()
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object,
                 self.mock_vrf_attach_object_del_not_ready,
-                self.mock_vrf_attach_object_del_oos,
+            ]
+            self.run_dcnm_send.side_effect = [
+                self.mock_vrf_object,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_dcnm_att1_only,
+                    self.mock_vrf_attach_get_ext_object_dcnm_att2_only,
+                ),
+                self.attach_success_resp,
+                self.deploy_success_resp,
             ]
 
         elif "delete_dcnm_only" in self._testMethodName:
@@ -510,55 +783,105 @@ class TestDcnmVrfModule(TestDcnmModule):
             obj1["DATA"][0].update({"vrfName": "test_vrf_dcnm"})
             obj2["DATA"][0].update({"vrfName": "test_vrf_dcnm"})
 
-            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object_dcnm_only]
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object_dcnm_only,
+                obj1,
+                obj2,
+            ]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object_dcnm_only,
-                self.mock_vrf_attach_get_ext_object_dcnm_att1_only,
-                self.mock_vrf_attach_get_ext_object_dcnm_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_dcnm_att1_only,
+                    self.mock_vrf_attach_get_ext_object_dcnm_att2_only,
+                ),
                 self.attach_success_resp,
                 self.deploy_success_resp,
-                obj1,
-                obj2,
                 self.delete_success_resp,
             ]
 
+        elif "_query_missing_switch_details" in self._testMethodName:
+            self.init_data()
+            vrf_objects = copy.deepcopy(self.mock_vrf_object)
+            vrf_objects["DATA"].append(dict(copy.deepcopy(vrf_objects["DATA"][0]), vrfName="test_vrf_2"))
+            attach_objects = copy.deepcopy(self.mock_vrf_attach_object_query)
+            attach_2 = copy.deepcopy(attach_objects["DATA"][0])
+            attach_2["vrfName"] = "test_vrf_2"
+            for attach in attach_2["lanAttachList"]:
+                attach["vrfName"] = "test_vrf_2"
+            attach_objects["DATA"].append(attach_2)
+            lite_2 = self.lite_objects(
+                self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+            )
+            for lite in lite_2["DATA"]:
+                lite["vrfName"] = "test_vrf_2"
+            # The switch details of the second attachment of test_vrf_1 are missing
+            lite_objects = self.lite_objects(
+                self.mock_vrf_attach_get_ext_object_merge_att1_only, lite_2
+            )
+            self.run_dcnm_get_url.side_effect = [attach_objects, copy.deepcopy(attach_objects)]
+            self.run_dcnm_send.side_effect = [
+                vrf_objects,
+                lite_objects,
+                copy.deepcopy(vrf_objects),
+                copy.deepcopy(lite_objects),
+            ]
+
         elif "query" in self._testMethodName:
             self.init_data()
-            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object,
+                self.mock_vrf_attach_object_query,
+            ]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
                 self.mock_vrf_object,
-                self.mock_vrf_attach_object_query,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
             ]
 
         elif "query_vrf_lite" in self._testMethodName:
             self.init_data()
-            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object2,
+                self.mock_vrf_attach_object2_query,
+            ]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
                 self.mock_vrf_object,
-                self.mock_vrf_attach_object2_query,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
             ]
 
         elif "query_vrf_lite_without_config" in self._testMethodName:
             self.init_data()
-            self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object2]
+            self.run_dcnm_get_url.side_effect = [
+                self.mock_vrf_attach_object2,
+                self.mock_vrf_attach_object2_query,
+            ]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
                 self.mock_vrf_object,
-                self.mock_vrf_attach_object2_query,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att4_only,
+                ),
             ]
 
         elif "_12check_mode" in self._testMethodName:
@@ -566,8 +889,10 @@ class TestDcnmVrfModule(TestDcnmModule):
             self.run_dcnm_get_url.side_effect = [self.mock_vrf_attach_object]
             self.run_dcnm_send.side_effect = [
                 self.mock_vrf12_object,
-                self.mock_vrf_attach_get_ext_object_merge_att1_only,
-                self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                self.lite_objects(
+                    self.mock_vrf_attach_get_ext_object_merge_att1_only,
+                    self.mock_vrf_attach_get_ext_object_merge_att2_only,
+                ),
             ]
 
         elif "_12merged_new" in self._testMethodName:
@@ -616,6 +941,7 @@ class TestDcnmVrfModule(TestDcnmModule):
         result = self.execute_module(changed=True, failed=False)
         self.assertEqual(result.get("diff")[0]["vrf_name"], "test_vrf_1")
 
+    @api_call_budget(GET=4, POST=0, PUT=0, DELETE=0)
     def test_dcnm_vrf_check_mode(self):
         set_module_args(
             dict(
@@ -629,6 +955,7 @@ class TestDcnmVrfModule(TestDcnmModule):
         self.assertFalse(result.get("diff"))
         self.assertFalse(result.get("response"))
 
+    @api_call_budget(TOTAL=4)
     def test_dcnm_vrf_merged_new(self):
         set_module_args(
             dict(state="merged", fabric="test_fabric", config=self.playbook_config)
@@ -652,6 +979,33 @@ class TestDcnmVrfModule(TestDcnmModule):
         self.assertEqual(result["response"][2]["DATA"]["status"], "")
         self.assertEqual(result["response"][2]["RETURN_CODE"], self.SUCCESS_RETURN_CODE)
 
+    def test_dcnm_vrf_merged_split_member_fabric(self):
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                split_by_member_fabric=True,
+                max_workers=2,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=True, failed=False)
+        self.assertEqual(len(result["response"]), 4)
+        attach_calls = [
+            json.loads(call[0][3])
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][2].endswith("/attachments")
+        ]
+        self.assertEqual(len(attach_calls), 2)
+        self.assertEqual(
+            [(atch["fabric"], atch["serialNumber"]) for atch in attach_calls[0][0]["lanAttachList"]],
+            [("test-fabric-1", "XYZKSJHSMK1")],
+        )
+        self.assertEqual(
+            [(atch["fabric"], atch["serialNumber"]) for atch in attach_calls[1][0]["lanAttachList"]],
+            [("test-fabric-2", "XYZKSJHSMK2")],
+        )
+
     def test_dcnm_vrf_merged_lite_new(self):
         set_module_args(
             dict(
@@ -697,6 +1051,23 @@ class TestDcnmVrfModule(TestDcnmModule):
         result = self.execute_module(changed=False, failed=False)
         self.assertFalse(result.get("diff"))
 
+    def test_dcnm_vrf_merged_lite_dot1q_duplicate(self):
+        config = copy.deepcopy(self.playbook_vrf_lite_config)
+        lite = config[0]["attach"][1]["vrf_lite"]
+        lite.insert(
+            0,
+            dict(lite[0], dot1q="3", ipv4_addr="10.33.0.6/30", neighbor_ipv4="10.33.0.5"),
+        )
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                config=config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=False)
+        self.assertFalse(result.get("diff"))
+
     def test_dcnm_vrf_merged_with_incorrect_vrfid(self):
         set_module_args(
             dict(
@@ -814,6 +1185,166 @@ class TestDcnmVrfModule(TestDcnmModule):
         self.assertEqual(result["msg"]["RETURN_CODE"], 400)
         self.assertEqual(result["msg"]["ERROR"], "There is an error")
 
+    def test_dcnm_vrf_attach_failure_snapshot_rollback(self):
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                snapshot_rollback=True,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(result["msg"]["ERROR"], "There is an error")
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # The vrf created by the task is detached and deleted, without reading the fabric again
+        calls = [call[0] for call in self.run_dcnm_send.call_args_list]
+        self.assertEqual(
+            [(call[1], call[2].split("/")[-1]) for call in calls],
+            [
+                ("GET", "vrfs"),
+                ("POST", "vrfs"),
+                ("POST", "attachments"),
+                ("POST", "attachments"),
+                ("POST", "deployments"),
+                ("DELETE", "test_vrf_1"),
+            ],
+        )
+        # Only the attachment made before the failure is detached
+        detach = json.loads(calls[3][3])
+        self.assertEqual(
+            [(a["serialNumber"], a["deployment"]) for a in detach[0]["lanAttachList"]],
+            [("XYZKSJHSMK1", False)],
+        )
+
+    def test_dcnm_vrf_12attach_failure_snapshot_rollback(self):
+        self.version = 12
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                snapshot_rollback=True,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.version = 11
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # The vrfs created by the task are deleted with the bulk delete API
+        delete = self.run_dcnm_send.call_args_list[-1][0]
+        self.assertEqual(delete[1], "DELETE")
+        self.assertTrue(delete[2].endswith("/fabrics/test_fabric/bulk-delete/vrfs?vrf-names=test_vrf_1"))
+
+    def test_dcnm_vrf_delete_timeout_snapshot_rollback(self):
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                snapshot_rollback=True,
+                config=self.playbook_config,
+            )
+        )
+        # The wait starts at 0 seconds, and the second query is done after the 600 seconds allowed
+        with patch("time.sleep") as mock_sleep, patch.object(
+            dcnm_vrf.time, "time", side_effect=[0, 100, 700]
+        ):
+            result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "FAILED - Attempted rollback of the task has failed, may need manual intervention",
+        )
+        # The failed query is retried and the vrf still attached is not deleted
+        self.assertEqual(self.run_dcnm_get_url.call_count, 2)
+        self.assertEqual(
+            [call[0][1] for call in self.run_dcnm_send.call_args_list],
+            ["GET", "POST", "POST", "POST", "POST"],
+        )
+
+    def test_dcnm_vrf_12create_failure_snapshot_rollback(self):
+        self.version = 12
+        set_module_args(
+            dict(
+                state="overridden",
+                fabric="test_fabric",
+                snapshot_rollback=True,
+                config=self.playbook_config_override,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.version = 11
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # The vrfs deleted by the task are restored with the bulk create API
+        create = self.run_dcnm_send.call_args_list[6][0]
+        self.assertTrue(create[2].endswith("/bulk-create/vrfs"))
+        self.assertEqual([vrf["vrfName"] for vrf in json.loads(create[3])], ["test_vrf_1"])
+
+    def test_dcnm_vrf_update_failure_snapshot_rollback(self):
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                snapshot_rollback=True,
+                config=self.playbook_config_update_vlan,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # Nothing was changed before the update failed, so nothing is reverted
+        calls = [call[0] for call in self.run_dcnm_send.call_args_list]
+        self.assertEqual(
+            [call[1] for call in calls], ["GET", "GET", "PUT"]
+        )
+
+    def test_dcnm_vrf_create_failure_snapshot_rollback(self):
+        set_module_args(
+            dict(
+                state="overridden",
+                fabric="test_fabric",
+                snapshot_rollback=True,
+                config=self.playbook_config_override,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(
+            result["msg"]["ROLLBACK_RESULT"],
+            "SUCCESS - Attempted rollback of the task has succeeded",
+        )
+        # test_vrf_1 was detached and deleted before the create of test_vrf_2 failed. It is restored
+        # and attached again, and test_vrf_2 which was never created is not deleted.
+        calls = [call[0] for call in self.run_dcnm_send.call_args_list]
+        self.assertEqual(
+            [(call[1], call[2].split("/")[-1]) for call in calls[2:]],
+            [
+                ("POST", "attachments"),
+                ("POST", "deployments"),
+                ("DELETE", "test_vrf_1"),
+                ("POST", "vrfs"),
+                ("POST", "vrfs"),
+                ("POST", "attachments"),
+                ("POST", "deployments"),
+            ],
+        )
+        self.assertEqual(json.loads(calls[5][3])["vrfName"], "test_vrf_2")
+        self.assertEqual(json.loads(calls[6][3])["vrfName"], "test_vrf_1")
+        attach = json.loads(calls[7][3])
+        self.assertEqual(
+            [(a["serialNumber"], a["deployment"]) for a in attach[0]["lanAttachList"]],
+            [("XYZKSJHSMK1", True), ("XYZKSJHSMK2", True)],
+        )
+
     def test_dcnm_vrf_error2(self):
         set_module_args(
             dict(state="merged", fabric="test_fabric", config=self.playbook_config)
@@ -945,6 +1476,31 @@ class TestDcnmVrfModule(TestDcnmModule):
         self.assertFalse(result.get("diff"))
         self.assertFalse(result.get("response"))
 
+    @api_call_budget(endpoints={("GET", "GET_VRF_SWITCH"): 1})
+    def test_dcnm_vrf_replace_lite_without_changes_switch_details(self):
+        set_module_args(
+            dict(
+                state="replaced",
+                fabric="test_fabric",
+                config=self.playbook_vrf_lite_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=False)
+        self.assertFalse(result.get("diff"))
+
+        # Switch details of all the attachments are read with a single request
+        paths = [
+            call[0][2]
+            for call in self.run_dcnm_send.call_args_list
+            if "/vrfs/switches" in call[0][2]
+        ]
+        self.assertEqual(len(paths), 1)
+        self.assertTrue(
+            paths[0].endswith(
+                "vrf-names=test_vrf_1&serial-numbers=XYZKSJHSMK1,XYZKSJHSMK4"
+            )
+        )
+
     def test_dcnm_vrf_override_with_additions(self):
         set_module_args(
             dict(state="overridden", fabric="test_fabric", config=self.playbook_config)
@@ -995,6 +1551,7 @@ class TestDcnmVrfModule(TestDcnmModule):
         self.assertEqual(result["response"][2]["DATA"]["status"], "")
         self.assertEqual(result["response"][2]["RETURN_CODE"], self.SUCCESS_RETURN_CODE)
 
+    @api_call_budget(GET=6, TOTAL=12)
     def test_dcnm_vrf_override_with_deletions(self):
         set_module_args(
             dict(
@@ -1149,6 +1706,22 @@ class TestDcnmVrfModule(TestDcnmModule):
             result["msg"]["response"][2], "Deletion of vrfs test_vrf_1 has failed"
         )
 
+    def test_dcnm_vrf_delete_timeout(self):
+        set_module_args(
+            dict(
+                state="deleted",
+                fabric="test_fabric",
+                delete_timeout=0,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(
+            result["msg"],
+            "Timed out after 0 seconds waiting for vrfs test_vrf_1 to be detached from all switches",
+        )
+
+    @api_call_budget(GET=6)
     def test_dcnm_vrf_query(self):
         set_module_args(
             dict(state="query", fabric="test_fabric", config=self.playbook_config)
@@ -1178,6 +1751,42 @@ class TestDcnmVrfModule(TestDcnmModule):
             "202",
         )
 
+    def test_dcnm_vrf_query_missing_switch_details(self):
+        config = [
+            copy.deepcopy(self.playbook_config[0]),
+            dict(copy.deepcopy(self.playbook_config[0]), vrf_name="test_vrf_2"),
+        ]
+        set_module_args(dict(state="query", fabric="test_fabric", config=config))
+        result = self.execute_module(changed=False, failed=False)
+        # The attachment without switch details is skipped, the other vrfs are still reported
+        self.assertEqual(
+            [item["parent"]["vrfName"] for item in result.get("response")],
+            ["test_vrf_1", "test_vrf_2"],
+        )
+        self.assertEqual(len(result.get("response")[0]["attach"]), 1)
+        self.assertEqual(len(result.get("response")[1]["attach"]), 2)
+
+    @api_call_budget(GET=5)
+    def test_dcnm_vrf_query_without_switch_details(self):
+        set_module_args(
+            dict(
+                state="query",
+                fabric="test_fabric",
+                query_switch_details=False,
+                config=self.playbook_config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=False)
+        self.assertFalse(result.get("diff"))
+        self.assertEqual(result.get("response")[0]["parent"]["vrfName"], "test_vrf_1")
+        self.assertEqual(
+            [attach["switchSerialNo"] for attach in result.get("response")[0]["attach"]],
+            ["XYZKSJHSMK1", "XYZKSJHSMK2"],
+        )
+        self.assertEqual(
+            result.get("response")[0]["attach"][0]["lanAttachState"], "DEPLOYED"
+        )
+
     def test_dcnm_vrf_query_vrf_lite(self):
         set_module_args(
             dict(
@@ -1297,6 +1906,169 @@ class TestDcnmVrfModule(TestDcnmModule):
         self.assertFalse(result.get("diff"))
         self.assertFalse(result.get("response"))
 
+    def test_dcnm_vrf_12merged_bulk_create(self):
+        self.version = 12
+        config = [
+            copy.deepcopy(self.playbook_config[0]),
+            dict(copy.deepcopy(self.playbook_config[0]), vrf_name="test_vrf_2", vrf_id="9008012"),
+        ]
+        set_module_args(
+            dict(state="merged", fabric="test_fabric", bulk_create=True, config=config)
+        )
+        self.execute_module(changed=True, failed=False)
+        self.version = 11
+        creates = [
+            call[0] for call in self.run_dcnm_send.call_args_list
+            if call[0][2].endswith("/bulk-create/vrfs")
+        ]
+        self.assertEqual(len(creates), 1)
+        self.assertEqual(
+            [vrf["vrfName"] for vrf in json.loads(creates[0][3])],
+            ["test_vrf_1", "test_vrf_2"],
+        )
+
+    def run_novlan_sequential(self, **params):
+        config = []
+        for idx in range(1, 4):
+            vrf = dict(
+                copy.deepcopy(self.playbook_config[0]),
+                vrf_name="test_vrf_{0}".format(idx),
+                vrf_id=str(9008010 + idx),
+            )
+            del vrf["vlan_id"]
+            config.append(vrf)
+        set_module_args(dict(state="merged", fabric="test_fabric", config=config, **params))
+        self.execute_module(changed=True, failed=False)
+        calls = self.run_dcnm_send.call_args_list
+        # The vlan id of each vrf is fetched right before the vrf is created
+        order = [
+            "GET_VLAN" if "resource-manager/vlan" in call[0][2] else "POST"
+            for call in calls
+            if "resource-manager/vlan" in call[0][2]
+            or (call[0][1] == "POST" and call[0][2].endswith("/vrfs"))
+        ]
+        self.assertEqual(order, ["GET_VLAN", "POST"] * 3)
+        vlan_ids = [
+            json.loads(json.loads(call[0][3])["vrfTemplateConfig"])["vrfVlanId"]
+            for call in calls
+            if call[0][1] == "POST" and call[0][2].endswith("/vrfs")
+        ]
+        self.assertEqual(vlan_ids, ["202", "203", "204"])
+
+    def test_dcnm_vrf_merged_novlan_sequential(self):
+        self.run_novlan_sequential()
+
+    def test_dcnm_vrf_merged_novlan_sequential_max_workers(self):
+        # More workers do not change how the vlan ids are allocated
+        self.run_novlan_sequential(max_workers=4)
+
+    def test_dcnm_vrf_merged_novlan_sequential_bulk_create(self):
+        # The bulk create API is not available on DCNM 11, so bulk_create is ignored
+        self.run_novlan_sequential(bulk_create=True)
+
+    def test_dcnm_vrf_merged_invalid_max_workers(self):
+        set_module_args(
+            dict(state="merged", fabric="test_fabric", max_workers=0, config=self.playbook_config)
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.assertEqual(result["msg"], "'max_workers' must be at least 1, given = '0'")
+
+    def test_dcnm_vrf_merged_novlan_block(self):
+        config = []
+        for vrf_name, vrf_id in [("test_vrf_1", "9008011"), ("test_vrf_2", "9008012")]:
+            vrf = dict(copy.deepcopy(self.playbook_config[0]), vrf_name=vrf_name, vrf_id=vrf_id)
+            del vrf["vlan_id"]
+            config.append(vrf)
+        set_module_args(
+            dict(state="merged", fabric="test_fabric", vlan_block_allocation=True, config=config)
+        )
+        self.execute_module(changed=True, failed=False)
+        calls = self.run_dcnm_send.call_args_list
+        creates = [
+            json.loads(call[0][3])
+            for call in calls
+            if call[0][1] == "POST" and call[0][2].endswith("/vrfs")
+        ]
+        vlan_ids = [json.loads(vrf["vrfTemplateConfig"])["vrfVlanId"] for vrf in creates]
+        self.assertEqual(vlan_ids, [202, 204])
+        # The vlan pools of both the switches the vrfs are attached to are checked
+        pool_gets = [call for call in calls if "/pools/" in call[0][2]]
+        self.assertEqual(len(pool_gets), 4)
+
+    def test_dcnm_vrf_merged_concurrent_create(self):
+        config = [
+            copy.deepcopy(self.playbook_config[0]),
+            dict(copy.deepcopy(self.playbook_config[0]), vrf_name="test_vrf_2", vrf_id="9008012"),
+        ]
+        set_module_args(
+            dict(state="merged", fabric="test_fabric", max_workers=2, config=config)
+        )
+        result = self.execute_module(changed=True, failed=False)
+        self.assertEqual(len(result["response"]), 4)
+        creates = [
+            json.loads(call[0][3])["vrfName"]
+            for call in self.run_dcnm_send.call_args_list
+            if call[0][1] == "POST" and call[0][2].endswith("/vrfs")
+        ]
+        self.assertEqual(sorted(creates), ["test_vrf_1", "test_vrf_2"])
+
+    def test_dcnm_vrf_12merged_block_vrf_ids(self):
+        self.version = 12
+        config = []
+        for vrf_name, vrf_id in [("test_vrf_1", None), ("test_vrf_2", None), ("test_vrf_3", "9008012")]:
+            vrf = copy.deepcopy(self.playbook_config[0])
+            vrf.update(vrf_name=vrf_name)
+            if vrf_id is None:
+                del vrf["vrf_id"]
+            else:
+                vrf.update(vrf_id=vrf_id)
+            config.append(vrf)
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                vrf_id_block_allocation=True,
+                config=config,
+            )
+        )
+        result = self.execute_module(changed=True, failed=False)
+        self.version = 11
+        vrf_ids = dict((diff["vrf_name"], diff["vrf_id"]) for diff in result.get("diff"))
+        self.assertEqual(
+            vrf_ids, {"test_vrf_1": 9008011, "test_vrf_2": 9008014, "test_vrf_3": 9008012}
+        )
+        # The vrfId is fetched only once and all the vrfs are created in the bulk create phase
+        paths = [call[0][2] for call in self.run_dcnm_send.call_args_list]
+        self.assertEqual(sum(path.endswith("/vrfinfo") for path in paths), 1)
+        self.assertEqual(sum(path.endswith("/pools/L3_VNI") for path in paths), 1)
+
+    def test_dcnm_vrf_12merged_block_vrf_ids_exhausted(self):
+        self.version = 12
+        config = []
+        for vrf_name, vrf_id in [("test_vrf_1", None), ("test_vrf_2", None), ("test_vrf_3", "9008012")]:
+            vrf = copy.deepcopy(self.playbook_config[0])
+            vrf.update(vrf_name=vrf_name)
+            if vrf_id is None:
+                del vrf["vrf_id"]
+            else:
+                vrf.update(vrf_id=vrf_id)
+            config.append(vrf)
+        set_module_args(
+            dict(
+                state="merged",
+                fabric="test_fabric",
+                vrf_id_block_allocation=True,
+                config=config,
+            )
+        )
+        result = self.execute_module(changed=False, failed=True)
+        self.version = 11
+        self.assertEqual(
+            result["msg"],
+            "Unable to generate vrfId for vrf: test_vrf_2 under fabric: test_fabric, "
+            "no vrfIds left in the range 9008000-9008013",
+        )
+
     def test_dcnm_vrf_12merged_new(self):
         self.version = 12
         set_module_args(